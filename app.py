@@ -1,109 +1,94 @@
 # app.py
 
-import importlib
 import yaml
 import argparse
 import logging
-from core.interfaces import Fetcher, Writer
-from core.data_wrapper import DataWrapper
+from core.runner import BACKENDS, RUN_MODES, PipelineConfigError, execute_tasks, log_summary
+from core.plan import compile_plan, load_plan
+from core.registry import registry
+from core.checkpoints import CheckpointStore
+from core.journal import WriteJournal
 from utility.logger import setup_logger
-from inspect import signature
 
-def load_class(full_class_string):
-    """Dynamically load a class from a string"""
-    module_path, class_name = full_class_string.rsplit(".", 1)
-    module = importlib.import_module(module_path)
-    return getattr(module, class_name)
 
-def process_pipeline(config_path: str):
-    logger = logging.getLogger("pipeline")
-    logger.info(f"Reading config: {config_path}")
+def load_config(config):
+    """Load a pipeline config from a YAML path, or pass a dict straight through."""
+    if isinstance(config, dict):
+        return config
+    with open(config, "r") as file:
+        return yaml.safe_load(file)
 
-    with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
 
-    for task in config.get("pipeline", []):
-        if not task.get("enabled", True):
-            logger.info(f"Skipping disabled pipeline: {task.get('name')}")
-            continue
+def compile_pipeline(config_path):
+    """
+    Validate a pipeline config and return its ExecutionPlan (see core.plan).
 
-        task_name = task.get("name", "Unnamed Pipeline")
-        logger.info(f"Starting pipeline: {task_name}")
+    The plan is cached under `.cache/plans/` unless `settings.plan_cache` is false.
 
-        # --- Fetcher setup ---
-        fetcher_cfg = task.get("fetcher", {})
-        fetcher_class = load_class(fetcher_cfg["class"])
-        fetcher_params = fetcher_cfg.get("params", {})
-        fetcher = fetcher_class(**fetcher_params)
+    Raises:
+        PipelineConfigError: If any enabled task is misconfigured.
+    """
+    config = load_config(config_path)
+    if (config.get("settings") or {}).get("plan_cache", True):
+        return load_plan(config, config_path if isinstance(config_path, str) else None)
+    return compile_plan(config)
 
-        if not isinstance(fetcher, Fetcher):
-            logger.error(f"{fetcher.__class__.__name__} does not implement Fetcher Interface")
-            continue
 
-        if hasattr(fetcher, "initialize"):
-            fetcher.initialize()
+def process_pipeline(config_path, run_mode: str = None, backend: str = None, max_workers: int = None):
+    """
+    Run every enabled task of a pipeline config.
 
-        fetch_operation = fetcher_cfg.get("operation", "fetch_data")
-        fetch_operation_params = fetcher_cfg.get("operation_params", {})  # ✅ NEW
-        fetch_ops = fetcher.get_operations()
-        fetch_method = fetch_ops.get(fetch_operation, getattr(fetcher, fetch_operation, None))
+    Execution settings come from the optional `settings` block of the config
+    and can be overridden by the arguments (e.g. from the CLI).
 
-        if not callable(fetch_method):
-            logger.error(f"Fetcher operation '{fetch_operation}' not found.")
-            continue
+    Args:
+        config_path (str | dict): Path to the YAML config, or an already-loaded config.
+        run_mode (str, optional): "serial", "parallel" or "async".
+        backend (str, optional): "thread" or "process" pool for parallel runs.
+        max_workers (int, optional): Maximum number of tasks running at once.
 
-        logger.info(f"Fetching data using operation: {fetch_operation} with params: {fetch_operation_params}")
-        data: DataWrapper = fetch_method(**fetch_operation_params)  # ✅ UPDATED
-        print("********data********", data.data)
+    Returns:
+        list[TaskResult]: Per-task results, in config order.
+
+    Raises:
+        PipelineConfigError: If the config is invalid; no task is run.
+    """
+    logger = logging.getLogger("pipeline")
+    if isinstance(config_path, str):
+        logger.info(f"Reading config: {config_path}")
+    plan = compile_pipeline(config_path)
+
+    settings = dict(plan.settings)
+    run_mode = run_mode or settings.get("run_mode", "serial")
+    backend = backend or settings.get("backend", "thread")
+    max_workers = max_workers or settings.get("max_workers")
+
+    for name in plan.skipped:
+        logger.info(f"Skipping disabled pipeline: {name}")
+    tasks = list(plan.tasks)
+
+    if run_mode == "parallel":
+        logger.info(f"Running {len(tasks)} task(s) in parallel ({backend} backend, max_workers={max_workers or len(tasks)})")
+
+    results = execute_tasks(tasks, run_mode=run_mode, backend=backend, max_workers=max_workers, settings=settings)
+    log_summary(results)
+    return results
 
-        # --- Writers ---
-        for writer_cfg in task.get("writers", []):
-            writer_class = load_class(writer_cfg["class"])
-            writer_params = writer_cfg.get("params", {})
-            writer = writer_class(**writer_params)
-
-            if not isinstance(writer, Writer):
-                logger.error(f"{writer.__class__.__name__} does not implement Writer Interface")
-                continue
-
-            if hasattr(writer, "initialize"):
-                writer.initialize()
-
-            write_operation = writer_cfg.get("operation", "write_data")
-            # Load data and operation_params
-            data_list = writer_cfg.get("data", [])
-            write_operation_params = writer_cfg.get("operation_params", {})  # ✅ NEW
-            write_ops = writer.get_operations()
-            write_method = write_ops.get(write_operation, getattr(writer, write_operation, None))
-
-            if not callable(write_method):
-                logger.error(f"Writer operation '{write_operation}' not found.")
-                continue
-
-            logger.info(f"Writing data using operation: {write_operation} with params: {write_operation_params}")
-            # if write_operation_params:
-            #     write_method(data, **write_operation_params)  # ✅ UPDATED
-            # else:
-            #     write_method(data)
-            # write_method(writer, data)
-            method_sig = signature(write_method)
-            param_count = len(method_sig.parameters)
-            # print("param count >>>>>>>>>", param_count)
-
-            if param_count == 0:
-                write_method()
-            elif param_count == 1:
-                write_method(data)
-            else:
-                write_method(data, **write_operation_params)
-
-        logger.info(f"Pipeline '{task_name}' completed.")
+
+def print_operations(label, class_path):
+    """Print a plugin's operations as declared in its source (the plugin module is not imported)."""
+    info = registry().get(class_path)
+    print(f"\n  {label}: {info.name if info else class_path.rsplit('.', 1)[-1]}")
+    if info is None or info.operations is None:
+        print("    (operations are only known at runtime)")
+        return
+    for op_name, op in info.operations.items():
+        print(f"    - {op_name}{op.signature}: {op.doc or 'No doc'}")
 
 
 def list_enabled_operations(config_path):
     print(f"\nReading config from {config_path}...")
-    with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
+    config = load_config(config_path)
 
     printed = False
     for task in config.get("pipeline", []):
@@ -115,24 +100,12 @@ def list_enabled_operations(config_path):
         # Fetcher
         fetcher_cfg = task.get("fetcher", {})
         if fetcher_cfg:
-            fetcher_class = load_class(fetcher_cfg["class"])
-            fetcher_params = fetcher_cfg.get("params", {})
-            fetcher = fetcher_class(**fetcher_params)
-            print(f"\n  🔹 Fetcher: {fetcher_class.__name__}")
-            ops = fetcher.get_operations()
-            for op_name, func in ops.items():
-                print(f"    - {op_name}: {func.__doc__ or 'No doc'}")
+            print_operations("🔹 Fetcher", fetcher_cfg["class"])
             printed = True
 
         # Writers
         for writer_cfg in task.get("writers", []):
-            writer_class = load_class(writer_cfg["class"])
-            writer_params = writer_cfg.get("params", {})
-            writer = writer_class(**writer_params)
-            print(f"\n  🔸 Writer: {writer_class.__name__}")
-            ops = writer.get_operations()
-            for op_name, func in ops.items():
-                print(f"    - {op_name}: {func.__doc__ or 'No doc'}")
+            print_operations("🔸 Writer", writer_cfg["class"])
             printed = True
 
     if not printed:
@@ -152,13 +125,48 @@ def main():
     parser.add_argument(
         "--list-ops", action="store_true", help="List available operations of enabled fetchers/writers"
     )
+    parser.add_argument(
+        "--check", action="store_true", help="Validate the config (classes, operations, parameters) and exit"
+    )
+    parser.add_argument(
+        "--run-mode", choices=RUN_MODES, help="Run tasks one at a time (serial), on a worker pool (parallel) or on an event loop (async)"
+    )
+    parser.add_argument(
+        "--backend", choices=BACKENDS, help="Worker pool used in parallel mode"
+    )
+    parser.add_argument(
+        "--max-workers", type=int, help="Maximum number of tasks running at once in parallel mode"
+    )
+    parser.add_argument(
+        "--reset-checkpoints", nargs="?", const="", metavar="TASK",
+        help="Forget the watermarks of a task (or of all tasks) so the next run fetches everything"
+    )
+    parser.add_argument(
+        "--reset-journal", nargs="?", const="", metavar="TASK",
+        help="Forget the records written by an interrupted run of a task (or of all tasks) so they are written again"
+    )
     args = parser.parse_args()
     # print(">>>>>>>>>>>>", args)
 
-    if args.list_ops:
-        list_enabled_operations(args.config)
-    else:
-        process_pipeline(args.config)
+    try:
+        if args.list_ops:
+            list_enabled_operations(args.config)
+        elif args.reset_checkpoints is not None:
+            settings = load_config(args.config).get("settings") or {}
+            removed = CheckpointStore.from_settings(settings).reset(args.reset_checkpoints or None)
+            print(f"Removed {removed} checkpoint(s).")
+        elif args.reset_journal is not None:
+            settings = load_config(args.config).get("settings") or {}
+            removed = WriteJournal.from_settings(settings).reset(args.reset_journal or None)
+            print(f"Removed {removed} journal entr{'y' if removed == 1 else 'ies'}.")
+        elif args.check:
+            plan = compile_pipeline(args.config)
+            print(f"Config OK: {len(plan.tasks)} enabled task(s).")
+        else:
+            process_pipeline(args.config, run_mode=args.run_mode, backend=args.backend, max_workers=args.max_workers)
+    except PipelineConfigError as e:
+        logging.getLogger("pipeline").error(str(e))
+        raise SystemExit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,296 @@
+# core/async_runner.py
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Dict, List
+from core.interfaces import Fetcher, Writer, AsyncFetcher, AsyncWriter
+from core.data_wrapper import DataWrapper, StreamingDataWrapper, as_data_wrapper
+from core.runner import (
+    RunContext, TaskResult, WriterResult, load_class, build_plugin, resolve_step, call_writer,
+    combine_inputs, finish_task, fail_task, writer_failed, writer_timed_out, writer_inputs, stream_queue_depth,
+    _dedupes, _fetch, _run_writer, cached_result, reuse_cached, store_result, journal_writers, finish_journals,
+    retry_budget,
+)
+from core.retry import RetryBudget, retry_policy
+from core.singleflight import fetch_key
+from core.transforms import apply_transforms
+
+DEFAULT_SERVICE_CONCURRENCY = 10
+
+
+def service_key(plugin_cfg: Dict[str, Any]) -> str:
+    """
+    Name of the remote service a plugin talks to, used to group concurrency limits.
+
+    Taken from the optional `service` key of the plugin config, otherwise derived
+    from the module name (e.g. `writers.slack_writer.SlackWriter` -> "slack").
+    """
+    if plugin_cfg.get("service"):
+        return plugin_cfg["service"]
+    module = plugin_cfg["class"].rsplit(".", 1)[0].rsplit(".", 1)[-1]
+    for suffix in ("_fetcher", "_writer"):
+        if module.endswith(suffix):
+            return module[: -len(suffix)]
+    return module
+
+
+class ServiceLimiter:
+    """
+    Per-service bound on the number of in-flight operations.
+
+    Lets thousands of coroutines be scheduled at once while only `limit`
+    of them talk to any one service at a time.
+    """
+    def __init__(self, default_limit: int = DEFAULT_SERVICE_CONCURRENCY, limits: Dict[str, int] = None):
+        self.default_limit = default_limit
+        self.limits = limits or {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def semaphore(self, service: str) -> asyncio.Semaphore:
+        if service not in self._semaphores:
+            self._semaphores[service] = asyncio.Semaphore(self.limits.get(service, self.default_limit))
+        return self._semaphores[service]
+
+    @asynccontextmanager
+    async def slot(self, service: str):
+        async with self.semaphore(service):
+            yield
+
+
+async def run_tasks_async(tasks: List[Dict[str, Any]], settings: Dict[str, Any] = None, max_workers: int = None,
+                          inputs: List[Dict[str, DataWrapper]] = None, keep_output: List[bool] = None,
+                          context: RunContext = None) -> List[TaskResult]:
+    """
+    Run every task concurrently on the current event loop.
+
+    Native async plugins (AsyncFetcher/AsyncWriter) are awaited directly;
+    sync plugins run on a thread pool of `max_workers` threads. Calls to each
+    service are bounded by `settings.service_concurrency` (default
+    `settings.async_concurrency`). `inputs` and `keep_output` are per-task,
+    and `context` is shared by all tasks, as in core.runner.run_task.
+
+    Returns:
+        list[TaskResult]: One result per task, in config order.
+    """
+    settings = settings or {}
+    context = context or RunContext()
+    limiter = ServiceLimiter(
+        settings.get("async_concurrency", DEFAULT_SERVICE_CONCURRENCY),
+        settings.get("service_concurrency"),
+    )
+    inputs = inputs or [None] * len(tasks)
+    keep_output = keep_output or [False] * len(tasks)
+    executor = ThreadPoolExecutor(max_workers=max_workers or settings.get("max_workers"), thread_name_prefix="plugin")
+    try:
+        return list(await asyncio.gather(*(
+            run_task_async(task, settings, limiter, executor, i, k, context)
+            for task, i, k in zip(tasks, inputs, keep_output)
+        )))
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def _call(executor, limiter, service, func, *args, **kwargs):
+    """
+    Await a plugin method: natively if it is a coroutine, otherwise on the executor.
+
+    Sync calls hold a slot of the service's limit while they run. Native
+    coroutines are not wrapped, since they take their own slots per remote
+    call through `self.limiter`; holding one around the whole operation
+    could deadlock a plugin that fans out under the same limit.
+    """
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    async with limiter.slot(service):
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def _build(executor, cfg, interface, limiter):
+    # Constructors may do blocking credential lookups, so build off the loop.
+    loop = asyncio.get_running_loop()
+    plugin = await loop.run_in_executor(executor, build_plugin, cfg, interface)
+    plugin.limiter = limiter
+    return plugin
+
+
+async def _is_native(executor, cfg, async_interface) -> bool:
+    # Importing a plugin module can be slow (SDK imports), so resolve the class off the loop.
+    loop = asyncio.get_running_loop()
+    plugin_class = await loop.run_in_executor(executor, load_class, cfg["class"])
+    return issubclass(plugin_class, async_interface)
+
+
+async def run_task_async(task: Dict[str, Any], settings: Dict[str, Any], limiter: ServiceLimiter,
+                         executor: ThreadPoolExecutor, inputs: Dict[str, DataWrapper] = None,
+                         keep_output: bool = False, context: RunContext = None) -> TaskResult:
+    """Async counterpart of core.runner.run_task."""
+    logger = logging.getLogger("pipeline")
+    task_name = task.get("name", "Unnamed Pipeline")
+    start = time.perf_counter()
+    context = context or RunContext()
+    loop = asyncio.get_running_loop()
+
+    shared = admitted = False
+    usage = context.memory.usage(task)
+    try:
+        logger.info(f"Starting pipeline: {task_name}")
+        budget = RetryBudget(retry_policy(task, settings))
+        checkpoint = None
+        if not task.get("inputs"):
+            checkpoint = await loop.run_in_executor(executor, context.checkpoints.open, task)
+        if checkpoint is not None:
+            logger.info(f"Pipeline '{task_name}' resumes from watermark {checkpoint.previous!r}")
+            task = checkpoint.bind(task)
+        if task.get("inputs"):
+            data = combine_inputs(task, inputs)
+        elif _dedupes(task, context.flight):
+            async def fetch_once():
+                fetched = await _fetch_async(task, settings, limiter, executor, context, budget)
+                fetched = await loop.run_in_executor(executor, context.memory.admit, fetched, usage)
+                return (await loop.run_in_executor(executor, fetched.materialize)).read_only()
+            data, shared = await context.flight.do_async(fetch_key(task["fetcher"]), fetch_once)
+            admitted = True
+            if shared:
+                logger.info(f"Pipeline '{task_name}' reused an identical fetch from this run")
+        else:
+            data = await _fetch_async(task, settings, limiter, executor, context, budget)
+        fetched_metadata = data.metadata
+        if task.get("transforms") or not admitted:
+            data = await loop.run_in_executor(executor, apply_transforms, task, data)
+            data = await loop.run_in_executor(executor, context.memory.admit, data, usage)
+    except Exception as e:
+        context.memory.release(usage)
+        return fail_task(task_name, start, e)
+
+    try:
+        if keep_output:
+            data = await loop.run_in_executor(executor, data.materialize)
+        writer_cfgs = task.get("writers", [])
+        writer_data = await loop.run_in_executor(
+            executor, writer_inputs, writer_cfgs, data, stream_queue_depth(task, settings)
+        )
+
+        default_timeout = settings.get("writer_timeout")
+        try:
+            scopes, writer_data = journal_writers(task, writer_cfgs, writer_data, context)
+            writer_results = await asyncio.gather(*(
+                _run_writer_async(cfg, item, settings, limiter, executor, context, cfg.get("timeout", default_timeout), budget)
+                for cfg, item in zip(writer_cfgs, writer_data)
+            ))
+            await loop.run_in_executor(executor, finish_journals, scopes, writer_results)
+        finally:
+            for item in writer_data + [data]:
+                item.close()
+        if checkpoint is not None and all(w.status == "ok" for w in writer_results):
+            await loop.run_in_executor(executor, checkpoint.commit, fetched_metadata)
+    except Exception as e:
+        # e.g. a stream failing part-way while it is materialized for the writers
+        return fail_task(task_name, start, e)
+    finally:
+        context.memory.release(usage)
+    result = finish_task(task_name, start, list(writer_results))
+    result.fetch_shared = shared
+    result.memory = usage
+    if keep_output and result.status == "ok":
+        result.output = data
+    return result
+
+
+async def _fetch_async(task, settings, limiter, executor, context, budget=None) -> DataWrapper:
+    logger = logging.getLogger("pipeline")
+    loop = asyncio.get_running_loop()
+    fetcher_cfg = task.get("fetcher", {})
+    service = service_key(fetcher_cfg)
+
+    if not await _is_native(executor, fetcher_cfg, AsyncFetcher):
+        # Sync fetchers run whole on a worker thread, leasing from the run's client pool.
+        async with limiter.slot(service):
+            return await loop.run_in_executor(executor, _fetch, task, settings, context, budget)
+
+    policy, entry = await loop.run_in_executor(executor, cached_result, fetcher_cfg, context)
+    if entry is not None and entry.fresh(policy.ttl):
+        return reuse_cached(fetcher_cfg, context, entry)
+
+    fetcher = await _build(executor, fetcher_cfg, Fetcher, limiter)
+    fetch_operation = fetcher_cfg.get("operation", "fetch_data")
+    fetch_operation_params = fetcher_cfg.get("operation_params", {})
+    try:
+        await fetcher.initialize()
+        validator = None
+        if policy is not None and policy.validate:
+            validator = await _cache_validator(fetcher, fetch_operation, fetch_operation_params)
+        if entry is not None and validator is not None and validator == entry.validator:
+            fetcher.close()
+            return await loop.run_in_executor(executor, reuse_cached, fetcher_cfg, context, entry, validator)
+        fetch_method, _ = resolve_step(fetcher, fetcher_cfg, "fetch_data")
+        logger.info(f"Fetching data using operation: {fetch_operation} with params: {fetch_operation_params}")
+        data = as_data_wrapper(await retry_budget(budget, fetcher_cfg).call_async(
+            lambda: _call(executor, limiter, service, fetch_method, **fetch_operation_params), f"Fetch {fetch_operation}"
+        ))
+    except BaseException:
+        fetcher.close()
+        raise
+
+    if not data.streaming:
+        fetcher.close()
+        if policy is not None:
+            await loop.run_in_executor(executor, store_result, fetcher_cfg, context, data, validator)
+        return data
+    return StreamingDataWrapper(data.batches(), data.metadata, on_close=fetcher.close)
+
+
+async def _cache_validator(fetcher, operation, params):
+    """Async counterpart of core.runner.cache_validator."""
+    try:
+        validator = fetcher.cache_validator(operation, params)
+        if asyncio.iscoroutine(validator):
+            validator = await validator
+    except Exception as e:
+        logging.getLogger("pipeline").warning(f"Could not validate cached {operation}, fetching it again: {e}")
+        return None
+    return None if validator is None else str(validator)
+
+
+async def _run_writer_async(writer_cfg, data, settings, limiter, executor, context, timeout, budget=None) -> WriterResult:
+    try:
+        return await asyncio.wait_for(_write(writer_cfg, data, settings, limiter, executor, context, budget), timeout)
+    except asyncio.TimeoutError:
+        return writer_timed_out(writer_cfg, timeout)
+    finally:
+        data.close()
+
+
+async def _write(writer_cfg, data, settings, limiter, executor, context, budget=None) -> WriterResult:
+    logger = logging.getLogger("pipeline")
+    loop = asyncio.get_running_loop()
+    write_operation = writer_cfg.get("operation", "write_data")
+    write_operation_params = writer_cfg.get("operation_params", {})
+    service = service_key(writer_cfg)
+    start = time.perf_counter()
+
+    try:
+        if not await _is_native(executor, writer_cfg, AsyncWriter):
+            async with limiter.slot(service):
+                return await loop.run_in_executor(executor, _run_writer, writer_cfg, data, settings, context, budget)
+
+        writer = await _build(executor, writer_cfg, Writer, limiter)
+        try:
+            await writer.initialize()
+            write_method, param_count = resolve_step(writer, writer_cfg, "write_data")
+            logger.info(f"Writing data using operation: {write_operation} with params: {write_operation_params}")
+            async def write():
+                if asyncio.iscoroutinefunction(write_method):
+                    return await call_writer(write_method, data, write_operation_params, param_count)
+                return await _call(executor, limiter, service, call_writer, write_method, data, write_operation_params, param_count)
+            await retry_budget(budget, writer_cfg, data).call_async(write, f"Writer {writer_cfg['class']}.{write_operation}")
+        finally:
+            writer.close()
+    except Exception as e:
+        return writer_failed(writer_cfg, start, e)
+
+    return WriterResult(writer_cfg["class"], write_operation, "ok", time.perf_counter() - start)
@@ -0,0 +1,405 @@
+# core/binary_payload.py
+
+import io
+import mmap
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Union
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+# Downloaded chunks buffered ahead of the consumer of a StreamingBinaryPayload.
+DEFAULT_BUFFER_CHUNKS = 4
+_POLL_INTERVAL = 0.1
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class BinaryPayload:
+    """
+    File contents carried by a DataWrapper without holding them in memory.
+
+    The bytes live in a file: either an existing local file (used in place,
+    never modified) or a temporary file the payload owns and deletes once
+    it is garbage collected. Small payloads built from bytes stay in memory.
+    Consumers read it in chunks (chunks(), open(), read()), map it with
+    mmap(), or hand `path` to an SDK that uploads from a file, so a
+    multi-GB transfer keeps memory flat.
+
+    Payloads are read-only once built; use BinaryPayload.writer() or
+    from_chunks() to create one from a download.
+    """
+    streaming = False
+
+    def __init__(self, path: str = None, data: bytes = None, name: str = None, mime_type: str = None,
+                 owned: bool = False):
+        """
+        Args:
+            path (str, optional): File holding the contents.
+            data (bytes, optional): In-memory contents, when there is no file.
+            name (str, optional): File name, for writers that need one.
+            mime_type (str, optional): MIME type, for writers that need one.
+            owned (bool): Delete `path` when the payload is garbage collected.
+        """
+        if (path is None) == (data is None):
+            raise ValueError("BinaryPayload needs exactly one of `path` or `data`")
+        self._path = path
+        self._data = bytes(data) if data is not None else None
+        self.name = name or (os.path.basename(path) if path else None)
+        self.mime_type = mime_type
+        self._finalizer = weakref.finalize(self, _remove, path) if owned else None
+
+    # --- construction ---------------------------------------------------------------------
+
+    @classmethod
+    def from_path(cls, path: str, name: str = None, mime_type: str = None) -> "BinaryPayload":
+        """Wrap an existing local file (no copy)."""
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        return cls(path=path, name=name, mime_type=mime_type)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = None, mime_type: str = None) -> "BinaryPayload":
+        return cls(data=data, name=name, mime_type=mime_type)
+
+    @classmethod
+    @contextmanager
+    def writer(cls, name: str = None, mime_type: str = None, temp_dir: str = None):
+        """
+        Yield a binary file to write into; the payload is in `.payload` once the block ends.
+
+            with BinaryPayload.writer(name="report.pdf") as out:
+                downloader = MediaIoBaseDownload(out, request)
+                ...
+            payload = out.payload
+        """
+        fd, path = tempfile.mkstemp(prefix="payload-", dir=temp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                out = _PayloadFile(f)
+                yield out
+        except BaseException:
+            _remove(path)
+            raise
+        out.payload = cls(path=path, name=name, mime_type=mime_type, owned=True)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes], name: str = None, mime_type: str = None,
+                    temp_dir: str = None) -> "BinaryPayload":
+        """Write chunks (e.g. an HTTP response's iter_content()) to a temporary file, one at a time."""
+        with cls.writer(name, mime_type, temp_dir) as out:
+            for chunk in chunks:
+                if chunk:
+                    out.write(chunk)
+        return out.payload
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO, name: str = None, mime_type: str = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, temp_dir: str = None) -> "BinaryPayload":
+        """Copy a readable binary stream to a temporary file."""
+        with cls.writer(name, mime_type, temp_dir) as out:
+            shutil.copyfileobj(stream, out, chunk_size)
+        return out.payload
+
+    # --- reading --------------------------------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        return len(self._data) if self._data is not None else os.path.getsize(self._path)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def in_memory(self) -> bool:
+        return self._data is not None
+
+    @property
+    def path(self) -> str:
+        """A local file with the contents (in-memory payloads are written to a temporary file first)."""
+        if self._path is None:
+            fd, path = tempfile.mkstemp(prefix="payload-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._data)
+            self._path = path
+            self._finalizer = weakref.finalize(self, _remove, path)
+            self._data = None
+        return self._path
+
+    def open(self) -> BinaryIO:
+        """A new binary file object positioned at the start; close it when done."""
+        if self._data is not None:
+            return io.BytesIO(self._data)
+        return open(self._path, "rb")
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """The contents, `chunk_size` bytes at a time."""
+        if self._data is not None:
+            view = memoryview(self._data)
+            for start in range(0, len(view), chunk_size):
+                yield view[start:start + chunk_size].tobytes()
+            return
+        with open(self._path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def read(self, offset: int = 0, length: int = -1) -> bytes:
+        """`length` bytes from `offset` (everything after it by default)."""
+        if self._data is not None:
+            return self._data[offset:] if length < 0 else self._data[offset:offset + length]
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    @contextmanager
+    def mmap(self):
+        """Yield a read-only memoryview of the contents, mapped from the file rather than copied."""
+        if self._data is not None:
+            yield memoryview(self._data)
+            return
+        if self.size == 0:
+            yield memoryview(b"")
+            return
+        with open(self._path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def to_bytes(self) -> bytes:
+        """The whole contents in memory; only for consumers that can't take a file or chunks."""
+        return self._data if self._data is not None else self.read()
+
+    __bytes__ = to_bytes
+
+    # --- writing out ----------------------------------------------------------------------
+
+    def save(self, destination: str) -> str:
+        """Copy the contents to a local path (the kernel copies file to file where it can)."""
+        if self._data is not None:
+            with open(destination, "wb") as f:
+                f.write(self._data)
+        else:
+            shutil.copyfile(self._path, destination)
+        return destination
+
+    def write_to(self, stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Copy the contents into a writable binary stream; returns the bytes written."""
+        written = 0
+        for chunk in self.chunks(chunk_size):
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+
+    def __reduce__(self):
+        # A temporary file is deleted with the payload that owns it, so it is sent by value.
+        if self._finalizer is not None:
+            return (BinaryPayload, (None, self.to_bytes(), self.name, self.mime_type))
+        return (BinaryPayload, (self._path, self._data, self.name, self.mime_type))
+
+    def __repr__(self):
+        where = "memory" if self._data is not None else self._path
+        return f"<BinaryPayload {self.name or ''} {self.size} bytes in {where}>"
+
+
+class _PayloadFile(io.BufferedIOBase):
+    """The file handed out by BinaryPayload.writer(); `payload` is set once the block ends."""
+    def __init__(self, f: BinaryIO):
+        super().__init__()
+        self._f = f
+        self.payload: Optional[BinaryPayload] = None
+
+    def writable(self):
+        return True
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> int:
+        return self._f.write(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._f.seek(offset, whence)
+
+    def tell(self):
+        return self._f.tell()
+
+    def flush(self):
+        self._f.flush()
+
+
+class StreamingBinaryPayload:
+    """
+    File contents read straight from a download, once, without a local copy.
+
+    `open_chunks` is called on first read and returns the download's
+    chunks (e.g. a Dropbox response's iter_content()). A background
+    thread pulls them into a queue of at most `buffer_chunks` while the
+    consumer (e.g. an upload session) sends them on, so download and upload
+    overlap and memory stays at a few chunks whatever the file size.
+    Closing the consumer early stops the download.
+    """
+    streaming = True
+    in_memory = False
+
+    def __init__(self, open_chunks: Callable[[], Iterable[bytes]], size: int = None, name: str = None,
+                 mime_type: str = None, buffer_chunks: int = DEFAULT_BUFFER_CHUNKS):
+        """
+        Args:
+            open_chunks (callable): Starts the download and returns an iterable of byte chunks.
+            size (int, optional): Total size, when known from the file's metadata.
+            name (str, optional): File name, for writers that need one.
+            mime_type (str, optional): MIME type, for writers that need one.
+            buffer_chunks (int): Chunks downloaded ahead of the consumer.
+        """
+        self._open_chunks = open_chunks
+        self.size = size
+        self.name = name
+        self.mime_type = mime_type
+        self.buffer_chunks = max(1, buffer_chunks)
+        self._consumed = False
+        self._lock = threading.Lock()
+
+    def _source(self) -> Iterator[bytes]:
+        with self._lock:
+            if self._consumed:
+                raise RuntimeError(f"StreamingBinaryPayload {self.name or ''} can only be read once")
+            self._consumed = True
+
+        buffer = queue.Queue(maxsize=self.buffer_chunks)
+        stopped = threading.Event()
+        end = object()
+
+        def put(item) -> bool:
+            while not stopped.is_set():
+                try:
+                    buffer.put(item, timeout=_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            source = None
+            try:
+                source = iter(self._open_chunks())
+                for chunk in source:
+                    if chunk and not put(bytes(chunk)):
+                        return  # the consumer went away
+                put(end)
+            except BaseException as e:
+                put(e)
+            finally:
+                close = getattr(source, "close", None)
+                if close is not None:
+                    close()
+
+        thread = threading.Thread(target=produce, name=f"download-{self.name or 'payload'}", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is end:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """The contents in chunks of exactly `chunk_size` bytes (the last one may be shorter)."""
+        pending = bytearray()
+        for piece in self._source():
+            pending += piece
+            while len(pending) >= chunk_size:
+                yield bytes(pending[:chunk_size])
+                del pending[:chunk_size]
+        if pending:
+            yield bytes(pending)
+
+    def open(self) -> BinaryIO:
+        """A read-once, non-seekable binary file object over the download."""
+        return io.BufferedReader(_ChunkReader(self.chunks()), buffer_size=DEFAULT_CHUNK_SIZE)
+
+    def write_to(self, stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        written = 0
+        for chunk in self.chunks(chunk_size):
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+
+    def save(self, destination: str) -> str:
+        with open(destination, "wb") as f:
+            self.write_to(f)
+        return destination
+
+    def to_file(self, temp_dir: str = None) -> BinaryPayload:
+        """Download into a temporary file, for consumers that need to seek or re-read."""
+        return BinaryPayload.from_chunks(self.chunks(), self.name, self.mime_type, temp_dir)
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self.chunks())
+
+    __bytes__ = to_bytes
+
+    def __reduce__(self):
+        # The download can't move to another process; send the contents.
+        return (BinaryPayload, (None, self.to_bytes(), self.name, self.mime_type))
+
+    def __repr__(self):
+        state = "consumed" if self._consumed else "pending"
+        return f"<StreamingBinaryPayload {self.name or ''} {self.size if self.size is not None else '?'} bytes {state}>"
+
+
+class _ChunkReader(io.RawIOBase):
+    def __init__(self, chunks: Iterator[bytes]):
+        super().__init__()
+        self._chunks = chunks
+        self._pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+        super().close()
+
+
+def as_binary_payload(value) -> Union[BinaryPayload, StreamingBinaryPayload]:
+    """
+    The BinaryPayload in what a fetcher returned.
+
+    Accepts a payload (file-backed or streaming), bytes, or a dict with one
+    under "content" (as the Dropbox and Drive fetchers return it, next to
+    the file's metadata).
+    """
+    if isinstance(value, dict):
+        value = value.get("content")
+    if isinstance(value, (BinaryPayload, StreamingBinaryPayload)):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return BinaryPayload.from_bytes(bytes(value))
+    raise TypeError(f"Expected file contents, got {type(value).__name__}")
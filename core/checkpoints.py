@@ -0,0 +1,127 @@
+# core/checkpoints.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, Optional
+from core.singleflight import fetch_key
+
+DEFAULT_CHECKPOINT_PATH = ".cache/checkpoints.sqlite"
+# Operation parameter the previous watermark is passed in, and metadata key the fetcher returns the new one in.
+WATERMARK = "watermark"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    key TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    watermark TEXT NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def checkpoint_key(task: Dict[str, Any]) -> Optional[str]:
+    """
+    Name under which a task's watermark is kept, or None if the task is not checkpointed.
+
+    `checkpoint: true` on the fetcher keys it by task name and fetch (so changing
+    the fetcher's params or operation starts from scratch); `checkpoint: "name"`
+    uses that name, e.g. to keep the watermark across such changes.
+    """
+    value = task.get("fetcher", {}).get("checkpoint")
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value
+    return json.dumps({"task": task.get("name", "Unnamed Pipeline"), "fetch": fetch_key(task["fetcher"])}, sort_keys=True)
+
+
+class Checkpoint:
+    """
+    A checkpointed task's watermark for one run.
+
+    `previous` is what the last successful run committed (None on the first
+    run). The fetch operation receives it as its `watermark` parameter and
+    reports where it got to as `metadata["watermark"]` of the DataWrapper it
+    returns (for streams, by the time the last batch has been read).
+    """
+    def __init__(self, store: "CheckpointStore", key: str, task_name: str, previous: Any):
+        self.store = store
+        self.key = key
+        self.task_name = task_name
+        self.previous = previous
+
+    def bind(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """A copy of the task whose fetch operation is called with the previous watermark."""
+        fetcher = task["fetcher"]
+        return {**task, "fetcher": {**fetcher, "operation_params": {**fetcher.get("operation_params", {}), WATERMARK: self.previous}}}
+
+    def commit(self, metadata: Dict[str, Any]) -> bool:
+        """Store the watermark the fetcher reported; returns whether there was one."""
+        logger = logging.getLogger("pipeline")
+        if metadata.get(WATERMARK) is None:
+            logger.warning(f"Pipeline '{self.task_name}' returned no watermark; its checkpoint is unchanged")
+            return False
+        self.store.put(self.key, self.task_name, metadata[WATERMARK])
+        logger.info(f"Pipeline '{self.task_name}' checkpoint advanced to {metadata[WATERMARK]!r}")
+        return True
+
+
+class CheckpointStore:
+    """
+    Watermarks of incremental fetches, kept in a SQLite file between runs.
+
+    A task opts in with `checkpoint:` on its fetcher. Its watermark (a sync
+    token, page cursor, last-modified time, max ID...) must be JSON
+    serializable; other values are stored as strings. The runner commits
+    a new watermark only once every writer of the task has succeeded, so a
+    failed run is fetched again from the same point next time.
+    """
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "CheckpointStore":
+        return cls(settings.get("checkpoint_path", DEFAULT_CHECKPOINT_PATH))
+
+    def worker_args(self):
+        return (self.path,)
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute(_SCHEMA)
+        return conn
+
+    def open(self, task: Dict[str, Any]) -> Optional[Checkpoint]:
+        """The task's Checkpoint, or None if it isn't checkpointed."""
+        key = checkpoint_key(task)
+        if key is None:
+            return None
+        return Checkpoint(self, key, task.get("name", "Unnamed Pipeline"), self.get(key))
+
+    def get(self, key: str) -> Any:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT watermark FROM checkpoints WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, task_name: str, watermark: Any):
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (key, task, watermark, updated_at) VALUES (?, ?, ?, ?)",
+                (key, task_name, json.dumps(watermark, default=str), time.time()),
+            )
+
+    def reset(self, task_name: str = None) -> int:
+        """Forget the watermarks of one task (by name) or of all tasks, so they fetch everything again."""
+        with self._lock, closing(self._connect()) as conn:
+            if task_name is None:
+                return conn.execute("DELETE FROM checkpoints").rowcount
+            return conn.execute("DELETE FROM checkpoints WHERE task = ?", (task_name,)).rowcount
@@ -0,0 +1,151 @@
+# core/concurrency.py
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+DEFAULT_INITIAL_CONCURRENCY = 4
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_BACKOFF = 0.5            # factor the limit is multiplied by on overload
+DEFAULT_LATENCY_TOLERANCE = 2.0  # smoothed latency over the no-load latency that counts as congestion
+_OPTIONS = {"initial", "min", "max", "backoff", "latency_tolerance"}
+
+
+def concurrency_options(value: Any) -> Optional[Dict[str, Any]]:
+    """
+    The `adaptive_concurrency` setting as a dict, or None if it is off.
+
+    `adaptive_concurrency: true` uses the defaults; a dict may set `initial`,
+    `min`, `max`, `backoff` and `latency_tolerance`.
+
+    Raises:
+        ValueError: If the setting is not one of those forms or its values are out of range.
+    """
+    if not value:
+        return None
+    options = {} if value is True else value
+    if not isinstance(options, dict) or set(options) - _OPTIONS:
+        raise ValueError(f"Invalid adaptive_concurrency setting {value!r} (use true or {{{', '.join(sorted(_OPTIONS))}}})")
+    minimum = options.get("min", 1)
+    maximum = options.get("max", DEFAULT_MAX_CONCURRENCY)
+    initial = options.get("initial", min(DEFAULT_INITIAL_CONCURRENCY, maximum))
+    if not 1 <= minimum <= initial <= maximum:
+        raise ValueError(f"Invalid adaptive_concurrency limits: need 1 <= min ({minimum}) <= initial ({initial}) <= max ({maximum})")
+    if not 0 < options.get("backoff", DEFAULT_BACKOFF) < 1:
+        raise ValueError("adaptive_concurrency backoff must be between 0 and 1")
+    if options.get("latency_tolerance", DEFAULT_LATENCY_TOLERANCE) <= 1:
+        raise ValueError("adaptive_concurrency latency_tolerance must be greater than 1")
+    return dict(options)
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit of one endpoint (a service and credential), adjusted by AIMD.
+
+    While calls succeed with the limit in use and latency near the endpoint's
+    no-load latency, the limit grows by about one per round of calls. A 429,
+    a 5xx or a smoothed latency `latency_tolerance` times the no-load latency
+    multiplies it by `backoff`, at most once per round trip so that one burst
+    of failures counts once. The no-load latency is the lowest one seen,
+    drifting up slowly so an endpoint that got slower isn't judged against
+    one lucky call forever. It is kept per kind of call (see
+    core.ratelimit.call_kind), so e.g. upload chunks are compared with
+    other uploads rather than with metadata reads of the same endpoint.
+    """
+    def __init__(self, initial: float = DEFAULT_INITIAL_CONCURRENCY, minimum: float = 1,
+                 maximum: float = DEFAULT_MAX_CONCURRENCY, backoff: float = DEFAULT_BACKOFF,
+                 latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE):
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.calls = 0
+        self.peak = self.limit
+        self.decreases = 0
+        self.baseline: Dict[str, float] = {}
+        self.latency: Dict[str, float] = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_waiters = deque()
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any], scale: float = 1.0) -> "AdaptiveLimit":
+        """A limit from concurrency_options(); `scale` shrinks it for one of several worker processes."""
+        def scaled(value):
+            return max(1.0, value * scale)
+
+        maximum = options.get("max", DEFAULT_MAX_CONCURRENCY)
+        return cls(scaled(options.get("initial", min(DEFAULT_INITIAL_CONCURRENCY, maximum))),
+                   scaled(options.get("min", 1)), scaled(maximum),
+                   options.get("backoff", DEFAULT_BACKOFF), options.get("latency_tolerance", DEFAULT_LATENCY_TOLERANCE))
+
+    @property
+    def current(self) -> int:
+        """Calls allowed in flight right now."""
+        return max(1, int(self.limit))
+
+    def acquire(self):
+        """Block until a call may start."""
+        with self._cond:
+            while self.in_flight >= self.current:
+                self._cond.wait()
+            self.in_flight += 1
+            self.calls += 1
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a call may start."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < self.current:
+                    self.in_flight += 1
+                    self.calls += 1
+                    return
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            await future
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False, kind: str = None):
+        """
+        End a call and adjust the limit.
+
+        Args:
+            latency (float, optional): Seconds the call took, if it completed.
+            overloaded (bool): Whether the endpoint answered 429 or 5xx.
+            kind (str, optional): What sort of call it was; latencies are only compared within a kind.
+        """
+        with self._cond:
+            saturated = self.in_flight >= self.current
+            self.in_flight -= 1
+            now = time.monotonic()
+            if overloaded:
+                self._decrease(now, self.latency.get(kind, max(self.latency.values(), default=0.0)))
+            elif latency is not None:
+                baseline = self.baseline[kind] = min(latency, self.baseline.get(kind, latency) * 1.01)
+                smoothed = self.latency[kind] = 0.8 * self.latency.get(kind, latency) + 0.2 * latency
+                if smoothed > baseline * self.latency_tolerance:
+                    self._decrease(now, smoothed)
+                elif saturated:
+                    # Only grow while the limit is what holds callers back.
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                    self.peak = max(self.peak, self.limit)
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, deque()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    def _decrease(self, now: float, window: float):
+        if now - self._last_decrease < window:
+            return
+        self.limit = max(self.minimum, self.limit * self.backoff)
+        self.decreases += 1
+        self._last_decrease = now
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
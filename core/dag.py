@@ -0,0 +1,69 @@
+# core/dag.py
+
+from typing import Any, Dict, List
+
+
+def task_id(task: Dict[str, Any]) -> str:
+    """Identifier other tasks use to refer to this one: its `id`, else its `name`."""
+    return task.get("id") or task.get("name", "Unnamed Pipeline")
+
+
+def task_dependencies(task: Dict[str, Any]) -> List[str]:
+    """All upstream task ids: `depends_on` (ordering only) plus `inputs` (ordering and data)."""
+    deps = list(task.get("depends_on", [])) + list(task.get("inputs", []))
+    return list(dict.fromkeys(deps))
+
+
+def has_dependencies(tasks: List[Dict[str, Any]]) -> bool:
+    return any(task.get("depends_on") or task.get("inputs") for task in tasks)
+
+
+def build_waves(tasks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Group tasks into topological waves.
+
+    Every task in a wave depends only on tasks from earlier waves, so the
+    tasks of one wave can run in parallel. Tasks keep their config order
+    within a wave.
+
+    Raises:
+        ValueError: On duplicate ids among referenced tasks, unknown
+            dependencies, tasks with both a fetcher and inputs, or cycles.
+    """
+    by_id: Dict[str, Dict[str, Any]] = {}
+    referenced = {dep for task in tasks for dep in task_dependencies(task)}
+    for task in tasks:
+        tid = task_id(task)
+        if tid in by_id and tid in referenced:
+            raise ValueError(f"Task id '{tid}' is used by more than one task; give each an explicit `id`")
+        by_id.setdefault(tid, task)
+
+    for task in tasks:
+        if task.get("inputs") and task.get("fetcher"):
+            raise ValueError(f"Task '{task_id(task)}' has both a fetcher and inputs; use one or the other")
+        for dep in task_dependencies(task):
+            if dep not in by_id:
+                raise ValueError(f"Task '{task_id(task)}' depends on unknown or disabled task '{dep}'")
+
+    remaining = list(tasks)
+    done = set()
+    waves = []
+    while remaining:
+        wave = [t for t in remaining if all(dep in done for dep in task_dependencies(t))]
+        if not wave:
+            cycle = ", ".join(task_id(t) for t in remaining)
+            raise ValueError(f"Dependency cycle between tasks: {cycle}")
+        waves.append(wave)
+        done.update(task_id(t) for t in wave)
+        in_wave = {id(t) for t in wave}
+        remaining = [t for t in remaining if id(t) not in in_wave]
+    return waves
+
+
+def consumer_counts(tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+    """How many tasks read each task's output through `inputs`."""
+    counts: Dict[str, int] = {}
+    for task in tasks:
+        for dep in dict.fromkeys(task.get("inputs", [])):
+            counts[dep] = counts.get(dep, 0) + 1
+    return counts
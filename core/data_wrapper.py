@@ -1,11 +1,266 @@
 # core/data_wrapper.py
 
-from typing import Any, Dict, List
+import itertools
+import threading
+from collections.abc import Iterator
+from typing import Any, Callable, Dict, Iterable, List
+from core.table import Table
+
 
 class DataWrapper:
+    # Whether `data` arrives in batches (see StreamingDataWrapper).
+    streaming = False
+
     def __init__(self, data: Any, metadata: Dict[str, Any] = None):
         self.data = data
-        self.metadata = metadata or {}
+        self.metadata = metadata if metadata is not None else {}
+
+    def read_only(self) -> "ReadOnlyDataWrapper":
+        """Return an immutable view of this wrapper, safe to share between writers."""
+        return ReadOnlyDataWrapper(self.data, self.metadata)
+
+    def materialize(self) -> "DataWrapper":
+        """Return a wrapper holding the whole payload in `data` (this one, unless streaming)."""
+        return self
+
+    def close(self) -> None:
+        """Release whatever produces the data (a no-op unless streaming)."""
+        pass
+
+    def records(self) -> Iterator:
+        """
+        The records one at a time, for writers that make one API call per record.
+
+        Streams are read batch by batch. Writers should loop over this rather
+        than `data`, so a write journal (see core.journal) can skip records
+        an earlier, interrupted run already wrote.
+        """
+        for batch in iter_batches(self):
+            yield from (batch.to_records() if isinstance(batch, Table) else batch)
+
+    def record_batches(self, size: int) -> Iterator[list]:
+        """
+        The records in lists of up to `size`, for writers that send several records per request.
+
+        Under a write journal the lists can also report which of their
+        records went through (see core.journal.JournalBatch).
+        """
+        batch = []
+        for record in self.records():
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def table(self, header: bool = True) -> Table:
+        """
+        The payload as a columnar Table (returned as-is if it already is one).
+
+        Args:
+            header (bool): For lists of rows, whether the first row holds the column names.
+        """
+        return Table.from_data(self.data, header=header)
 
     def __repr__(self):
         return f"<DataWrapper data={type(self.data)} metadata={self.metadata}>"
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenList(list):
+    """
+    A list that rejects mutation.
+
+    Subclassing list (rather than using a tuple) keeps isinstance checks and
+    JSON serialization in the API clients working unchanged.
+    """
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+class FrozenDict(dict):
+    """A dict that rejects mutation."""
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert lists, tuples and dicts into their read-only equivalents.
+
+    Other values (strings, bytes, numbers, SDK objects) are returned unchanged.
+    """
+    if isinstance(value, (FrozenList, FrozenDict)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class ReadOnlyDataWrapper(DataWrapper):
+    """
+    A DataWrapper whose data and metadata cannot be modified.
+
+    Handed to writers that run concurrently on the same fetched data, so one
+    writer cannot change what another one sees.
+    """
+    def __init__(self, data: Any, metadata: Dict[str, Any] = None):
+        object.__setattr__(self, "data", freeze(data))
+        object.__setattr__(self, "metadata", freeze(metadata or {}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ReadOnlyDataWrapper is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("ReadOnlyDataWrapper is read-only")
+
+    def __reduce__(self):
+        return (ReadOnlyDataWrapper, (self.data, self.metadata))
+
+    def read_only(self) -> "ReadOnlyDataWrapper":
+        return self
+
+
+class StreamingDataWrapper(DataWrapper):
+    """
+    A DataWrapper whose records arrive as an iterator of batches (lists of records or Tables).
+
+    Fetchers return one (or simply a generator of batches) to hand over
+    pages as they arrive; writers with `streaming = True` consume them with
+    batches() while the fetcher is still producing. Reading `data` instead
+    materializes the remaining batches into a single list, so code written
+    for DataWrapper keeps working.
+
+    The batches can be iterated once. `close()` stops the producer and runs
+    the `on_close` callback; it is called automatically when iteration ends.
+    """
+    streaming = True
+
+    def __init__(self, batches: Iterable, metadata: Dict[str, Any] = None, on_close: Callable[[], None] = None):
+        self._source = iter(batches)
+        self._records = None
+        self._consumed = False
+        self._closed = False
+        self._on_close = on_close
+        self.metadata = metadata if metadata is not None else {}
+
+    @property
+    def data(self) -> List[Any]:
+        if self._records is None:
+            batches = list(self.batches())
+            if batches and all(isinstance(b, Table) for b in batches):
+                self._records = Table.concat(batches)
+            else:
+                records = []
+                for batch in batches:
+                    records.extend(batch.to_records() if isinstance(batch, Table) else batch)
+                self._records = records
+        return self._records
+
+    @data.setter
+    def data(self, value):
+        self._records = value
+
+    def batches(self) -> Iterator:
+        """Yield the record batches, or the materialized records as a single batch."""
+        if self._records is not None:
+            if self._records:
+                yield self._records
+            return
+        if self._consumed:
+            raise RuntimeError("StreamingDataWrapper batches can only be iterated once")
+        self._consumed = True
+        try:
+            for batch in self._source:
+                batch = batch.data if isinstance(batch, DataWrapper) else batch
+                yield batch if isinstance(batch, (list, Table)) else list(batch)
+        finally:
+            self.close()
+
+    def materialize(self) -> DataWrapper:
+        return DataWrapper(self.data, self.metadata)
+
+    def read_only(self) -> "StreamingDataWrapper":
+        if self._records is not None:
+            return ReadOnlyDataWrapper(self._records, self.metadata)
+        return StreamingDataWrapper((freeze(b) for b in self.batches()), freeze(self.metadata), self.close)
+
+    def split(self, n: int) -> List["StreamingDataWrapper"]:
+        """
+        Return `n` read-only streams over the same batches, one per consumer.
+
+        Each branch can be consumed from its own thread. Batches not yet read
+        by the slowest branch are buffered; the producer is closed once every
+        branch has been closed.
+        """
+        lock = threading.Lock()
+        branches = itertools.tee(self.batches(), n)
+        open_branches = [n]
+
+        def locked(branch):
+            while True:
+                with lock:
+                    batch = next(branch, None)
+                if batch is None:
+                    return
+                yield freeze(batch)
+
+        def close_branch():
+            with lock:
+                open_branches[0] -= 1
+                last = open_branches[0] == 0
+            if last:
+                self.close()
+
+        return [StreamingDataWrapper(locked(b), freeze(self.metadata), close_branch) for b in branches]
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        close_source = getattr(self._source, "close", None)
+        if close_source is not None:
+            try:
+                close_source()
+            except ValueError:
+                pass  # still being iterated by a writer that overran its timeout
+        if self._on_close is not None:
+            self._on_close()
+
+    def __reduce__(self):
+        # Streams can't cross process boundaries; send the records instead.
+        return (DataWrapper, (self.data, self.metadata))
+
+    def __repr__(self):
+        state = "materialized" if self._records is not None else "consumed" if self._consumed else "pending"
+        return f"<StreamingDataWrapper {state} metadata={self.metadata}>"
+
+
+def as_data_wrapper(value: Any) -> DataWrapper:
+    """Wrap what a fetch operation returned: iterators (e.g. generators of batches) become streams."""
+    if isinstance(value, DataWrapper):
+        return value
+    if isinstance(value, Iterator):
+        return StreamingDataWrapper(value)
+    return value
+
+
+def iter_batches(data: DataWrapper) -> Iterator:
+    """The batches of any DataWrapper; a non-streaming one is a single batch."""
+    if data.streaming:
+        return data.batches()
+    return iter([data.data] if data.data else [])
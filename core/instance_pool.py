@@ -0,0 +1,92 @@
+# core/instance_pool.py
+
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+
+def instance_key(plugin_cfg: Dict[str, Any]) -> str:
+    """Pool key of a fetcher/writer config: its class and constructor params."""
+    return json.dumps({
+        "class": plugin_cfg.get("class"),
+        "params": plugin_cfg.get("params", {}),
+    }, sort_keys=True, default=str)
+
+
+class _Entry:
+    def __init__(self):
+        self.ready = threading.Event()
+        self.instance = None
+        self.error = None
+        # Held while a task uses the instance, unless the plugin says it is thread-safe.
+        self.lock = threading.Lock()
+
+
+class InstancePool:
+    """
+    Keep one initialized fetcher/writer per (class, params) for the whole run.
+
+    The first lease of a key builds and initializes the plugin (credential
+    lookup, `build()`, SDK login); every later lease reuses it. Most SDK
+    clients (notably httplib2-based Google clients) are not thread-safe, so
+    a leased instance is used by one thread at a time unless its class sets
+    `thread_safe = True`.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self.created = 0
+        self.leases = 0
+
+    @contextmanager
+    def lease(self, key: str, factory: Callable[[], Any]):
+        """
+        Yield the pooled instance for `key`, creating it with `factory()` on first use.
+
+        A factory error is raised to every caller waiting on that key and is not
+        cached, so a later lease tries again.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            creator = entry is None
+            if creator:
+                entry = self._entries[key] = _Entry()
+            self.leases += 1
+
+        if creator:
+            try:
+                entry.instance = factory()
+                with self._lock:
+                    self.created += 1
+            except Exception as e:
+                entry.error = e
+                with self._lock:
+                    del self._entries[key]
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            raise entry.error
+
+        if getattr(entry.instance, "thread_safe", False):
+            yield entry.instance
+        else:
+            with entry.lock:
+                yield entry.instance
+
+    def close(self) -> None:
+        """Dispose every pooled instance (calls its `close()`), then empty the pool."""
+        logger = logging.getLogger("pipeline")
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if entry.instance is None:
+                continue
+            try:
+                entry.instance.close()
+            except Exception as e:
+                logger.warning(f"Error closing {entry.instance.__class__.__name__}: {e}")
@@ -4,6 +4,9 @@ from abc import ABC, abstractmethod
 from core.data_wrapper import DataWrapper
 
 class Fetcher(ABC):
+    # Whether one instance may be used by several threads at once (see core.instance_pool).
+    thread_safe = False
+
     def __init__(self, **kwargs):
         self.config = kwargs
 
@@ -20,7 +23,31 @@ class Fetcher(ABC):
         """Optionally list available fetch operations."""
         return {}
 
+    def cache_validator(self, operation: str, params: dict):
+        """
+        Optional cheap freshness token (ETag, modifiedTime, revisionId) for a fetch operation.
+
+        With the result cache (see core.result_cache), an expired entry whose
+        token still matches is reused instead of fetched again. None means
+        there is no such token and the operation is always refetched.
+        """
+        return None
+
+    def close(self):
+        """Optional cleanup at the end of a run (release clients, sockets)."""
+        pass
+
 class Writer(ABC):
+    # Whether one instance may be used by several threads at once (see core.instance_pool).
+    thread_safe = False
+    # Whether operations accept a StreamingDataWrapper and read it with data.batches();
+    # other writers are handed the fully materialized data.
+    streaming = False
+    # Operations that make their calls record by record from data.records() / data.record_batches(),
+    # so a write journal (see core.journal) can skip what an earlier run wrote. Only these are
+    # retried by default under `journal:`; operations that send `data` in bulk would write it twice.
+    journaled_operations = ()
+
     def __init__(self, **kwargs):
         self.config = kwargs
 
@@ -36,3 +63,43 @@ class Writer(ABC):
     def get_operations(self):
         """Optionally list available write operations."""
         return {}
+
+    def close(self):
+        """Optional cleanup at the end of a run (release clients, sockets)."""
+        pass
+
+
+class AsyncFetcher(Fetcher):
+    """
+    Fetcher whose operations are coroutines.
+
+    The asyncio runner awaits them directly on the event loop instead of
+    handing them to a worker thread. `limiter` is set by the runner and can be
+    used to bound fan-out inside an operation (`async with self.limiter.slot(...)`).
+    """
+    limiter = None
+
+    async def initialize(self):
+        """Optional async setup logic after instantiation."""
+        pass
+
+    @abstractmethod
+    async def fetch_data(self) -> DataWrapper:
+        pass
+
+
+class AsyncWriter(Writer):
+    """
+    Writer whose operations are coroutines.
+
+    See AsyncFetcher for how the runner drives them.
+    """
+    limiter = None
+
+    async def initialize(self):
+        """Optional async setup logic after instantiation."""
+        pass
+
+    @abstractmethod
+    async def write_data(self, data: DataWrapper) -> None:
+        pass
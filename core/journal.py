@@ -0,0 +1,279 @@
+# core/journal.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional
+from core.data_wrapper import DataWrapper
+
+DEFAULT_JOURNAL_PATH = ".cache/journal.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS writes (
+    scope TEXT NOT NULL,
+    task TEXT NOT NULL,
+    record TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, record)
+)
+"""
+
+
+def journal_options(writer_cfg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The `journal` setting of a writer config as a dict, or None if it is not journaled.
+
+    `journal: true` keys records by their content; `journal: {key: "Id"}` by a
+    field (or, for rows, a column index) that identifies the record.
+
+    Raises:
+        ValueError: If `journal` is not one of those forms.
+    """
+    value = writer_cfg.get("journal")
+    if not value:
+        return None
+    if value is True:
+        return {}
+    if isinstance(value, dict) and set(value) <= {"key"}:
+        return dict(value)
+    raise ValueError(f"Invalid journal setting {value!r} (use true or {{key: <field>}})")
+
+
+def record_key(record: Any, key_field: Any = None, seen: Dict[str, int] = None) -> str:
+    """
+    Idempotency key of a record.
+
+    With `key_field` it is that field's value. Otherwise it is a hash of the
+    record's content plus its occurrence number, so identical records are
+    still written once each.
+    """
+    if key_field is not None:
+        try:
+            return f"={record[key_field]}"
+        except (KeyError, IndexError, TypeError):
+            raise ValueError(f"Record has no idempotency key field {key_field!r}: {record!r}") from None
+    digest = hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32]
+    if seen is None:
+        return digest
+    seen[digest] = seen.get(digest, 0) + 1
+    return f"{digest}#{seen[digest]}"
+
+
+class WriteJournal:
+    """
+    Write-ahead journal of per-record writes, kept in a SQLite file between runs.
+
+    A writer with `journal:` in its config is handed a JournaledDataWrapper:
+    each record it reads from data.records() is journaled as pending before
+    the writer gets it and as done once the writer asks for the next one
+    (i.e. the call for it returned). Lists from data.record_batches() are
+    journaled the same way, or record by record if the writer settles them.
+    If the run dies, the next run skips the records marked done and resumes
+    from the first unfinished one; a record that was in flight is written
+    again. Once the writer succeeds, its entries are dropped, so the next
+    scheduled run writes everything anew.
+
+    Only writers that loop over data.records() (or data.record_batches())
+    and raise on a failed call can be journaled, and they list those
+    operations in `journaled_operations`; writers that send `data` in bulk
+    are unaffected, and are not retried because of the journal.
+    """
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        self.path = path
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "WriteJournal":
+        return cls(settings.get("journal_path", DEFAULT_JOURNAL_PATH))
+
+    def worker_args(self):
+        return (self.path,)
+
+    def connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Records are read on whichever thread runs the writer.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        return conn
+
+    def scope(self, task: Dict[str, Any], writer_cfg: Dict[str, Any]) -> Optional["JournalScope"]:
+        """The journal of one writer of a task, or None if that writer isn't journaled."""
+        options = journal_options(writer_cfg)
+        if options is None:
+            return None
+        task_name = task.get("name", "Unnamed Pipeline")
+        scope = hashlib.sha256(json.dumps({
+            "task": task_name,
+            "class": writer_cfg["class"],
+            "params": writer_cfg.get("params", {}),
+            "operation": writer_cfg.get("operation", "write_data"),
+            "operation_params": writer_cfg.get("operation_params", {}),
+        }, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return JournalScope(self, scope, task_name, writer_cfg["class"], options.get("key"))
+
+    def reset(self, task_name: str = None) -> int:
+        """Drop the journal of one task (by name) or of all tasks, so their records are all written again."""
+        with closing(self.connect()) as conn:
+            if task_name is None:
+                return conn.execute("DELETE FROM writes").rowcount
+            return conn.execute("DELETE FROM writes WHERE task = ?", (task_name,)).rowcount
+
+
+class JournalScope:
+    """The journal entries of one writer of one task."""
+    def __init__(self, journal: WriteJournal, scope: str, task_name: str, writer: str, key_field: Any = None):
+        self.journal = journal
+        self.scope = scope
+        self.task_name = task_name
+        self.writer = writer
+        self.key_field = key_field
+
+    def wrap(self, data: DataWrapper) -> "JournaledDataWrapper":
+        return JournaledDataWrapper(data, self)
+
+    def _done(self, conn: sqlite3.Connection) -> set:
+        """Keys of the records an earlier run wrote."""
+        rows = conn.execute("SELECT record, status FROM writes WHERE scope = ?", (self.scope,)).fetchall()
+        done = {key for key, status in rows if status == "done"}
+        interrupted = len(rows) - len(done)
+        if done:
+            logging.getLogger("pipeline").info(
+                f"Writer {self.writer}: resuming, {len(done)} record(s) were written by an earlier run"
+                + (f" ({interrupted} interrupted, writing again)" if interrupted else "")
+            )
+        return done
+
+    def records(self, records: Iterator) -> Iterator:
+        """Journal each record around the writer's call for it, skipping those already done."""
+        conn = self.journal.connect()
+        try:
+            done = self._done(conn)
+            seen: Dict[str, int] = {}
+            for record in records:
+                key = record_key(record, self.key_field, seen)
+                if key in done:
+                    continue
+                self._mark(conn, [key], "pending")
+                yield record
+                # Only reached when the writer asks for the next record, i.e. this one went through.
+                self._mark(conn, [key], "done")
+        finally:
+            conn.close()
+
+    def record_batches(self, records: Iterator, size: int) -> Iterator["JournalBatch"]:
+        """Journal lists of up to `size` records around the writer's call(s) for them, skipping records already done."""
+        conn = self.journal.connect()
+        try:
+            done = self._done(conn)
+            seen: Dict[str, int] = {}
+            batch = JournalBatch(self, conn)
+            for record in records:
+                key = record_key(record, self.key_field, seen)
+                if key in done:
+                    continue
+                batch.append(record)
+                batch.keys.append(key)
+                if len(batch) >= size:
+                    yield from self._journaled(conn, batch)
+                    batch = JournalBatch(self, conn)
+            if batch:
+                yield from self._journaled(conn, batch)
+        finally:
+            conn.close()
+
+    def _journaled(self, conn: sqlite3.Connection, batch: "JournalBatch") -> Iterator["JournalBatch"]:
+        self._mark(conn, batch.keys, "pending")
+        yield batch
+        # The writer asked for the next list; whatever it didn't settle went through.
+        batch.settle()
+
+    def _mark(self, conn: sqlite3.Connection, keys: List[str], status: str):
+        now = time.time()
+        with conn:  # one transaction per call, not per record
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO writes (scope, task, record, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(self.scope, self.task_name, key, status, now) for key in keys],
+            )
+
+    def finish(self):
+        """The writer succeeded; forget its records."""
+        with closing(self.journal.connect()) as conn:
+            conn.execute("DELETE FROM writes WHERE scope = ?", (self.scope,))
+
+
+class JournalBatch(list):
+    """
+    A list of records from JournalScope.record_batches().
+
+    A writer whose request can partly fail calls settle() with a flag per
+    record: the records that went through are journaled as done right away
+    and the others stay pending, so a rerun writes only those again.
+    """
+    def __init__(self, scope: JournalScope, conn: sqlite3.Connection):
+        super().__init__()
+        self.keys: List[str] = []
+        self.settled = False
+        self._scope = scope
+        self._conn = conn
+
+    def settle(self, ok: List[bool] = None):
+        """Journal the records whose flag in `ok` is true (all of them if `ok` is None) as done."""
+        if self.settled:
+            return
+        self.settled = True
+        keys = self.keys if ok is None else [key for key, flag in zip(self.keys, ok) if flag]
+        if keys:
+            self._scope._mark(self._conn, keys, "done")
+
+
+class JournaledDataWrapper(DataWrapper):
+    """
+    A writer's view of its data whose records() go through a JournalScope.
+
+    Everything else (`data`, batches(), metadata) is the wrapped DataWrapper's.
+    """
+    def __init__(self, data: DataWrapper, scope: JournalScope):
+        self._wrapped = data
+        self._scope = scope
+        self.metadata = data.metadata
+        self.streaming = data.streaming
+
+    @property
+    def data(self) -> Any:
+        return self._wrapped.data
+
+    def batches(self) -> Iterator:
+        return self._wrapped.batches()
+
+    def records(self) -> Iterator:
+        return self._scope.records(self._wrapped.records())
+
+    def record_batches(self, size: int) -> Iterator[list]:
+        return self._scope.record_batches(self._wrapped.records(), size)
+
+    def materialize(self) -> DataWrapper:
+        return self._wrapped.materialize()
+
+    def read_only(self) -> DataWrapper:
+        return JournaledDataWrapper(self._wrapped.read_only(), self._scope)
+
+    def table(self, header: bool = True):
+        return self._wrapped.table(header)
+
+    def close(self) -> None:
+        self._wrapped.close()
+
+    def __reduce__(self):
+        return (DataWrapper, (self.data, self.metadata))
+
+    def __repr__(self):
+        return f"<JournaledDataWrapper {self._wrapped!r}>"
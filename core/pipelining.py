@@ -0,0 +1,100 @@
+# core/pipelining.py
+
+import queue
+import threading
+from functools import partial
+from typing import List
+from core.data_wrapper import StreamingDataWrapper, freeze
+
+DEFAULT_STREAM_QUEUE_DEPTH = 4
+_POLL_INTERVAL = 0.1
+_END = object()
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Branch:
+    def __init__(self, depth: int):
+        self.queue = queue.Queue(maxsize=depth)
+        self.closed = threading.Event()
+
+
+class StreamPump:
+    """
+    Fetch a stream's batches on a producer thread while writers consume them.
+
+    Each consumer reads from its own queue of at most `depth` batches, so the
+    fetcher runs ahead of the slowest writer by that many batches and then
+    waits (backpressure). Errors and cancellation travel both ways:
+
+    - if the fetch fails, every consumer raises the fetch error once it has
+      read the batches delivered before it;
+    - a consumer that stops early (finished, failed or timed out) is closed
+      and no longer fed, and once every consumer is closed the producer stops
+      and closes the source, so no further pages are requested.
+    """
+    def __init__(self, source: StreamingDataWrapper, consumers: int, depth: int = DEFAULT_STREAM_QUEUE_DEPTH):
+        self.source = source
+        self.branches = [_Branch(max(1, depth)) for _ in range(consumers)]
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._produce, name="stream-producer", daemon=True)
+        self.thread.start()
+
+    def streams(self) -> List[StreamingDataWrapper]:
+        """One stream per consumer; close each when its consumer is done with it."""
+        metadata = freeze(self.source.metadata) if len(self.branches) > 1 else self.source.metadata
+        return [
+            StreamingDataWrapper(self._consume(branch), metadata, on_close=partial(self._close_branch, branch))
+            for branch in self.branches
+        ]
+
+    def cancel(self) -> None:
+        """Stop producing; consumers still reading get no further batches."""
+        self.cancelled.set()
+
+    def _put(self, branch: _Branch, item) -> bool:
+        # Poll so a full queue of a consumer that went away can't block the producer forever.
+        while not branch.closed.is_set() and not self.cancelled.is_set():
+            try:
+                branch.queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        final = _END
+        try:
+            for batch in self.source.batches():
+                if len(self.branches) > 1:
+                    batch = freeze(batch)
+                if not any([self._put(branch, batch) for branch in self.branches]):
+                    break  # every consumer has stopped reading
+        except BaseException as e:
+            final = _Failed(e)
+        finally:
+            self.source.close()
+            for branch in self.branches:
+                self._put(branch, final)
+
+    def _consume(self, branch: _Branch):
+        while True:
+            try:
+                item = branch.queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if self.cancelled.is_set() and not self.thread.is_alive():
+                    raise RuntimeError("Stream was cancelled before it finished")
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+
+    def _close_branch(self, branch: _Branch):
+        branch.closed.set()
+        if all(b.closed.is_set() for b in self.branches):
+            self.cancel()
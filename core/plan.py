@@ -0,0 +1,268 @@
+# core/plan.py
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from core.data_wrapper import FrozenDict, freeze
+from core.registry import registry, describe_class, PluginInfo
+from core.runner import PipelineConfigError
+from core.transforms import check_transforms
+from core.result_cache import cache_policy
+from core.checkpoints import WATERMARK
+from core.dag import build_waves, has_dependencies
+from core.journal import journal_options
+from core.ratelimit import RateLimits
+from core.retry import retry_policy
+from core.transport import transport_options
+
+PLAN_CACHE_DIR = os.path.join(".cache", "plans")
+# Modules whose code decides what compile_plan accepts; changing one recompiles cached plans.
+PLAN_MODULES = (
+    "core.plan", "core.registry", "core.dag", "core.transforms", "core.table", "core.result_cache",
+    "core.checkpoints", "core.journal", "core.ratelimit", "core.concurrency", "core.retry", "core.transport",
+)
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    A fetcher or writer call with its operation resolved at compile time.
+
+    Stored in the compiled task config under `_step`; the runner calls
+    `method` directly instead of going through get_operations() and
+    inspect.signature() on every run.
+    """
+    role: str  # "fetcher" or "writer"
+    class_path: str
+    operation: str
+    # None when the plugin builds its operations at runtime; the runner then resolves the name itself.
+    method: Optional[str]
+    # Writers: number of parameters of the method, which decides what call_writer passes.
+    arg_count: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    A validated, read-only pipeline config.
+
+    Attributes:
+        tasks (tuple): Enabled task configs (FrozenDict), each fetcher/writer carrying its `_step`.
+        skipped (tuple): Names of the disabled tasks.
+        settings (FrozenDict): The config's `settings` block.
+    """
+    tasks: Tuple[FrozenDict, ...]
+    skipped: Tuple[str, ...]
+    settings: FrozenDict
+
+
+def _check_call(params: tuple, kwargs: Dict[str, Any], what: str) -> List[str]:
+    """Problems calling something with signature `params` using keyword arguments `kwargs`."""
+    accepted = {name for name, kind, _ in params if kind in ("positional", "keyword_only")}
+    takes_any = any(kind == "var_keyword" for _, kind, _ in params)
+    errors = []
+    unknown = [k for k in kwargs if k not in accepted and not takes_any]
+    if unknown:
+        errors.append(f"{what} got unexpected parameter(s): {', '.join(unknown)}")
+    missing = [
+        name for name, kind, has_default in params
+        if kind in ("positional", "keyword_only") and not has_default and name not in kwargs
+    ]
+    if missing:
+        errors.append(f"{what} is missing required parameter(s): {', '.join(missing)}")
+    return errors
+
+
+def _describe(class_path: str) -> Optional[PluginInfo]:
+    info = registry().get(class_path)
+    if info is not None:
+        return info
+    # Not readable from source (e.g. defined outside the plugin packages); inspect the real class.
+    try:
+        return describe_class(registry().load_class(class_path))
+    except (ImportError, AttributeError, ValueError):
+        return None
+
+
+def compile_step(cfg: Dict[str, Any], role: str, where: str, errors: List[str]) -> Dict[str, Any]:
+    """
+    Validate one fetcher/writer config entry and return a copy carrying its `_step`.
+
+    Problems are appended to `errors` instead of raised, so one compile
+    reports every mistake in the config.
+    """
+    logger = logging.getLogger("pipeline")
+    class_path = cfg.get("class")
+    operation = cfg.get("operation", "fetch_data" if role == "fetcher" else "write_data")
+    operation_params = cfg.get("operation_params", {})
+    if not class_path:
+        errors.append(f"{where}: missing `class`")
+        return cfg
+
+    info = _describe(class_path)
+    if info is None:
+        errors.append(f"{where}: class '{class_path}' not found")
+        return cfg
+    if info.kind != role:
+        errors.append(f"{where}: {info.name} does not implement {role.capitalize()} Interface")
+        return cfg
+    if info.init is not None:
+        errors += _check_call(info.init.params, cfg.get("params", {}), f"{where}: {info.name}()")
+
+    op = info.operation(operation)
+    if op is None:
+        if info.operations is None:
+            # get_operations() is computed at runtime; leave the lookup to the runner.
+            return {**cfg, "_step": Step(role, class_path, operation, None)}
+        available = ", ".join(sorted(info.operations)) or "none"
+        errors.append(f"{where}: {info.name} has no operation '{operation}' (available: {available})")
+        return cfg
+
+    what = f"{where}: {info.name}.{operation}()"
+    if role == "fetcher":
+        if cfg.get("checkpoint"):
+            # The runner passes the previous watermark to checkpointed fetches.
+            operation_params = {**operation_params, WATERMARK: None}
+        errors += _check_call(op.params, operation_params, what)
+        return {**cfg, "_step": Step(role, class_path, operation, op.method)}
+
+    arg_count = len(op.params)
+    if arg_count >= 2:
+        errors += _check_call(op.params[1:], operation_params, what)
+    elif operation_params:
+        logger.warning(f"{what} takes no operation_params; {', '.join(operation_params)} will be ignored")
+    return {**cfg, "_step": Step(role, class_path, operation, op.method, arg_count)}
+
+
+def compile_plan(config: Dict[str, Any]) -> ExecutionPlan:
+    """
+    Validate a pipeline config and turn it into an ExecutionPlan.
+
+    Checks, for every enabled task, that each fetcher/writer class exists and
+    implements the right interface, that its constructor accepts `params`,
+    that the operation exists and that `operation_params` match its signature,
+    and that the task's `transforms`, fetcher `cache` and writer `journal` settings are well-formed.
+    The `depends_on`/`inputs` of the enabled tasks must form a DAG (see core.dag).
+    Also checks the `rate_limits`, `adaptive_concurrency`, `retry` and `google_http` settings.
+    Plugin modules are read from source where possible (core.registry), so
+    nothing is instantiated and no API is called.
+
+    Raises:
+        PipelineConfigError: Listing every problem found.
+    """
+    errors: List[str] = []
+    tasks, skipped = [], []
+    settings = config.get("settings") or {}
+    try:
+        RateLimits(settings.get("rate_limits"), concurrency=settings.get("adaptive_concurrency"))
+    except ValueError as e:
+        errors.append(f"Settings: {e}")
+    try:
+        transport_options(settings.get("google_http"))
+    except ValueError as e:
+        errors.append(f"Settings: {e}")
+    for task in config.get("pipeline", []):
+        name = task.get("name", "Unnamed Pipeline")
+        if not task.get("enabled", True):
+            skipped.append(name)
+            continue
+
+        compiled = dict(task)
+        try:
+            retry_policy(task, settings)
+        except (ValueError, TypeError) as e:
+            errors.append(f"Task '{name}': {e}")
+        if task.get("fetcher"):
+            compiled["fetcher"] = compile_step(task["fetcher"], "fetcher", f"Task '{name}' fetcher", errors)
+            try:
+                cache_policy(task["fetcher"])
+            except ValueError as e:
+                errors.append(f"Task '{name}' fetcher: {e}")
+            if not isinstance(task["fetcher"].get("retry", True), bool):
+                errors.append(f"Task '{name}' fetcher: retry must be true or false")
+        check_transforms(task.get("transforms"), f"Task '{name}' transforms", errors)
+        compiled["writers"] = [
+            compile_step(cfg, "writer", f"Task '{name}' writer #{i + 1}", errors)
+            for i, cfg in enumerate(task.get("writers", []))
+        ]
+        for i, cfg in enumerate(task.get("writers", [])):
+            try:
+                journal_options(cfg)
+            except ValueError as e:
+                errors.append(f"Task '{name}' writer #{i + 1}: {e}")
+            if not isinstance(cfg.get("retry", False), bool):
+                errors.append(f"Task '{name}' writer #{i + 1}: retry must be true or false")
+        tasks.append(freeze(compiled))
+
+    enabled = [task for task in config.get("pipeline", []) if task.get("enabled", True)]
+    if has_dependencies(enabled):
+        try:
+            build_waves(enabled)
+        except ValueError as e:
+            errors.append(f"Dependencies: {e}")
+
+    if errors:
+        raise PipelineConfigError("Invalid pipeline config:\n" + "\n".join(f"  - {e}" for e in errors))
+    return ExecutionPlan(tuple(tasks), tuple(skipped), freeze(config.get("settings") or {}))
+
+
+def _source_stamp(module: str):
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return None
+    stat = os.stat(spec.origin)
+    return [spec.origin, stat.st_mtime, stat.st_size]
+
+
+def plan_key(config: Dict[str, Any]) -> str:
+    """Cache key of a config's plan: its content plus the mtimes of the validating and plugin modules it uses."""
+    modules = set(PLAN_MODULES)
+    for task in config.get("pipeline", []):
+        for cfg in [task.get("fetcher")] + list(task.get("writers", [])):
+            if cfg and cfg.get("class") and "." in cfg["class"]:
+                modules.add(cfg["class"].rsplit(".", 1)[0])
+    payload = json.dumps({
+        "config": config,
+        "sources": {module: _source_stamp(module) for module in sorted(modules)},
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_plan(config: Dict[str, Any], config_path: str = None, cache_dir: str = PLAN_CACHE_DIR) -> ExecutionPlan:
+    """
+    Return the compiled plan of a config, reusing the copy cached on disk when still valid.
+
+    One cache file is kept per config file (or one for dict configs), and
+    it is recompiled whenever the config or a plugin module it uses changes.
+    """
+    logger = logging.getLogger("pipeline")
+    key = plan_key(config)
+    name = hashlib.sha1(os.path.abspath(config_path).encode("utf-8")).hexdigest() if config_path else "inline"
+    path = os.path.join(cache_dir, f"{name}.pickle")
+
+    try:
+        with open(path, "rb") as f:
+            cached = pickle.load(f)
+        if cached.get("key") == key:
+            return cached["plan"]
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError):
+        pass
+
+    plan = compile_plan(config)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"key": key, "plan": plan}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache the execution plan: {e}")
+    return plan
@@ -0,0 +1,415 @@
+# core/ratelimit.py
+
+import asyncio
+import functools
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from core.concurrency import AdaptiveLimit, concurrency_options
+
+MAX_RATE_LIMIT_RETRIES = 5
+DEFAULT_RETRY_AFTER = 1.0  # seconds to back off after a 429 that doesn't say how long
+_RATE_UNITS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+
+def parse_rate(value: Any) -> float:
+    """
+    Requests per second from a rate setting such as 5, "5/s", "50/min", "1000/h" or "100/100s".
+
+    Raises:
+        ValueError: If the setting isn't a positive rate.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    match = re.fullmatch(r"\s*([\d.]+)\s*/\s*([\d.]*)\s*([a-z]+)\s*", str(value).lower())
+    if not match or match.group(3) not in _RATE_UNITS or float(match.group(1)) <= 0:
+        raise ValueError(f"Invalid rate '{value}' (use requests per second or e.g. '5/s', '50/min', '100/100s')")
+    per = float(match.group(2) or 1) * _RATE_UNITS[match.group(3)]
+    return float(match.group(1)) / per
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` calls per second, in bursts of up to `burst`.
+
+    Callers reserve a token and sleep until it is theirs, so waiting callers
+    are served in order and the bucket never sends more than it allows.
+    pause() holds every caller back, e.g. for a server's Retry-After.
+    """
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self.calls = 0
+        self.waited = 0.0
+        self.rate_limited = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take `tokens` (going into debt if needed); returns the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+            self.calls += 1
+            self.waited += wait
+            return wait
+
+    def acquire(self, tokens: float = 1.0):
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds` (the server said it is over its limit)."""
+        with self._lock:
+            self.rate_limited += 1
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+            self._updated = time.monotonic()
+
+
+class RateLimits:
+    """
+    Token buckets per service and credential, from `settings.rate_limits`.
+
+    Keys are service names ("airtable", "slack", "sheets", ...), values a rate
+    or `{rate, burst, per_credential}`. Each credential (token, account,
+    Airtable base...) gets its own bucket unless `per_credential: false`.
+    Services without an entry are not throttled, but still back off when a
+    server answers 429.
+
+    With `concurrency` (the `adaptive_concurrency` setting, see
+    core.concurrency) each service and credential also gets an AdaptiveLimit
+    on the calls in flight at once.
+    """
+    def __init__(self, config: Dict[str, Any] = None, scale: float = 1.0, concurrency: Any = None):
+        if config is not None and not isinstance(config, dict):
+            raise ValueError(f"Invalid rate limits {config!r} (use a mapping of service name to rate)")
+        self.config = dict(config or {})
+        self.scale = scale
+        self._limits: Dict[str, Tuple[float, float, bool]] = {}
+        for service, spec in self.config.items():
+            if not isinstance(spec, dict):
+                spec = {"rate": spec}
+            if set(spec) - {"rate", "burst", "per_credential"} or "rate" not in spec:
+                raise ValueError(f"Invalid rate limit for '{service}': {spec!r} (use a rate or {{rate, burst, per_credential}})")
+            rate = parse_rate(spec["rate"]) * scale
+            burst = float(spec["burst"]) * scale if "burst" in spec else None
+            self._limits[service] = (rate, burst, spec.get("per_credential", True))
+        self.concurrency_config = concurrency
+        self._concurrency = concurrency_options(concurrency)
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._adaptive: Dict[Tuple[str, str], AdaptiveLimit] = {}
+        self._lock = threading.Lock()
+
+    def worker_args(self, workers: int = 1):
+        """Arguments for a worker process's RateLimits: each of `workers` processes gets its share of every rate."""
+        return (self.config, self.scale / max(1, workers), self.concurrency_config)
+
+    def _credential_key(self, service: str, credential: Any) -> str:
+        if service in self._limits and not self._limits[service][2]:
+            return ""
+        # Credentials are often secrets; only a digest is kept.
+        return hashlib.sha256(str(credential).encode("utf-8")).hexdigest()[:16]
+
+    def bucket(self, service: str, credential: Any = None) -> Optional[TokenBucket]:
+        """The bucket of a service and credential, or None if the service isn't limited."""
+        if service not in self._limits:
+            return None
+        rate, burst, _ = self._limits[service]
+        key = (service, self._credential_key(service, credential))
+        with self._lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket(rate, burst)
+            return self._buckets[key]
+
+    def concurrency(self, service: str, credential: Any = None) -> Optional[AdaptiveLimit]:
+        """The adaptive concurrency limit of a service and credential, or None if adaptive concurrency is off."""
+        if self._concurrency is None:
+            return None
+        key = (service, self._credential_key(service, credential))
+        with self._lock:
+            if key not in self._adaptive:
+                self._adaptive[key] = AdaptiveLimit.from_options(self._concurrency, self.scale)
+            return self._adaptive[key]
+
+    def throttle(self, service: str, credential: Any = None):
+        """Block until the next call to this service with this credential is allowed."""
+        bucket = self.bucket(service, credential)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def throttle_async(self, service: str, credential: Any = None):
+        bucket = self.bucket(service, credential)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+    def back_off(self, service: str, credential: Any, seconds: float):
+        """Wait out a 429, holding back the other callers of the same bucket too."""
+        logging.getLogger("pipeline").warning(f"{service} is rate limiting us; waiting {seconds:.1f}s")
+        bucket = self.bucket(service, credential)
+        if bucket is None:
+            time.sleep(seconds)
+        else:
+            bucket.pause(seconds)  # the retry's throttle() then waits it out
+
+    def call(self, service: str, credential: Any, fn: Callable, *args, classify: Callable = None, kind: str = None,
+             **kwargs):
+        """
+        Call `fn` once the bucket allows it, backing off and retrying while the server answers 429.
+
+        Args:
+            classify (callable, optional): (outcome, attempt) -> seconds to wait or None,
+                for services that signal rate limits differently (default: retry_after).
+            kind (str, optional): Sort of call (see call_kind), for the adaptive concurrency limit.
+
+        Raises:
+            Exception: Whatever `fn` raised, once it isn't a rate limit or retries are used up.
+        """
+        classify = classify or retry_after
+        limit = self.concurrency(service, credential)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.throttle(service, credential)
+            if limit is not None:
+                limit.acquire()
+            started, latency, overloaded = time.monotonic(), None, False
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                wait = classify(e, attempt)
+                overloaded = wait is not None or server_error(e)
+                if wait is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+            else:
+                latency = time.monotonic() - started
+                wait = classify(result, attempt)
+                overloaded = wait is not None or server_error(result)
+                if wait is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                    return result
+                if callable(getattr(result, "close", None)):
+                    result.close()  # a requests Response holds its connection until closed
+            finally:
+                if limit is not None:
+                    limit.release(latency, overloaded, kind)
+            self.back_off(service, credential, wait)
+
+    async def call_async(self, service: str, credential: Any, fn: Callable, *args, classify: Callable = None,
+                         kind: str = None, **kwargs):
+        """call() for coroutine functions; waits without blocking the event loop."""
+        classify = classify or retry_after
+        limit = self.concurrency(service, credential)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await self.throttle_async(service, credential)
+            if limit is not None:
+                await limit.acquire_async()
+            started, latency, overloaded = time.monotonic(), None, False
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                wait = classify(e, attempt)
+                overloaded = wait is not None or server_error(e)
+                if wait is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+            else:
+                latency = time.monotonic() - started
+                wait = classify(result, attempt)
+                overloaded = wait is not None or server_error(result)
+                if wait is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                    return result
+            finally:
+                if limit is not None:
+                    limit.release(latency, overloaded, kind)
+            logging.getLogger("pipeline").warning(f"{service} is rate limiting us; waiting {wait:.1f}s")
+            bucket = self.bucket(service, credential)
+            if bucket is None:
+                await asyncio.sleep(wait)
+            else:
+                bucket.pause(wait)
+
+    def summary(self, since: Dict[str, Tuple[int, float, int]] = None) -> Dict[str, Tuple[int, float, int]]:
+        """
+        Per service: (calls, seconds spent waiting, 429s).
+
+        Args:
+            since (dict, optional): An earlier summary; only what happened after it is counted,
+                and services without new calls are left out.
+        """
+        totals: Dict[str, list] = {}
+        with self._lock:
+            for (service, _), bucket in self._buckets.items():
+                total = totals.setdefault(service, [0, 0.0, 0])
+                total[0] += bucket.calls
+                total[1] += bucket.waited
+                total[2] += bucket.rate_limited
+        if since is None:
+            return {service: tuple(total) for service, total in totals.items()}
+        usage = {}
+        for service, total in totals.items():
+            before = since.get(service, (0, 0.0, 0))
+            if total[0] > before[0]:
+                usage[service] = tuple(now - then for now, then in zip(total, before))
+        return usage
+
+    def concurrency_summary(self, since: Dict[str, Tuple[int, int, int, int, int]] = None):
+        """
+        Per service with adaptive concurrency: (lowest current limit, highest current limit, peak, decreases, calls).
+
+        Args:
+            since (dict, optional): An earlier summary; services without calls since then are left out.
+        """
+        totals: Dict[str, list] = {}
+        with self._lock:
+            for (service, _), limit in self._adaptive.items():
+                total = totals.setdefault(service, [limit.current, limit.current, 0, 0, 0])
+                total[0] = min(total[0], limit.current)
+                total[1] = max(total[1], limit.current)
+                total[2] = max(total[2], int(limit.peak))
+                total[3] += limit.decreases
+                total[4] += limit.calls
+        return {service: tuple(total) for service, total in totals.items()
+                if since is None or total[4] > since.get(service, (0, 0, 0, 0, 0))[4]}
+
+
+def _header(headers: Any, name: str) -> Optional[str]:
+    if not headers:
+        return None
+    for key in (name, name.lower()):
+        try:
+            value = headers.get(key)
+        except AttributeError:
+            return None
+        if value is not None:
+            return value
+    return None
+
+
+def _response(outcome: Any) -> Any:
+    """The HTTP response an outcome (a response or an SDK exception) carries."""
+    # Not `or`: a requests Response with an error status is falsy.
+    response = getattr(outcome, "response", None)
+    if response is None:
+        response = getattr(outcome, "resp", None)  # googleapiclient HttpError
+    if response is None and isinstance(outcome, tuple) and outcome:
+        response = outcome[0]  # httplib2 returns (response, content)
+    return outcome if response is None else response
+
+
+def status_code(outcome: Any) -> Optional[int]:
+    """HTTP status of an outcome (a response or an SDK exception), if it has one."""
+    response = _response(outcome)
+    status = getattr(response, "status_code", None) or getattr(response, "status", None) or getattr(outcome, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def server_error(outcome: Any) -> bool:
+    """Whether an outcome is a 5xx answer, i.e. the server is struggling."""
+    status = status_code(outcome)
+    return status is not None and 500 <= status < 600
+
+
+def retry_after(outcome: Any, attempt: int = 0) -> Optional[float]:
+    """
+    Seconds to wait if `outcome` (an exception or an HTTP response) is a rate-limit answer, else None.
+
+    Understands HTTP 429 responses and the errors of the SDKs used here
+    (googleapiclient HttpError, requests, slack_sdk, Dropbox RateLimitError,
+    Twilio), honoring Retry-After when the server sends it and otherwise
+    backing off exponentially from DEFAULT_RETRY_AFTER.
+    """
+    backoff = getattr(outcome, "backoff", None)  # dropbox.exceptions.RateLimitError
+    if isinstance(backoff, (int, float)) and backoff > 0:
+        return float(backoff)
+    response = _response(outcome)
+    if status_code(outcome) != 429:
+        return None
+    value = _header(getattr(response, "headers", None), "Retry-After")
+    if value is None and isinstance(response, dict):
+        value = response.get("retry-after")  # httplib2 responses are dicts of lowercased headers
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER * 2 ** attempt
+
+
+def call_kind(method: str, url: str) -> str:
+    """
+    A coarse sort of HTTP call, e.g. "PUT upload" or "GET call", for comparing latencies.
+
+    Uploads and downloads take far longer than other calls to the same API,
+    so each is only compared with its own kind (see AdaptiveLimit). Paths
+    are not part of it, since they carry IDs.
+    """
+    parts = urlsplit(url)
+    path, query = parts.path.lower(), parts.query.lower()
+    if "upload" in path or "uploadtype=" in query:
+        transfer = "upload"
+    elif "download" in path or "alt=media" in query or "/export" in path:
+        transfer = "download"
+    else:
+        transfer = "call"
+    return f"{(method or 'GET').upper()} {transfer}"
+
+
+def limit_calls(client: Any, method: str, service: str, credential: Any, limits: "RateLimits" = None):
+    """
+    Route every call of an SDK client's `method` (the one all its API calls go through) via the rate limits.
+
+    E.g. `limit_calls(slack_client, "api_call", "slack", token)`.
+    """
+    original = getattr(client, method)
+
+    @functools.wraps(original)
+    def limited(*args, **kwargs):
+        return (limits or rate_limits()).call(service, credential, original, *args, **kwargs)
+
+    setattr(client, method, limited)
+    return client
+
+
+def mount(session: Any, service: str, credential: Any, limits: "RateLimits" = None):
+    """Route every request of a requests.Session (used by most SDKs here) via the rate limits."""
+    from requests.adapters import HTTPAdapter
+
+    class RateLimitedAdapter(HTTPAdapter):
+        def send(self, request, *args, **kwargs):
+            return (limits or rate_limits()).call(service, credential, super().send, request, *args,
+                                                  kind=call_kind(request.method, request.url), **kwargs)
+
+    adapter = RateLimitedAdapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_rate_limits = RateLimits()
+
+
+def rate_limits() -> RateLimits:
+    """The rate limits of the current run (unlimited until configure_rate_limits() is called)."""
+    return _rate_limits
+
+
+def configure_rate_limits(config: Dict[str, Any] = None, scale: float = 1.0, concurrency: Any = None) -> RateLimits:
+    """
+    Set the process-wide rate limits from `settings.rate_limits` and `settings.adaptive_concurrency`.
+
+    If neither changed, the buckets and adaptive limits are kept, so back-to-back
+    runs in one process don't start with a fresh burst and keep the concurrency they found.
+    """
+    global _rate_limits
+    if (_rate_limits.config != (config or {}) or _rate_limits.scale != scale
+            or _rate_limits.concurrency_config != concurrency):
+        _rate_limits = RateLimits(config, scale, concurrency)
+    return _rate_limits
@@ -0,0 +1,363 @@
+# core/registry.py
+
+import ast
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+PLUGIN_PACKAGES = ("fetchers", "writers")
+MANIFEST_PATH = os.path.join(".cache", "plugins.json")
+MANIFEST_VERSION = 2
+
+
+@dataclass(frozen=True)
+class OperationInfo:
+    """An operation as declared in a plugin's source."""
+    name: str
+    method: str
+    doc: Optional[str] = None
+    signature: str = "()"
+    # (name, kind, has_default) for every parameter except `self`;
+    # kind is one of "positional", "var_positional", "keyword_only", "var_keyword".
+    params: tuple = ()
+
+
+@dataclass(frozen=True)
+class PluginInfo:
+    """What the registry knows about a plugin class without importing it."""
+    class_path: str
+    name: str
+    kind: Optional[str]  # "fetcher", "writer" or None if it could not be told from the bases
+    is_async: bool = False
+    doc: Optional[str] = None
+    # None when get_operations() is not a plain dict literal and can only be read at runtime.
+    operations: Optional[Dict[str, OperationInfo]] = None
+    # Public methods (what runner.resolve_operation falls back to) and the constructor.
+    methods: Dict[str, OperationInfo] = field(default_factory=dict)
+    init: Optional[OperationInfo] = None
+
+    def operation(self, name: str) -> Optional[OperationInfo]:
+        """The method an operation name resolves to: a declared operation, else a public method."""
+        return (self.operations or {}).get(name) or self.methods.get(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PluginInfo":
+        def op_info(op):
+            return OperationInfo(**{**op, "params": tuple(tuple(p) for p in op["params"])})
+
+        operations = data.get("operations")
+        if operations is not None:
+            operations = {name: op_info(op) for name, op in operations.items()}
+        return cls(**{
+            **data,
+            "operations": operations,
+            "methods": {name: op_info(op) for name, op in data.get("methods", {}).items()},
+            "init": op_info(data["init"]) if data.get("init") else None,
+        })
+
+
+def _params(args: ast.arguments) -> tuple:
+    positional = list(args.posonlyargs) + list(args.args)
+    defaults_from = len(positional) - len(args.defaults)
+    params = [(a.arg, "positional", i >= defaults_from) for i, a in enumerate(positional)]
+    if args.vararg:
+        params.append((args.vararg.arg, "var_positional", False))
+    params += [(a.arg, "keyword_only", d is not None) for a, d in zip(args.kwonlyargs, args.kw_defaults)]
+    if args.kwarg:
+        params.append((args.kwarg.arg, "var_keyword", False))
+    return tuple(params[1:]) if params and params[0][0] in ("self", "cls") else tuple(params)
+
+
+def _signature(node) -> str:
+    try:
+        text = ast.unparse(node.args)
+    except AttributeError:  # Python < 3.9
+        text = ", ".join(a.arg for a in node.args.args)
+    parts = text.split(", ", 1)
+    if parts[0] in ("self", "cls"):
+        text = parts[1] if len(parts) > 1 else ""
+    return f"({text})"
+
+
+def _declared_operations(func) -> Optional[Dict[str, str]]:
+    """Map of operation name -> method name, if get_operations() returns a `{"op": self.method}` literal."""
+    returns = [n for n in ast.walk(func) if isinstance(n, ast.Return)]
+    if len(returns) != 1 or not isinstance(returns[0].value, ast.Dict):
+        return None
+    operations = {}
+    for key, value in zip(returns[0].value.keys, returns[0].value.values):
+        if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+            return None
+        if not (isinstance(value, ast.Attribute) and isinstance(value.value, ast.Name) and value.value.id == "self"):
+            return None
+        operations[key.value] = value.attr
+    return operations
+
+
+def _is_property(func) -> bool:
+    return any(_base_name(d) in ("property", "cached_property") for d in func.decorator_list)
+
+
+def _base_name(node) -> str:
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return getattr(node, "id", "")
+
+
+def scan_source(source: str, module: str) -> Dict[str, PluginInfo]:
+    """
+    Read the plugin classes of a module from its source, without importing it.
+
+    Every top-level class deriving (directly or through another class of the
+    same module) from Fetcher/Writer or their async variants is recorded with
+    the operations its get_operations() declares.
+    """
+    tree = ast.parse(source)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+
+    def lineage(name, seen=()):
+        # Class names of `name` and its bases, following bases defined in this module.
+        node = classes.get(name)
+        if node is None or name in seen:
+            return [name]
+        names = [name]
+        for base in node.bases:
+            names += lineage(_base_name(base), seen + (name,))
+        return names
+
+    def methods(name):
+        found = {}
+        for cls_name in reversed(lineage(name)):
+            node = classes.get(cls_name)
+            if node is not None:
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        found[item.name] = item
+        return found
+
+    plugins = {}
+    for name in classes:
+        bases = lineage(name)[1:]
+        if any(b in ("Fetcher", "AsyncFetcher") for b in bases):
+            kind = "fetcher"
+        elif any(b in ("Writer", "AsyncWriter") for b in bases):
+            kind = "writer"
+        else:
+            continue
+
+        own = methods(name)
+
+        def describe(op_name, method_name):
+            func = own.get(method_name)
+            return OperationInfo(
+                name=op_name,
+                method=method_name,
+                doc=ast.get_docstring(func, clean=False) if func else None,
+                signature=_signature(func) if func else "(...)",
+                params=_params(func.args) if func else (),
+            )
+
+        declared = _declared_operations(own["get_operations"]) if "get_operations" in own else {}
+        operations = None
+        if declared is not None:
+            operations = {op_name: describe(op_name, method_name) for op_name, method_name in declared.items()}
+
+        plugins[f"{module}.{name}"] = PluginInfo(
+            class_path=f"{module}.{name}",
+            name=name,
+            kind=kind,
+            is_async=any(b in ("AsyncFetcher", "AsyncWriter") for b in bases),
+            doc=ast.get_docstring(classes[name]),
+            operations=operations,
+            methods={m: describe(m, m) for m, func in own.items() if not m.startswith("_") and not _is_property(func)},
+            init=describe("__init__", "__init__") if "__init__" in own else None,
+        )
+    return plugins
+
+
+def _inspect_params(func) -> tuple:
+    kinds = {
+        inspect.Parameter.POSITIONAL_ONLY: "positional",
+        inspect.Parameter.POSITIONAL_OR_KEYWORD: "positional",
+        inspect.Parameter.VAR_POSITIONAL: "var_positional",
+        inspect.Parameter.KEYWORD_ONLY: "keyword_only",
+        inspect.Parameter.VAR_KEYWORD: "var_keyword",
+    }
+    params = list(inspect.signature(func).parameters.values())
+    if params and params[0].name in ("self", "cls"):
+        params = params[1:]
+    return tuple((p.name, kinds[p.kind], p.default is not inspect.Parameter.empty) for p in params)
+
+
+def describe_class(plugin_class: type) -> PluginInfo:
+    """
+    Describe an imported plugin class with `inspect`.
+
+    Fallback for classes scan_source() can't read, e.g. plugins that subclass
+    a plugin from another module. Operations are only listed if the class
+    overrides get_operations(), which needs an instance and is not called here.
+    """
+    def describe(op_name, func):
+        try:
+            sig = str(inspect.signature(func)).replace("(self, ", "(").replace("(self)", "()")
+            params = _inspect_params(func)
+        except (TypeError, ValueError):
+            sig, params = "(...)", ()
+        return OperationInfo(op_name, func.__name__, func.__doc__, sig, params)
+
+    mro_names = [c.__name__ for c in plugin_class.__mro__]
+    kind = "fetcher" if "Fetcher" in mro_names else "writer" if "Writer" in mro_names else None
+    methods = {
+        name: describe(name, func) for name, func in inspect.getmembers(plugin_class, inspect.isfunction)
+        if not name.startswith("_")
+    }
+    # The base Fetcher/Writer constructor accepts any keyword, so there is nothing to check.
+    init = plugin_class.__init__
+    if init.__qualname__ in ("Fetcher.__init__", "Writer.__init__", "object.__init__"):
+        init = None
+    return PluginInfo(
+        class_path=f"{plugin_class.__module__}.{plugin_class.__name__}",
+        name=plugin_class.__name__,
+        kind=kind,
+        is_async=any(n in ("AsyncFetcher", "AsyncWriter") for n in mro_names),
+        doc=plugin_class.__doc__,
+        operations=None,
+        methods=methods,
+        init=describe("__init__", init) if init is not None else None,
+    )
+
+
+class PluginRegistry:
+    """
+    Index of the available fetchers and writers, built from their source.
+
+    The plugin packages are parsed with `ast`, never imported, so listing
+    plugins and their operations does not load any SDK or run any
+    constructor. The result is kept in a manifest on disk and a module is
+    only re-parsed when its file changes. Classes are imported lazily, once,
+    the first time a task needs them (load_class).
+    """
+    def __init__(self, packages=PLUGIN_PACKAGES, manifest_path: str = MANIFEST_PATH):
+        self.packages = packages
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._modules: Optional[Dict[str, Dict[str, Any]]] = None
+        self._plugins: Dict[str, PluginInfo] = {}
+        self._classes: Dict[str, type] = {}
+
+    def _module_files(self):
+        for package in self.packages:
+            spec = importlib.util.find_spec(package)
+            if spec is None or not spec.submodule_search_locations:
+                continue
+            for directory in spec.submodule_search_locations:
+                for filename in sorted(os.listdir(directory)):
+                    if filename.endswith(".py") and not filename.startswith("_"):
+                        yield f"{package}.{filename[:-3]}", os.path.join(directory, filename)
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest.get("modules", {}) if manifest.get("version") == MANIFEST_VERSION else {}
+
+    def _write_manifest(self):
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+            tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"version": MANIFEST_VERSION, "modules": self._modules}, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError:
+            pass  # the manifest is only a cache
+
+    def _scan_module(self, module, path, cached) -> bool:
+        """Refresh one module's entry; returns True if it had to be re-parsed."""
+        stat = os.stat(path)
+        entry = cached.get(path)
+        if entry is None or entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size:
+            with open(path, "r", encoding="utf-8") as f:
+                plugins = scan_source(f.read(), module)
+            entry = {
+                "module": module,
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "plugins": {path_: info.to_dict() for path_, info in plugins.items()},
+            }
+            changed = True
+        else:
+            changed = False
+        self._modules[path] = entry
+        for class_path, data in entry["plugins"].items():
+            self._plugins[class_path] = PluginInfo.from_dict(data)
+        return changed
+
+    def scan(self) -> None:
+        """Index the plugin packages (re-parsing only modules changed since the manifest was written)."""
+        with self._lock:
+            if self._modules is not None:
+                return
+            cached = self._read_manifest()
+            self._modules = {}
+            changed = False
+            for module, path in self._module_files():
+                changed = self._scan_module(module, path, cached) or changed
+            if changed or set(cached) != set(self._modules):
+                self._write_manifest()
+
+    def plugins(self, kind: str = None) -> List[PluginInfo]:
+        self.scan()
+        return [p for p in self._plugins.values() if kind is None or p.kind == kind]
+
+    def get(self, class_path: str) -> Optional[PluginInfo]:
+        """
+        Describe a plugin class without importing it.
+
+        Classes outside the plugin packages are looked up from their module's
+        source on demand.
+
+        Returns:
+            PluginInfo | None: None if the class is not a Fetcher/Writer or its source can't be found.
+        """
+        self.scan()
+        info = self._plugins.get(class_path)
+        if info is not None or "." not in class_path:
+            return info
+
+        module = class_path.rsplit(".", 1)[0]
+        try:
+            spec = importlib.util.find_spec(module)
+        except (ImportError, ValueError):
+            return None
+        if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+            return None
+        with self._lock:
+            self._scan_module(module, spec.origin, {})
+        return self._plugins.get(class_path)
+
+    def load_class(self, class_path: str) -> type:
+        """Import a plugin class (once per process) from its dotted path."""
+        plugin_class = self._classes.get(class_path)
+        if plugin_class is None:
+            module_path, class_name = class_path.rsplit(".", 1)
+            module = importlib.import_module(module_path)
+            plugin_class = self._classes[class_path] = getattr(module, class_name)
+        return plugin_class
+
+
+_registry = PluginRegistry()
+
+
+def registry() -> PluginRegistry:
+    """The process-wide plugin registry."""
+    return _registry
@@ -0,0 +1,251 @@
+# core/result_cache.py
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from core.binary_payload import BinaryPayload, StreamingBinaryPayload
+from core.data_wrapper import DataWrapper
+from core.spill import parse_size, format_size
+
+DEFAULT_CACHE_PATH = ".cache/results.sqlite"
+DEFAULT_CACHE_TTL = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    validator TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CachePolicy:
+    """
+    How one task's fetch is cached, from the `cache` key of its fetcher config.
+
+    Attributes:
+        ttl (float, optional): Seconds an entry is used without asking the source; None never expires.
+        validate (bool): Whether an expired entry may be revalidated with the fetcher's cache_validator().
+    """
+    ttl: Optional[float] = DEFAULT_CACHE_TTL
+    validate: bool = True
+
+
+@dataclass
+class CacheEntry:
+    """A cached fetch result."""
+    data: DataWrapper
+    validator: Optional[str]
+    stored_at: float
+    size: int
+
+    def fresh(self, ttl: Optional[float]) -> bool:
+        return ttl is None or time.time() - self.stored_at < ttl
+
+
+def cache_policy(fetcher_cfg: Dict[str, Any], default_ttl: Optional[float] = DEFAULT_CACHE_TTL) -> Optional[CachePolicy]:
+    """
+    The CachePolicy of a fetcher config, or None if its results are not cached.
+
+    `cache: true` uses the default TTL, `cache: 600` sets the TTL in seconds and
+    `cache: {ttl: 600, validate: false}` sets both.
+
+    Raises:
+        ValueError: If `cache` is not one of those forms.
+    """
+    value = fetcher_cfg.get("cache")
+    if value is None or value is False:
+        return None
+    if value is True:
+        return CachePolicy(default_ttl)
+    if isinstance(value, (int, float)):
+        return CachePolicy(float(value))
+    if isinstance(value, dict) and set(value) <= {"ttl", "validate"}:
+        ttl = value.get("ttl", default_ttl)
+        return CachePolicy(None if ttl is None else float(ttl), bool(value.get("validate", True)))
+    raise ValueError(f"Invalid cache setting {value!r} (use true, a TTL in seconds or {{ttl, validate}})")
+
+
+def _holds_stream(value: Any) -> bool:
+    """Whether a payload carries read-once content (e.g. a StreamingBinaryPayload), which pickling would consume."""
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, list) else ()
+    return any(getattr(item, "streaming", False) for item in [value, *items])
+
+
+def _holds_file(value: Any, depth: int = 0) -> bool:
+    """Whether a payload carries file contents, which pickling would read into memory whole."""
+    if isinstance(value, (BinaryPayload, StreamingBinaryPayload)):
+        return True
+    if depth >= 2:  # e.g. [{"metadata": ..., "content": payload}, ...]
+        return False
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, (list, tuple)) else ()
+    return any(_holds_file(item, depth + 1) for item in items)
+
+
+class ResultCache:
+    """
+    Disk-backed cache of fetch results, shared between runs.
+
+    Entries are keyed by fetcher class, params, operation and operation
+    params (see core.singleflight.fetch_key) and stored as compressed pickles
+    in a SQLite database, so worker processes and later runs share them.
+    When the total size passes `max_size`, the least recently used entries
+    are evicted. Only tasks whose fetcher config has `cache:` use it (see
+    cache_policy); streams and file contents are never cached.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_size: Optional[int] = None,
+                 ttl: Optional[float] = DEFAULT_CACHE_TTL):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = self.revalidated = self.misses = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["ResultCache"]:
+        """The cache configured under `settings.result_cache`, or None if there is none."""
+        cfg = settings.get("result_cache")
+        if not cfg:
+            return None
+        if cfg is True:
+            cfg = {}
+        return cls(cfg.get("path", DEFAULT_CACHE_PATH), parse_size(cfg.get("max_size")), cfg.get("ttl", DEFAULT_CACHE_TTL))
+
+    def worker_args(self):
+        return (self.path, self.max_size, self.ttl)
+
+    def policy(self, fetcher_cfg: Dict[str, Any]) -> Optional[CachePolicy]:
+        return cache_policy(fetcher_cfg, self.ttl)
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections can't be shared between threads; each thread opens its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def record(self, outcome: str):
+        """Count a lookup as one of "hits", "revalidated" or "misses"."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """The entry stored under `key`, fresh or not, or None (also when the database can't be read)."""
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload, size, validator, stored_at FROM results WHERE key = ?", (self._key(key),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.getLogger("pipeline").warning(f"Result cache unavailable: {e}")
+            return None
+        if row is None:
+            return None
+        payload, size, validator, stored_at = row
+        try:
+            data, metadata = pickle.loads(zlib.decompress(payload))
+        except Exception as e:
+            # Written by an incompatible version of a payload class; fetch it again.
+            logging.getLogger("pipeline").warning(f"Dropping unreadable cache entry: {e}")
+            conn.execute("DELETE FROM results WHERE key = ?", (self._key(key),))
+            return None
+        conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), self._key(key)))
+        return CacheEntry(DataWrapper(data, metadata), validator, stored_at, size)
+
+    def put(self, key: str, data: DataWrapper, validator: Optional[str] = None) -> bool:
+        """
+        Store a fetch result, evicting least recently used entries past `max_size`.
+
+        Returns:
+            bool: Whether it was stored (streams, file contents, unpicklable
+            payloads and payloads larger than the whole cache are not).
+        """
+        logger = logging.getLogger("pipeline")
+        if data.streaming or _holds_stream(data.data):
+            return False
+        if _holds_file(data.data):
+            # Caching it would read the whole file into memory, and a hit would hand it back in memory.
+            logger.info("Result not cached, it holds file contents")
+            return False
+        try:
+            payload = zlib.compress(pickle.dumps((data.data, data.metadata), protocol=pickle.HIGHEST_PROTOCOL), 1)
+        except Exception as e:
+            logger.info(f"Result not cached, it can't be pickled: {e}")
+            return False
+        if self.max_size is not None and len(payload) > self.max_size:
+            logger.info(f"Result not cached, {format_size(len(payload))} exceeds the cache size")
+            return False
+
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, payload, size, validator, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._key(key), payload, len(payload), validator, now, now),
+                )
+                if self.max_size is not None:
+                    self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # A cache that can't be written only costs a refetch next time.
+            logger.warning(f"Result not cached: {e}")
+            return False
+        return True
+
+    def _evict(self, conn: sqlite3.Connection):
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total <= self.max_size:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall():
+            if total <= self.max_size:
+                break
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logging.getLogger("pipeline").info(f"Result cache: evicted {evicted} least recently used entr{'y' if evicted == 1 else 'ies'}")
+
+    def touch(self, key: str):
+        """Restart an entry's TTL after its validator confirmed it is still current."""
+        self._connection().execute("UPDATE results SET stored_at = ? WHERE key = ?", (time.time(), self._key(key)))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
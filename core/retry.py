@@ -0,0 +1,197 @@
+# core/retry.py
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+from core.ratelimit import retry_after, status_code
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY = 1.0
+DEFAULT_RETRY_MAX_DELAY = 30.0
+DEFAULT_RETRY_BUDGET = 10
+
+TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Error classes, by SDK (top-level module) and class name, that are transient or permanent whatever their status.
+_TRANSIENT_ERRORS = {
+    ("dropbox", "RateLimitError"), ("dropbox", "InternalServerError"),
+    ("requests", "ConnectionError"), ("requests", "Timeout"), ("requests", "ChunkedEncodingError"),
+    ("urllib3", "ProtocolError"), ("urllib3", "TimeoutError"),
+    ("httplib2", "ServerNotFoundError"),
+    ("google", "TransportError"),
+}
+_PERMANENT_ERRORS = {
+    ("dropbox", "ApiError"), ("dropbox", "AuthError"), ("dropbox", "BadInputError"),
+    ("google", "RefreshError"),
+}
+# Error codes in an SDK's error payload that mean a rate limit rather than a 429 status.
+_RATE_LIMIT_CODES = {
+    "googleapiclient": ("rateLimitExceeded", "userRateLimitExceeded"),
+}
+# Error codes in an SDK's error payload that mean "try again later", whatever the status.
+_TRANSIENT_CODES = {
+    "googleapiclient": ("rateLimitExceeded", "userRateLimitExceeded", "backendError"),
+    "slack_sdk": ("ratelimited", "internal_error", "fatal_error", "service_unavailable", "request_timeout"),
+    "simple_salesforce": ("REQUEST_LIMIT_EXCEEDED", "SERVER_UNAVAILABLE", "UNABLE_TO_LOCK_ROW"),
+}
+
+
+def _error_text(error: Exception) -> str:
+    content = getattr(error, "content", None)  # googleapiclient HttpError, simple_salesforce errors
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", "replace")
+    return f"{error} {content or ''}"
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether an error is worth retrying: a timeout, a dropped connection, a rate limit or a server error.
+
+    Knows the errors of the SDKs used by the plugins (googleapiclient HttpError,
+    SlackApiError, Dropbox, simple_salesforce, Twilio, requests) without
+    importing them; anything else counts as transient only if it carries a
+    408, 429 or 5xx status. Auth and validation errors are permanent. An
+    error raised from another one (`raise ... from e`) is judged by its cause.
+    """
+    if error.__cause__ is not None and is_transient(error.__cause__):
+        return True
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    for cls in type(error).__mro__:
+        key = (cls.__module__.split(".")[0], cls.__name__)
+        if key in _TRANSIENT_ERRORS:
+            return True
+        if key in _PERMANENT_ERRORS:
+            return False
+    sdk = type(error).__module__.split(".")[0]
+    if sdk in _TRANSIENT_CODES and any(code in _error_text(error) for code in _TRANSIENT_CODES[sdk]):
+        return True
+    return status_code(error) in TRANSIENT_STATUSES
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """
+    Whether an error is a rate limit (a 429 or an SDK's equivalent).
+
+    Connector calls wait these out and retry them themselves (see
+    core.ratelimit.RateLimits.call), so RetryBudget doesn't retry the
+    whole operation on top of that.
+    """
+    if error.__cause__ is not None and is_rate_limited(error.__cause__):
+        return True
+    if retry_after(error) is not None:
+        return True
+    sdk = type(error).__module__.split(".")[0]
+    return sdk in _RATE_LIMIT_CODES and any(code in _error_text(error) for code in _RATE_LIMIT_CODES[sdk])
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How a task retries transient errors of its plugin operations.
+
+    Attributes:
+        attempts (int): Tries per operation call, including the first.
+        base_delay (float): Seconds of the first backoff; it doubles with every retry.
+        max_delay (float): Cap on one backoff.
+        budget (int, optional): Retries allowed in the whole task; None for no limit.
+    """
+    attempts: int = DEFAULT_RETRY_ATTEMPTS
+    base_delay: float = DEFAULT_RETRY_BASE_DELAY
+    max_delay: float = DEFAULT_RETRY_MAX_DELAY
+    budget: Optional[int] = DEFAULT_RETRY_BUDGET
+
+    def delay(self, attempt: int, error: BaseException = None) -> float:
+        """Backoff before retry number `attempt` + 1: full jitter, but never shorter than the server's Retry-After."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        hint = retry_after(error, attempt) if error is not None else None
+        return max(backoff, hint or 0.0)
+
+
+def retry_policy(task: Dict[str, Any], settings: Dict[str, Any]) -> Optional[RetryPolicy]:
+    """
+    The RetryPolicy of a task: `settings.retry` with the task's own `retry` on top.
+
+    Either may be `false` to turn retries off, or a dict of `attempts`,
+    `base_delay`, `max_delay` and `budget`.
+
+    Raises:
+        ValueError: If a `retry` setting is not one of those forms.
+    """
+    options: Dict[str, Any] = {}
+    for value in (settings.get("retry", True), task.get("retry", True)):
+        if value is False:
+            return None
+        if value is True:
+            continue
+        if not isinstance(value, dict) or set(value) - {"attempts", "base_delay", "max_delay", "budget"}:
+            raise ValueError(f"Invalid retry setting {value!r} (use false or {{attempts, base_delay, max_delay, budget}})")
+        options.update(value)
+    policy = RetryPolicy(**options)
+    if policy.attempts < 1 or policy.base_delay < 0 or policy.max_delay < 0 or (policy.budget is not None and policy.budget < 0):
+        raise ValueError(f"Invalid retry setting {options!r} (attempts must be at least 1, delays and budget not negative)")
+    return policy
+
+
+class RetryBudget:
+    """The retries left to one run of a task, shared by its fetch and its writers."""
+    def __init__(self, policy: Optional[RetryPolicy]):
+        self.policy = policy
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Use up one retry; False if retries are off or the budget is spent."""
+        if self.policy is None:
+            return False
+        with self._lock:
+            if self.policy.budget is not None and self.used >= self.policy.budget:
+                return False
+            self.used += 1
+            return True
+
+    def _should_retry(self, error: Exception, attempt: int, what: str) -> Optional[float]:
+        """Seconds to wait before retrying after `error`, or None to give up."""
+        if self.policy is None or attempt + 1 >= self.policy.attempts or not is_transient(error):
+            return None
+        if is_rate_limited(error):
+            # Still rate limited after the call's own Retry-After retries; retrying the operation won't help.
+            return None
+        if not self.take():
+            logging.getLogger("pipeline").warning(f"{what}: retry budget of {self.policy.budget} used up")
+            return None
+        delay = self.policy.delay(attempt, error)
+        logging.getLogger("pipeline").warning(
+            f"{what} failed with a transient error, retry {attempt + 1} of {self.policy.attempts - 1} in {delay:.1f}s: {error}"
+        )
+        return delay
+
+    def call(self, fn: Callable[[], Any], what: str) -> Any:
+        """Call `fn`, retrying transient errors with backoff while attempts and budget last."""
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._should_retry(e, attempt, what)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, fn: Callable[[], Awaitable], what: str) -> Any:
+        """call() for a coroutine function; waits without blocking the event loop."""
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._should_retry(e, attempt, what)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
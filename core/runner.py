@@ -0,0 +1,798 @@
+# core/runner.py
+
+import asyncio
+import inspect
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from contextlib import contextmanager, ExitStack
+from multiprocessing.util import Finalize
+from dataclasses import dataclass, field
+from inspect import signature
+from typing import Any, Dict, List, Optional
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+from core.interfaces import Fetcher, Writer, AsyncFetcher, AsyncWriter
+from core.data_wrapper import DataWrapper, StreamingDataWrapper, as_data_wrapper
+from core.singleflight import SingleFlight, fetch_key, duplicate_fetch_keys
+from core.instance_pool import InstancePool, instance_key
+from core.registry import registry
+from core.pipelining import StreamPump, DEFAULT_STREAM_QUEUE_DEPTH
+from core.transforms import apply_transforms
+from core.spill import MemoryBudget, MemoryUsage, SpilledDataWrapper, format_size
+from core.result_cache import ResultCache
+from core.checkpoints import CheckpointStore
+from core.journal import WriteJournal, journal_options
+from core.ratelimit import RateLimits, configure_rate_limits, rate_limits as current_rate_limits
+from core.retry import RetryBudget, retry_policy
+from core.transport import configure_transport, current_transport_options
+from core.dag import task_id, task_dependencies, has_dependencies, build_waves, consumer_counts
+
+RUN_MODES = ("serial", "parallel", "async")
+BACKENDS = ("thread", "process")
+
+
+
+class RunContext:
+    """
+    State shared by all tasks of one run.
+
+    Attributes:
+        flight (SingleFlight, optional): Shares identical fetches between tasks.
+        instances (InstancePool, optional): Reuses initialized fetchers/writers between tasks.
+        memory (MemoryBudget): Memory budget for fetched payloads and the store they spill to.
+        cache (ResultCache, optional): Fetch results kept between runs.
+        checkpoints (CheckpointStore): Watermarks of incremental fetches.
+        journal (WriteJournal): Per-record progress of journaled writers.
+        rate_limits (RateLimits): Token buckets throttling connector calls (see core.ratelimit).
+    """
+    def __init__(self, flight: SingleFlight = None, instances: InstancePool = None, memory: MemoryBudget = None,
+                 cache: ResultCache = None, checkpoints: CheckpointStore = None, journal: WriteJournal = None,
+                 rate_limits: RateLimits = None):
+        self.flight = flight
+        self.instances = instances
+        self.memory = memory or MemoryBudget()
+        self.cache = cache
+        self.checkpoints = checkpoints or CheckpointStore()
+        self.journal = journal or WriteJournal()
+        self.rate_limits = rate_limits or current_rate_limits()
+
+    def worker_args(self, workers: int = 1):
+        """Picklable arguments to rebuild an equivalent context in each of `workers` worker processes."""
+        return (self.flight.keys if self.flight else None, self.instances is not None, self.memory.worker_args(),
+                self.cache.worker_args() if self.cache else None, self.checkpoints.worker_args(),
+                self.journal.worker_args(), self.rate_limits.worker_args(workers), current_transport_options())
+
+    def close(self):
+        if self.instances is not None:
+            self.instances.close()
+        self.memory.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+# Set in process-pool workers, which can't share the parent's RunContext.
+_worker_context: Optional[RunContext] = None
+
+
+def _init_worker(dedupe_keys, reuse_clients, memory_args, cache_args, checkpoint_args, journal_args, rate_args,
+                 transport_args):
+    global _worker_context
+    # Connectors look their buckets up process-wide; each worker gets its share of every rate.
+    configure_rate_limits(*rate_args)
+    configure_transport(transport_args)
+    _worker_context = RunContext(
+        SingleFlight(dedupe_keys) if dedupe_keys else None,
+        InstancePool() if reuse_clients else None,
+        MemoryBudget(*memory_args),
+        ResultCache(*cache_args) if cache_args else None,
+        CheckpointStore(*checkpoint_args),
+        WriteJournal(*journal_args),
+        current_rate_limits(),
+    )
+    # Pool workers skip atexit handlers; Finalize runs when the worker shuts down.
+    Finalize(_worker_context, _worker_context.close, exitpriority=10)
+
+
+def load_class(full_class_string):
+    """Dynamically load a class from a string (imported once per process, see core.registry)"""
+    return registry().load_class(full_class_string)
+
+
+@dataclass
+class WriterResult:
+    """Outcome of one writer within a task."""
+    writer: str
+    operation: str
+    status: str
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class TaskResult:
+    """Outcome of a single pipeline task, as reported in the run summary."""
+    name: str
+    status: str
+    duration: float = 0.0
+    error: Optional[str] = None
+    writers: List[WriterResult] = field(default_factory=list)
+    output: Optional[DataWrapper] = field(default=None, repr=False)
+    fetch_shared: bool = False
+    memory: Optional[MemoryUsage] = None
+
+
+class PipelineConfigError(Exception):
+    """Raised when a task refers to a plugin or operation that can't be used."""
+    pass
+
+
+def build_plugin(cfg: Dict[str, Any], interface: type):
+    """
+    Instantiate the plugin described by a fetcher/writer config entry.
+
+    Raises:
+        PipelineConfigError: If the class does not implement `interface`.
+    """
+    plugin_class = load_class(cfg["class"])
+    plugin = plugin_class(**cfg.get("params", {}))
+    if not isinstance(plugin, interface):
+        raise PipelineConfigError(f"{plugin.__class__.__name__} does not implement {interface.__name__} Interface")
+    return plugin
+
+
+def resolve_operation(plugin, operation: str):
+    """
+    Look up an operation by name, preferring the plugin's get_operations() map.
+
+    Raises:
+        PipelineConfigError: If no callable of that name exists.
+    """
+    method = plugin.get_operations().get(operation, getattr(plugin, operation, None))
+    if not callable(method):
+        kind = "Fetcher" if isinstance(plugin, Fetcher) else "Writer"
+        raise PipelineConfigError(f"{kind} operation '{operation}' not found.")
+    return method
+
+
+def resolve_step(plugin, cfg: Dict[str, Any], default_operation: str):
+    """
+    Resolve the operation of a fetcher/writer config entry on `plugin`.
+
+    Uses the `_step` precompiled by core.plan when present, otherwise looks the
+    operation up by name (resolve_operation).
+
+    Returns:
+        tuple: (method, arg_count) where arg_count is None unless precompiled.
+    """
+    step = cfg.get("_step")
+    if step is not None and step.method is not None:
+        return getattr(plugin, step.method), step.arg_count
+    return resolve_operation(plugin, cfg.get("operation", default_operation)), None
+
+
+def call_writer(write_method, data: DataWrapper, params: Dict[str, Any], param_count: int = None):
+    """Invoke a write operation, passing only the arguments its signature accepts."""
+    if param_count is None:
+        param_count = len(signature(write_method).parameters)
+    if param_count == 0:
+        return write_method()
+    elif param_count == 1:
+        return write_method(data)
+    return write_method(data, **params)
+
+
+def _attach_limiter(plugin, settings):
+    """Give an async plugin run from sync code its own per-service limiter."""
+    if isinstance(plugin, (AsyncFetcher, AsyncWriter)):
+        from core.async_runner import ServiceLimiter, DEFAULT_SERVICE_CONCURRENCY
+        plugin.limiter = ServiceLimiter(
+            settings.get("async_concurrency", DEFAULT_SERVICE_CONCURRENCY),
+            settings.get("service_concurrency"),
+        )
+    return plugin
+
+
+def _await_if_needed(value):
+    """Run a coroutine returned by an async plugin to completion from sync code."""
+    # inspect, not asyncio.iscoroutine: before Python 3.12 the latter also accepts plain generators.
+    if inspect.iscoroutine(value):
+        return asyncio.run(value)
+    return value
+
+
+def finish_task(task_name: str, start: float, writer_results: List[WriterResult]) -> TaskResult:
+    """Fold the writer results of a task into its TaskResult."""
+    logger = logging.getLogger("pipeline")
+    duration = time.perf_counter() - start
+    failed = [w for w in writer_results if w.status != "ok"]
+    if failed:
+        return TaskResult(task_name, "failed", duration, f"{len(failed)} of {len(writer_results)} writer(s) failed", writer_results)
+    logger.info(f"Pipeline '{task_name}' completed.")
+    return TaskResult(task_name, "ok", duration, writers=writer_results)
+
+
+def fail_task(task_name: str, start: float, error: Exception) -> TaskResult:
+    """Report a task that failed before or during its fetch."""
+    logger = logging.getLogger("pipeline")
+    if isinstance(error, PipelineConfigError):
+        logger.error(str(error))
+    else:
+        logger.error(f"Pipeline '{task_name}' failed: {error}", exc_info=error)
+    return TaskResult(task_name, "failed", time.perf_counter() - start, str(error))
+
+
+def combine_inputs(task: Dict[str, Any], inputs: Dict[str, DataWrapper]) -> DataWrapper:
+    """
+    Build the data of a task that reads upstream outputs instead of fetching.
+
+    A single input is passed through as-is; several are combined into one
+    wrapper whose data maps each input id to that task's data.
+    """
+    input_ids = list(dict.fromkeys(task.get("inputs", [])))
+    if len(input_ids) == 1:
+        return inputs[input_ids[0]]
+    return DataWrapper(
+        data={tid: inputs[tid].data for tid in input_ids},
+        metadata={"inputs": {tid: inputs[tid].metadata for tid in input_ids}},
+    )
+
+
+def run_task(task: Dict[str, Any], settings: Dict[str, Any] = None, inputs: Dict[str, DataWrapper] = None,
+             keep_output: bool = False, context: RunContext = None) -> TaskResult:
+    """
+    Run one pipeline task: fetch once, then hand the data to every writer.
+
+    Any exception raised by the task is caught and reported in the returned
+    TaskResult, so one failing task never takes down the rest of the run.
+
+    Args:
+        task (dict): A single entry of the `pipeline` list in config.yaml.
+        settings (dict, optional): The `settings` block of the config.
+        inputs (dict, optional): Upstream outputs by task id, for tasks with `inputs`.
+        keep_output (bool): Return the task's data in TaskResult.output for downstream tasks.
+        context (RunContext, optional): Run-wide state shared with the other tasks.
+
+    Returns:
+        TaskResult: Status and timing of the task.
+    """
+    task_name = task.get("name", "Unnamed Pipeline")
+    start = time.perf_counter()
+    try:
+        data, shared, writer_results, memory = _run_task(task, settings or {}, inputs,
+                                                         context or _worker_context or RunContext(), keep_output)
+    except Exception as e:
+        return fail_task(task_name, start, e)
+    result = finish_task(task_name, start, writer_results)
+    result.fetch_shared = shared
+    result.memory = memory
+    if keep_output and result.status == "ok":
+        result.output = data
+    return result
+
+
+def _run_task(task, settings, inputs, context, keep_output=False):
+    """Fetch the task's data and run its writers; returns the data, whether it was shared, the WriterResults and the MemoryUsage."""
+    logger = logging.getLogger("pipeline")
+    task_name = task.get("name", "Unnamed Pipeline")
+    logger.info(f"Starting pipeline: {task_name}")
+
+    shared = admitted = False
+    usage = context.memory.usage(task)
+    budget = RetryBudget(retry_policy(task, settings))
+    checkpoint = None if task.get("inputs") else context.checkpoints.open(task)
+    if checkpoint is not None:
+        logger.info(f"Pipeline '{task_name}' resumes from watermark {checkpoint.previous!r}")
+        task = checkpoint.bind(task)
+    try:
+        if task.get("inputs"):
+            data = combine_inputs(task, inputs)
+        elif _dedupes(task, context.flight):
+            # Shared results are frozen once, since other tasks' writers will read them too.
+            def fetch_once():
+                return context.memory.admit(_fetch(task, settings, context, budget), usage).materialize().read_only()
+            data, shared = context.flight.do(fetch_key(task["fetcher"]), fetch_once)
+            admitted = True
+            if shared:
+                logger.info(f"Pipeline '{task_name}' reused an identical fetch from this run")
+        else:
+            data = _fetch(task, settings, context, budget)
+        # A stream's watermark is only final once the writers have read it all.
+        fetched_metadata = data.metadata
+        if task.get("transforms") or not admitted:
+            data = context.memory.admit(apply_transforms(task, data), usage)
+        if keep_output:
+            # Downstream tasks read this output after our writers are done with it.
+            data = data.materialize()
+        try:
+            writer_results = _run_writers(task, data, settings, context, budget)
+        finally:
+            data.close()
+        if checkpoint is not None and all(w.status == "ok" for w in writer_results):
+            checkpoint.commit(fetched_metadata)
+        return data, shared, writer_results, usage
+    finally:
+        context.memory.release(usage)
+
+
+def _dedupes(task, flight) -> bool:
+    """Whether this task's fetch should go through the run's SingleFlight."""
+    fetcher_cfg = task.get("fetcher", {})
+    return flight is not None and fetcher_cfg.get("dedupe", True) and flight.tracks(fetch_key(fetcher_cfg))
+
+
+@contextmanager
+def plugin_lease(cfg: Dict[str, Any], interface: type, settings: Dict[str, Any], context: RunContext):
+    """
+    Yield an initialized plugin for a fetcher/writer config.
+
+    Sync plugins come from the run's InstancePool when there is one, so each
+    (class, params) is built and initialized once per run. Async plugins and
+    configs with `reuse: false` get a fresh instance that is closed afterwards.
+    """
+    def create():
+        plugin = _attach_limiter(build_plugin(cfg, interface), settings)
+        _await_if_needed(plugin.initialize())
+        return plugin
+
+    pooled = (context.instances is not None and cfg.get("reuse", True)
+              and not issubclass(load_class(cfg["class"]), (AsyncFetcher, AsyncWriter)))
+    if pooled:
+        with context.instances.lease(instance_key(cfg), create) as plugin:
+            yield plugin
+        return
+
+    plugin = create()
+    try:
+        yield plugin
+    finally:
+        plugin.close()
+
+
+def cached_result(fetcher_cfg: Dict[str, Any], context: RunContext):
+    """
+    Look a fetch up in the run's ResultCache.
+
+    Returns:
+        tuple: (policy, entry); policy is None when the fetch isn't cached and
+        entry is None when there is nothing stored for it yet.
+    """
+    if context.cache is None:
+        return None, None
+    policy = context.cache.policy(fetcher_cfg)
+    if policy is None:
+        return None, None
+    return policy, context.cache.get(fetch_key(fetcher_cfg))
+
+
+def reuse_cached(fetcher_cfg: Dict[str, Any], context: RunContext, entry, validator=None) -> DataWrapper:
+    """Hand out a cached result; a matching `validator` means an expired entry was confirmed current."""
+    if validator is not None:
+        context.cache.touch(fetch_key(fetcher_cfg))
+        context.cache.record("revalidated")
+        how = "still current"
+    else:
+        context.cache.record("hits")
+        how = f"{time.time() - entry.stored_at:.0f}s old"
+    logging.getLogger("pipeline").info(
+        f"Using cached result of {fetcher_cfg.get('operation', 'fetch_data')} ({how})"
+    )
+    return entry.data
+
+
+def store_result(fetcher_cfg: Dict[str, Any], context: RunContext, data: DataWrapper, validator=None):
+    context.cache.record("misses")
+    context.cache.put(fetch_key(fetcher_cfg), data, validator)
+
+
+def cache_validator(fetcher: Fetcher, operation: str, params: Dict[str, Any]):
+    """The fetcher's freshness token for an operation, or None if it has none or can't get it."""
+    try:
+        validator = _await_if_needed(fetcher.cache_validator(operation, params))
+    except Exception as e:
+        logging.getLogger("pipeline").warning(f"Could not validate cached {operation}, fetching it again: {e}")
+        return None
+    return None if validator is None else str(validator)
+
+
+def journaled_operation(writer_cfg: Dict[str, Any]) -> bool:
+    """Whether a writer's operation writes record by record, so a write journal can resume it (see Writer.journaled_operations)."""
+    operation = writer_cfg.get("operation", "write_data")
+    return operation in getattr(load_class(writer_cfg["class"]), "journaled_operations", ())
+
+
+def retry_budget(budget: Optional[RetryBudget], cfg: Dict[str, Any], data: DataWrapper = None) -> RetryBudget:
+    """
+    The task's retry budget if this fetcher's (or, with `data`, this writer's) operation may be retried.
+
+    Fetches are retried unless the fetcher sets `retry: false`. A writer is
+    only retried when that can't write records twice: it is journaled and its
+    operation is one of the class's `journaled_operations`, or it sets
+    `retry: true`; and its data isn't a stream that was already read.
+    """
+    default = True if data is None else journal_options(cfg) is not None and journaled_operation(cfg)
+    if budget is None or not cfg.get("retry", default) or (data is not None and data.streaming):
+        return RetryBudget(None)
+    return budget
+
+
+def _fetch(task, settings, context, budget=None) -> DataWrapper:
+    logger = logging.getLogger("pipeline")
+    fetcher_cfg = task.get("fetcher", {})
+    fetch_operation = fetcher_cfg.get("operation", "fetch_data")
+    fetch_operation_params = fetcher_cfg.get("operation_params", {})
+
+    policy, entry = cached_result(fetcher_cfg, context)
+    if entry is not None and entry.fresh(policy.ttl):
+        return reuse_cached(fetcher_cfg, context, entry)
+
+    lease = ExitStack()
+    fetcher = lease.enter_context(plugin_lease(fetcher_cfg, Fetcher, settings, context))
+    try:
+        validator = None
+        if policy is not None and policy.validate:
+            validator = cache_validator(fetcher, fetch_operation, fetch_operation_params)
+        if entry is not None and validator is not None and validator == entry.validator:
+            lease.close()
+            return reuse_cached(fetcher_cfg, context, entry, validator)
+        fetch_method, _ = resolve_step(fetcher, fetcher_cfg, "fetch_data")
+        logger.info(f"Fetching data using operation: {fetch_operation} with params: {fetch_operation_params}")
+        data = as_data_wrapper(retry_budget(budget, fetcher_cfg).call(
+            lambda: _await_if_needed(fetch_method(**fetch_operation_params)), f"Fetch {fetch_operation}"
+        ))
+    except BaseException:
+        lease.close()
+        raise
+
+    if not data.streaming:
+        lease.close()
+        payload = data.data
+        logger.debug(f"Fetched {type(payload).__name__}"
+                      + (f" with {len(payload)} record(s)" if isinstance(payload, (list, tuple)) else ""))
+        if policy is not None:
+            store_result(fetcher_cfg, context, data, validator)
+        return data
+    # The fetcher keeps producing while the writers read, so it stays leased until the stream is closed.
+    logger.debug(f"Fetch {fetch_operation} returned a stream")
+    return StreamingDataWrapper(data.batches(), data.metadata, on_close=lease.close)
+
+
+def _streaming_writer(cfg: Dict[str, Any]) -> bool:
+    try:
+        return getattr(load_class(cfg["class"]), "streaming", False)
+    except Exception:
+        return False  # reported when the writer itself runs
+
+
+def writer_inputs(writer_cfgs: List[Dict[str, Any]], data: DataWrapper, queue_depth: int = 0) -> List[DataWrapper]:
+    """
+    What each writer of a task is handed.
+
+    Several writers share one fetched payload, so they get an immutable view
+    of it. A stream is passed on as batches when every writer declares
+    `streaming = True` (one branch per writer); otherwise it is materialized
+    once and every writer gets the full records (a spilled payload is
+    read back from disk by each writer). With `queue_depth` > 0 the
+    stream is fetched ahead on a producer thread (see core.pipelining).
+    """
+    if data.streaming and writer_cfgs and all(_streaming_writer(cfg) for cfg in writer_cfgs):
+        if queue_depth > 0 and not isinstance(data, SpilledDataWrapper):
+            return StreamPump(data, len(writer_cfgs), queue_depth).streams()
+        return [data] if len(writer_cfgs) == 1 else data.split(len(writer_cfgs))
+    if isinstance(data, SpilledDataWrapper):
+        # Spilled records stay on disk: each writer reads them back itself, as batches if it
+        # streams and through records() otherwise; only reading `data` loads them whole.
+        return [data.read_only() if data.streaming and _streaming_writer(cfg) else data.materialize()
+                for cfg in writer_cfgs]
+    data = data.materialize()
+    if len(writer_cfgs) > 1:
+        data = data.read_only()
+    return [data] * len(writer_cfgs)
+
+
+def stream_queue_depth(task: Dict[str, Any], settings: Dict[str, Any]) -> int:
+    """Batches fetched ahead of each streaming writer; 0 fetches a batch only when a writer asks for it."""
+    return task.get("stream_queue_depth", settings.get("stream_queue_depth", DEFAULT_STREAM_QUEUE_DEPTH))
+
+
+def journal_writers(task, writer_cfgs, writer_data, context):
+    """
+    Route the records of writers with `journal:` through the run's WriteJournal.
+
+    Returns:
+        tuple: (scopes, writer_data); a scope is None for writers that aren't journaled.
+    """
+    scopes = [context.journal.scope(task, cfg) for cfg in writer_cfgs]
+    return scopes, [item if scope is None else scope.wrap(item) for scope, item in zip(scopes, writer_data)]
+
+
+def finish_journals(scopes, results: List[WriterResult]):
+    """Drop the journal of every writer that succeeded; the others resume from it next run."""
+    for scope, result in zip(scopes, results):
+        if scope is not None and result.status == "ok":
+            scope.finish()
+
+
+def _run_writers(task, data, settings, context, budget=None) -> List[WriterResult]:
+    writer_cfgs = task.get("writers", [])
+    writer_data = writer_inputs(writer_cfgs, data, stream_queue_depth(task, settings))
+    try:
+        scopes, writer_data = journal_writers(task, writer_cfgs, writer_data, context)
+        results = _dispatch_writers(task, writer_cfgs, writer_data, settings, context, budget)
+        finish_journals(scopes, results)
+        return results
+    finally:
+        for item in writer_data:
+            item.close()
+
+
+def _dispatch_writers(task, writer_cfgs, writer_data, settings, context, budget=None) -> List[WriterResult]:
+    concurrent = task.get("concurrent_writers", settings.get("concurrent_writers", True))
+    default_timeout = settings.get("writer_timeout")
+    timed = any(cfg.get("timeout", default_timeout) is not None for cfg in writer_cfgs)
+
+    if not timed and (not concurrent or len(writer_cfgs) <= 1):
+        return [_run_writer_closing(cfg, data, settings, context, budget) for cfg, data in zip(writer_cfgs, writer_data)]
+
+    # Writers run on pool threads even one at a time, so that a timeout can be enforced.
+    pool = ThreadPoolExecutor(max_workers=len(writer_cfgs), thread_name_prefix="writer")
+    try:
+        if not concurrent:
+            results = []
+            for cfg, data in zip(writer_cfgs, writer_data):
+                timeout = cfg.get("timeout", default_timeout)
+                future = pool.submit(_run_writer_closing, cfg, data, settings, context, budget)
+                try:
+                    results.append(future.result(timeout=timeout))
+                except FuturesTimeout:
+                    # The next writer starts anyway; this one is left to finish in the background.
+                    results.append(writer_timed_out(cfg, timeout))
+            return results
+
+        submitted = time.monotonic()
+        futures = [
+            pool.submit(_run_writer_closing, cfg, data, settings, context, budget) for cfg, data in zip(writer_cfgs, writer_data)
+        ]
+        results = []
+        for cfg, future in zip(writer_cfgs, futures):
+            timeout = cfg.get("timeout", default_timeout)
+            # Timeouts count from dispatch, not from when we get round to waiting on this writer.
+            remaining = None if timeout is None else max(0.0, submitted + timeout - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FuturesTimeout:
+                results.append(writer_timed_out(cfg, timeout))
+        return results
+    finally:
+        # Don't block the task on writers that overran their timeout.
+        pool.shutdown(wait=False)
+
+
+def writer_timed_out(writer_cfg: Dict[str, Any], timeout: float) -> WriterResult:
+    """Report a writer that did not finish within its timeout."""
+    message = f"timed out after {timeout}s"
+    logging.getLogger("pipeline").error(f"Writer {writer_cfg['class']} {message}")
+    return WriterResult(writer_cfg["class"], writer_cfg.get("operation", "write_data"), "timeout", timeout, message)
+
+
+def writer_failed(writer_cfg: Dict[str, Any], start: float, error: Exception) -> WriterResult:
+    """Report a writer that raised instead of completing."""
+    logger = logging.getLogger("pipeline")
+    class_path = writer_cfg["class"]
+    write_operation = writer_cfg.get("operation", "write_data")
+    if isinstance(error, PipelineConfigError):
+        logger.error(str(error))
+    else:
+        logger.error(f"Writer {class_path}.{write_operation} failed: {error}", exc_info=error)
+    return WriterResult(class_path, write_operation, "failed", time.perf_counter() - start, str(error))
+
+
+def _run_writer_closing(writer_cfg, data, settings, context, budget=None) -> WriterResult:
+    # Closing as soon as the writer is done lets a stream's producer stop feeding it.
+    try:
+        return _run_writer(writer_cfg, data, settings, context, budget)
+    finally:
+        data.close()
+
+
+def _run_writer(writer_cfg, data, settings, context, budget=None) -> WriterResult:
+    """Instantiate, initialize and invoke a single writer, reporting instead of raising."""
+    logger = logging.getLogger("pipeline")
+    write_operation = writer_cfg.get("operation", "write_data")
+    write_operation_params = writer_cfg.get("operation_params", {})
+    start = time.perf_counter()
+
+    try:
+        with plugin_lease(writer_cfg, Writer, settings, context) as writer:
+            write_method, param_count = resolve_step(writer, writer_cfg, "write_data")
+            logger.info(f"Writing data using operation: {write_operation} with params: {write_operation_params}")
+            retry_budget(budget, writer_cfg, data).call(
+                lambda: _await_if_needed(call_writer(write_method, data, write_operation_params, param_count)),
+                f"Writer {writer_cfg['class']}.{write_operation}",
+            )
+    except Exception as e:
+        return writer_failed(writer_cfg, start, e)
+
+    return WriterResult(writer_cfg["class"], write_operation, "ok", time.perf_counter() - start)
+
+
+def execute_tasks(tasks: List[Dict[str, Any]], run_mode: str = "serial", backend: str = "thread",
+                  max_workers: int = None, settings: Dict[str, Any] = None) -> List[TaskResult]:
+    """
+    Run a list of tasks, serially, on a worker pool or on an event loop.
+
+    Tasks without `depends_on`/`inputs` are independent and all run at once.
+    Otherwise the tasks form a DAG and run in topological waves (see core.dag).
+
+    Args:
+        tasks (list): Enabled task configs.
+        run_mode (str): "serial", "parallel" or "async".
+        backend (str): "thread" or "process" (parallel mode only).
+        max_workers (int, optional): Pool size. Defaults to one worker per task.
+        settings (dict, optional): The `settings` block of the config, passed to each task.
+
+    Returns:
+        list[TaskResult]: One result per task, in config order.
+    """
+    if run_mode not in RUN_MODES:
+        raise ValueError(f"Unknown run_mode '{run_mode}', expected one of {RUN_MODES}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+    settings = settings or {}
+    limits = configure_rate_limits(settings.get("rate_limits"), concurrency=settings.get("adaptive_concurrency"))
+    configure_transport(settings.get("google_http"))
+    rate_usage, concurrency_usage = limits.summary(), limits.concurrency_summary()
+    context = RunContext(instances=InstancePool() if settings.get("reuse_clients", True) else None,
+                         memory=MemoryBudget.from_settings(settings), cache=ResultCache.from_settings(settings),
+                         checkpoints=CheckpointStore.from_settings(settings), journal=WriteJournal.from_settings(settings))
+    if settings.get("dedupe_fetches", True):
+        dedupe_keys = duplicate_fetch_keys(tasks)
+        context.flight = SingleFlight(dedupe_keys) if dedupe_keys else None
+
+    try:
+        if has_dependencies(tasks):
+            return _execute_dag(tasks, run_mode, backend, max_workers, settings, context)
+        return _execute_wave(tasks, [None] * len(tasks), [False] * len(tasks), run_mode, backend, max_workers, settings, context)
+    finally:
+        if context.instances is not None and context.instances.leases:
+            logging.getLogger("pipeline").info(
+                f"Client pool: {context.instances.created} client(s) initialized for {context.instances.leases} use(s)."
+            )
+        cache = context.cache
+        if cache is not None and cache.hits + cache.revalidated + cache.misses:
+            logging.getLogger("pipeline").info(
+                f"Result cache: {cache.hits} hit(s), {cache.revalidated} revalidated, {cache.misses} fetched."
+            )
+        for service, (calls, waited, limited) in sorted(context.rate_limits.summary(rate_usage).items()):
+            logging.getLogger("pipeline").info(
+                f"Rate limits: {service}: {calls} call(s), {waited:.1f}s throttled, {limited} rate-limited response(s)."
+            )
+        for service, (lowest, highest, peak, decreases, _) in sorted(
+                context.rate_limits.concurrency_summary(concurrency_usage).items()):
+            logging.getLogger("pipeline").info(
+                f"Adaptive concurrency: {service}: limit {lowest if lowest == highest else f'{lowest}-{highest}'} "
+                f"(peak {peak}, {decreases} decrease(s))."
+            )
+        context.close()
+
+
+def _execute_wave(tasks, inputs, keep_output, run_mode, backend, max_workers, settings, context) -> List[TaskResult]:
+    """Run tasks that don't depend on each other; results come back in task order."""
+    if run_mode == "async":
+        from core.async_runner import run_tasks_async
+        return asyncio.run(run_tasks_async(tasks, settings, max_workers=max_workers, inputs=inputs,
+                                           keep_output=keep_output, context=context))
+
+    if run_mode == "serial" or len(tasks) <= 1:
+        return [run_task(task, settings, i, k, context) for task, i, k in zip(tasks, inputs, keep_output)]
+
+    workers = max_workers or len(tasks)
+    if backend == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers)
+        submit_context = context
+    else:
+        # Worker processes can't share our RunContext; each one builds its own.
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=context.worker_args(workers))
+        submit_context = None
+    with pool:
+        futures = [pool.submit(run_task, task, settings, i, k, submit_context) for task, i, k in zip(tasks, inputs, keep_output)]
+        results = []
+        for task, future in zip(tasks, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # Only reachable when the worker itself dies (e.g. a task that can't be pickled).
+                results.append(TaskResult(task.get("name", "Unnamed Pipeline"), "failed", error=str(e)))
+        return results
+
+
+def _execute_dag(tasks, run_mode, backend, max_workers, settings, context) -> List[TaskResult]:
+    """
+    Run dependent tasks wave by wave, passing outputs along `inputs` edges.
+
+    A task whose upstream failed is skipped. Each output is dropped as soon
+    as its last consumer has run, so intermediates don't pile up in memory.
+    """
+    logger = logging.getLogger("pipeline")
+    waves = build_waves(tasks)
+    pending_consumers = consumer_counts(tasks)
+    outputs: Dict[str, DataWrapper] = {}
+    statuses: Dict[str, str] = {}
+    results: Dict[int, TaskResult] = {}
+
+    def release(task):
+        for dep in dict.fromkeys(task.get("inputs", [])):
+            pending_consumers[dep] -= 1
+            if pending_consumers[dep] == 0 and outputs.pop(dep, None) is not None:
+                logger.info(f"Released intermediate output of '{dep}'")
+
+    logger.info(f"Running {len(tasks)} task(s) as a DAG in {len(waves)} wave(s)")
+    for wave in waves:
+        runnable = []
+        for task in wave:
+            blocked = [dep for dep in task_dependencies(task) if statuses.get(dep) != "ok"]
+            if blocked:
+                message = f"skipped: upstream task(s) {', '.join(blocked)} did not succeed"
+                logger.error(f"Pipeline '{task.get('name', 'Unnamed Pipeline')}' {message}")
+                results[id(task)] = TaskResult(task.get("name", "Unnamed Pipeline"), "skipped", error=message)
+                statuses[task_id(task)] = "skipped"
+                release(task)
+            else:
+                runnable.append(task)
+
+        wave_inputs = [{dep: outputs[dep] for dep in task.get("inputs", [])} for task in runnable]
+        keep_output = [pending_consumers.get(task_id(task), 0) > 0 for task in runnable]
+        wave_results = _execute_wave(runnable, wave_inputs, keep_output, run_mode, backend, max_workers, settings, context)
+
+        for task, result in zip(runnable, wave_results):
+            tid = task_id(task)
+            statuses[tid] = result.status
+            if result.output is not None:
+                # Consumers may run concurrently, so they share one read-only copy.
+                outputs[tid] = result.output.read_only() if pending_consumers[tid] > 1 else result.output
+                result.output = None
+            results[id(task)] = result
+            release(task)
+
+    return [results[id(task)] for task in tasks]
+
+
+def log_summary(results: List[TaskResult]) -> None:
+    """Log one line per task plus the overall totals."""
+    logger = logging.getLogger("pipeline")
+    logger.info("Run summary:")
+    for result in results:
+        line = f"  [{result.status.upper()}] {result.name} ({result.duration:.2f}s)"
+        if result.memory is not None and result.memory.peak:
+            line += f" [memory ~{format_size(result.memory.peak)}"
+            if result.memory.spilled:
+                line += f", spilled {format_size(result.memory.spilled)}"
+            line += "]"
+        if result.error:
+            line += f" - {result.error}"
+        logger.info(line)
+        for writer in result.writers:
+            line = f"      {writer.status}: {writer.writer}.{writer.operation} ({writer.duration:.2f}s)"
+            if writer.error:
+                line += f" - {writer.error}"
+            logger.info(line)
+
+    failed = sum(1 for r in results if r.status != "ok")
+    logger.info(f"{len(results)} task(s) run, {len(results) - failed} succeeded, {failed} failed.")
+
+    shared = sum(1 for r in results if r.fetch_shared)
+    if shared:
+        logger.info(f"Fetch deduplication: {shared} API call(s) saved by sharing identical fetches.")
+
+    spilled = sum(r.memory.spilled for r in results if r.memory is not None)
+    if spilled:
+        logger.info(f"Memory budget: {format_size(spilled)} spilled to disk.")
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            peak *= 1024  # kilobytes on Linux, bytes on macOS
+        logger.info(f"Peak process memory: {format_size(peak)}.")
@@ -0,0 +1,122 @@
+# core/singleflight.py
+
+import asyncio
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable
+
+
+def fetch_key(fetcher_cfg: Dict[str, Any]) -> str:
+    """
+    Canonical key of a fetch: fetcher class, constructor params, operation and operation params.
+
+    Two fetcher configs with the same key would make the same API call.
+    """
+    return json.dumps({
+        "class": fetcher_cfg.get("class"),
+        "params": fetcher_cfg.get("params", {}),
+        "operation": fetcher_cfg.get("operation", "fetch_data"),
+        "operation_params": fetcher_cfg.get("operation_params", {}),
+    }, sort_keys=True, default=str)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished = False
+
+
+class SingleFlight:
+    """
+    Collapse identical fetches within one run into a single call.
+
+    The first caller for a key runs the fetch; concurrent and later callers
+    with the same key wait for it and share its result. Failed fetches are
+    not kept, so a later caller tries again; callers that were waiting on one
+    get its error (or a RuntimeError if it was interrupted).
+
+    Only keys listed in `keys` are tracked (those that occur more than once
+    in the run); every other fetch goes straight through.
+    """
+    def __init__(self, keys: Iterable[str] = None):
+        self.keys = set(keys) if keys is not None else None
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[str, asyncio.Future] = {}
+
+    def tracks(self, key: str) -> bool:
+        return self.keys is None or key in self.keys
+
+    def do(self, key: str, fn: Callable[[], Any]):
+        """
+        Run `fn` once per key.
+
+        Returns:
+            tuple: (result, shared) where `shared` is True if the result came from another caller.
+        """
+        if not self.tracks(key):
+            return fn(), False
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if leader:
+            try:
+                call.result = fn()
+                call.finished = True
+            except Exception as e:
+                call.error = e
+            finally:
+                # Also on KeyboardInterrupt & co., so the key isn't left waiting forever.
+                if not call.finished:
+                    with self._lock:
+                        del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        if not call.finished:
+            raise RuntimeError("The shared fetch was interrupted before it finished")
+        return call.result, not leader
+
+    async def do_async(self, key: str, fn: Callable[[], Any]):
+        """Coroutine counterpart of do(); `fn` returns an awaitable."""
+        if not self.tracks(key):
+            return await fn(), False
+
+        future = self._async_calls.get(key)
+        if future is not None:
+            with self._lock:
+                self.shared += 1
+            return await asyncio.shield(future), True
+
+        future = self._async_calls[key] = asyncio.ensure_future(fn())
+        try:
+            return await asyncio.shield(future), False
+        except BaseException:
+            # Failed, or the leader was cancelled: a later caller starts over.
+            if self._async_calls.get(key) is future:
+                del self._async_calls[key]
+            raise
+
+
+def duplicate_fetch_keys(tasks: Iterable[Dict[str, Any]]):
+    """Keys of the fetches that more than one task would make."""
+    seen, duplicates = set(), set()
+    for task in tasks:
+        fetcher_cfg = task.get("fetcher")
+        if not fetcher_cfg or fetcher_cfg.get("dedupe") is False:
+            continue
+        key = fetch_key(fetcher_cfg)
+        (duplicates if key in seen else seen).add(key)
+    return duplicates
@@ -0,0 +1,448 @@
+# core/spill.py
+
+import logging
+import os
+import pickle
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import weakref
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from core.data_wrapper import DataWrapper, StreamingDataWrapper, ReadOnlyDataWrapper
+from core.table import Table
+from core.binary_payload import BinaryPayload
+
+SPILL_BATCH_ROWS = 1000
+BLOB_CHUNK_SIZE = 1024 * 1024
+_FRAME_HEADER = struct.Struct(">I")
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2, "G": 1024 ** 3, "GB": 1024 ** 3}
+_SAMPLE = 20
+
+
+def parse_size(value: Any) -> Optional[int]:
+    """Bytes from a size setting such as 536870912, "512MB" or "1.5GB"; None/0 mean unlimited."""
+    if value in (None, 0, "", "0"):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r"\s*([\d.]+)\s*([A-Za-z]*)\s*", str(value))
+    if not match or match.group(2).upper() not in _SIZE_UNITS:
+        raise ValueError(f"Invalid size '{value}' (use bytes or a number with KB, MB or GB)")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def estimate_size(value: Any, depth: int = 0) -> int:
+    """
+    Approximate memory held by a payload, in bytes.
+
+    Large lists and dicts are sized from a sample of their items, so this
+    stays cheap enough to call on every fetch and every streamed batch.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, BinaryPayload):
+        return value.size if value.in_memory else sys.getsizeof(value)  # file-backed: nothing to spill
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, Table):
+        return sum(
+            column.nbytes if hasattr(column, "nbytes") else
+            column.itemsize * len(column) if hasattr(column, "itemsize") else
+            estimate_size(column, depth + 1)
+            for column in map(value.column, value.columns)
+        )
+    if depth > 3:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(value.items())
+        sample = items[:: max(1, len(items) // _SAMPLE)][:_SAMPLE]
+        per_item = sum(estimate_size(k, depth + 1) + estimate_size(v, depth + 1) for k, v in sample) / max(1, len(sample))
+        return sys.getsizeof(value) + int(per_item * len(items))
+    if isinstance(value, (list, tuple)):
+        sample = value[:: max(1, len(value) // _SAMPLE)][:_SAMPLE]
+        per_item = sum(estimate_size(v, depth + 1) for v in sample) / max(1, len(sample))
+        return sys.getsizeof(value) + int(per_item * len(value))
+    return sys.getsizeof(value)
+
+
+class SpillFile:
+    """A file in the spill store, removed once no wrapper refers to it any more."""
+    def __init__(self, path: str, kind: str, size: int):
+        self.path = path
+        self.kind = kind  # "batches", "blob" or "object"
+        self.size = size
+        self._finalizer = weakref.finalize(self, _remove, path)
+
+    def frames(self) -> Iterator[Any]:
+        with open(self.path, "rb") as f:
+            while True:
+                header = f.read(_FRAME_HEADER.size)
+                if not header:
+                    return
+                (length,) = _FRAME_HEADER.unpack(header)
+                yield pickle.loads(zlib.decompress(f.read(length)))
+
+    def chunks(self, size: int = BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(size)
+                if not chunk:
+                    return
+                yield chunk
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _FrameWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "wb")
+        self.size = 0
+
+    def write(self, obj: Any):
+        frame = zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        self.file.write(_FRAME_HEADER.pack(len(frame)))
+        self.file.write(frame)
+        self.size += _FRAME_HEADER.size + len(frame)
+
+    def close(self):
+        self.file.close()
+
+
+class SpillStore:
+    """
+    Per-run temporary directory holding spilled payloads.
+
+    Created on first use under `spill_dir` (the system temp dir by default)
+    and removed with everything in it when the run ends.
+    """
+    def __init__(self, spill_dir: str = None):
+        self.spill_dir = spill_dir
+        self._path = None
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def new_path(self, suffix: str) -> str:
+        with self._lock:
+            if self._path is None:
+                if self.spill_dir:
+                    os.makedirs(self.spill_dir, exist_ok=True)
+                self._path = tempfile.mkdtemp(prefix="pipeline-spill-", dir=self.spill_dir)
+            self._count += 1
+            return os.path.join(self._path, f"{self._count:05d}{suffix}")
+
+    def write_batches(self, batches: Iterable[Any]) -> SpillFile:
+        """Write record batches (lists or Tables) as compressed pickled frames."""
+        writer = _FrameWriter(self.new_path(".batches"))
+        try:
+            for batch in batches:
+                if isinstance(batch, Table):
+                    for start in range(0, len(batch), SPILL_BATCH_ROWS):
+                        writer.write(batch.take(range(start, min(start + SPILL_BATCH_ROWS, len(batch)))))
+                else:
+                    for start in range(0, len(batch), SPILL_BATCH_ROWS):
+                        writer.write(list(batch[start:start + SPILL_BATCH_ROWS]))
+        finally:
+            writer.close()
+        return SpillFile(writer.path, "batches", writer.size)
+
+    def write_blob(self, data: bytes) -> SpillFile:
+        """Write a binary payload as-is."""
+        path = self.new_path(".blob")
+        with open(path, "wb") as f:
+            f.write(data)
+        return SpillFile(path, "blob", len(data))
+
+    def write_object(self, value: Any) -> SpillFile:
+        """Write any other picklable payload as one compressed frame."""
+        writer = _FrameWriter(self.new_path(".pickle"))
+        try:
+            writer.write(value)
+        finally:
+            writer.close()
+        return SpillFile(writer.path, "object", writer.size)
+
+    def close(self):
+        with self._lock:
+            if self._path is not None:
+                shutil.rmtree(self._path, ignore_errors=True)
+                self._path = None
+
+
+class SpilledDataWrapper(DataWrapper):
+    """
+    A DataWrapper whose payload lives in the spill store instead of memory.
+
+    Record batches are read back one at a time by batches() and records(),
+    which can be iterated any number of times, so writers that loop over
+    records never hold more than one batch. Reading `data` loads the whole
+    payload (for writers that need it at once) and keeps it until close().
+    Binary payloads are kept as a raw file and handed out as bytes.
+    """
+    def __init__(self, spill: SpillFile, metadata: Dict[str, Any] = None, streaming: bool = None):
+        self._spill = spill
+        self._loaded = None
+        self._lock = threading.Lock()
+        self.metadata = metadata if metadata is not None else {}
+        # A materialized view of spilled batches is not a stream, but still reads its records from disk.
+        self.streaming = spill.kind == "batches" if streaming is None else streaming
+
+    @property
+    def spilled_bytes(self) -> int:
+        return self._spill.size
+
+    @property
+    def data(self) -> Any:
+        with self._lock:
+            if self._loaded is None:
+                self._loaded = self._load()
+            return self._loaded
+
+    def _load(self) -> Any:
+        if self._spill.kind == "blob":
+            return b"".join(self._spill.chunks())
+        if self._spill.kind == "object":
+            return next(self._spill.frames())
+        batches = list(self._spill.frames())
+        if batches and all(isinstance(b, Table) for b in batches):
+            return Table.concat(batches)
+        return [record for batch in batches for record in batch]
+
+    def batches(self) -> Iterator:
+        """Read the record batches back from disk (the whole payload as one batch unless spilled as batches)."""
+        if self._spill.kind == "batches":
+            return self._spill.frames()
+        return iter([self.data])
+
+    def records(self) -> Iterator:
+        """The records, read back from disk a batch at a time."""
+        if self._spill.kind != "batches":
+            return super().records()
+        return (record for batch in self._spill.frames()
+                for record in (batch.to_records() if isinstance(batch, Table) else batch))
+
+    def materialize(self) -> DataWrapper:
+        if self._spill.kind == "batches":
+            return SpilledDataWrapper(self._spill, self.metadata, streaming=False)
+        return DataWrapper(self.data, self.metadata)
+
+    def read_only(self) -> DataWrapper:
+        if self._spill.kind == "batches":
+            # Every reader gets its own pass over the file, and its own copy if it loads `data`.
+            return SpilledDataWrapper(self._spill, self.metadata, self.streaming)
+        return ReadOnlyDataWrapper(self.data, self.metadata)
+
+    def split(self, n: int) -> List["SpilledDataWrapper"]:
+        """Independent readers over the same spilled batches."""
+        return [SpilledDataWrapper(self._spill, self.metadata, self.streaming) for _ in range(n)]
+
+    def close(self) -> None:
+        # The spill file stays for other readers (e.g. downstream tasks); only the loaded copy is dropped.
+        with self._lock:
+            self._loaded = None
+
+    def __reduce__(self):
+        # The spill store is local to this process; send the payload itself.
+        return (DataWrapper, (self.data, self.metadata))
+
+    def __repr__(self):
+        return f"<SpilledDataWrapper {self._spill.kind} {format_size(self._spill.size)} metadata={self.metadata}>"
+
+
+@dataclass
+class MemoryUsage:
+    """
+    Payload memory of one task, as reported in the run summary.
+
+    Attributes:
+        budget (int, optional): Bytes the task's payload may hold in memory.
+        peak (int): Estimated bytes held in memory at once (largest batch for streams).
+        spilled (int): Bytes written to the spill store.
+    """
+    budget: Optional[int] = None
+    peak: int = 0
+    spilled: int = 0
+    reserved: int = field(default=0, repr=False)
+
+    def record(self, size: int):
+        self.peak = max(self.peak, size)
+
+
+class MemoryBudget:
+    """
+    Run-wide memory budget for fetched payloads, shared by all tasks.
+
+    A task keeps its payload in memory while it fits both its own budget
+    (`memory_budget` on the task, or `settings.task_memory_budget`) and
+    what is left of the run's (`settings.memory_budget`); otherwise the
+    payload is spilled to the SpillStore and read back as batches.
+    Sizes are estimates (see estimate_size).
+    """
+    def __init__(self, run_budget: Optional[int] = None, task_budget: Optional[int] = None, spill_dir: str = None):
+        self.run_budget = run_budget
+        self.task_budget = task_budget
+        self.store = SpillStore(spill_dir)
+        self.in_use = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "MemoryBudget":
+        return cls(parse_size(settings.get("memory_budget")), parse_size(settings.get("task_memory_budget")),
+                   settings.get("spill_dir"))
+
+    def worker_args(self):
+        return (self.run_budget, self.task_budget, self.store.spill_dir)
+
+    def usage(self, task: Dict[str, Any]) -> MemoryUsage:
+        budget = parse_size(task["memory_budget"]) if "memory_budget" in task else self.task_budget
+        return MemoryUsage(budget=budget)
+
+    def fits(self, size: int, usage: MemoryUsage) -> bool:
+        """Whether `size` more bytes fit the task's budget and what is left of the run's."""
+        if usage.budget is not None and usage.reserved + size > usage.budget:
+            return False
+        return self.run_budget is None or self.in_use + size <= self.run_budget
+
+    def reserve(self, size: int, usage: MemoryUsage) -> bool:
+        """Count `size` bytes against both budgets if they fit; returns whether they did."""
+        with self._lock:
+            if not self.fits(size, usage):
+                return False
+            self.in_use += size
+            usage.reserved += size
+            usage.record(usage.reserved)
+            return True
+
+    def release(self, usage: MemoryUsage):
+        """Give back what a finished task reserved."""
+        with self._lock:
+            self.in_use = max(0, self.in_use - usage.reserved)
+            usage.reserved = 0
+
+    def admit(self, data: DataWrapper, usage: MemoryUsage) -> DataWrapper:
+        """
+        Return `data`, or a spilled copy of it when it does not fit the budget.
+
+        Streams are not held in memory, so they pass through; they are only
+        spilled if something materializes them (see BudgetedStream).
+        Call release(usage) once the task is done with the payload.
+        """
+        if isinstance(data, SpilledDataWrapper):
+            return data
+        if data.streaming:
+            return BudgetedStream(data, self, usage)
+        size = estimate_size(data.data)
+        if usage.budget is None and self.run_budget is None:
+            usage.record(size)
+            return data
+        if self.reserve(size, usage):
+            return data
+        if not isinstance(data.data, (list, tuple, Table)):
+            # Bytes and other objects can only be read back whole, so spilling them would save nothing.
+            logging.getLogger("pipeline").warning(
+                f"A ~{format_size(size)} {type(data.data).__name__} payload is over the memory budget "
+                "but can't be spilled in batches; keeping it in memory"
+            )
+            usage.record(usage.reserved + size)
+            return data
+        return self.spill(data, usage, size)
+
+    def spill(self, data: DataWrapper, usage: MemoryUsage, size: int) -> SpilledDataWrapper:
+        payload = data.data
+        if isinstance(payload, (bytes, bytearray)):
+            spill = self.store.write_blob(payload)
+        elif isinstance(payload, (list, tuple, Table)):
+            spill = self.store.write_batches([payload])
+        else:
+            spill = self.store.write_object(payload)
+        usage.spilled += spill.size
+        logging.getLogger("pipeline").info(
+            f"Spilled a ~{format_size(size)} payload to disk ({format_size(spill.size)} compressed)"
+        )
+        return SpilledDataWrapper(spill, data.metadata)
+
+    def close(self):
+        self.store.close()
+
+
+class BudgetedStream(StreamingDataWrapper):
+    """
+    A stream that spills to disk instead of growing past its budget when materialized.
+
+    Batches read one by one (by streaming writers) pass through untouched.
+    """
+    def __init__(self, stream: DataWrapper, budget: MemoryBudget, usage: MemoryUsage):
+        super().__init__(stream.batches(), stream.metadata, on_close=stream.close)
+        self._budget = budget
+        self._usage = usage
+        self._spilled = None
+
+    def batches(self) -> Iterator:
+        for batch in super().batches():
+            self._usage.record(estimate_size(batch))
+            yield batch
+
+    @property
+    def data(self) -> Any:
+        return self.materialize().data
+
+    @data.setter
+    def data(self, value):
+        self._records = value
+
+    def materialize(self) -> DataWrapper:
+        if self._spilled is not None:
+            return self._spilled
+        if self._records is not None:
+            return DataWrapper(self._records, self.metadata)
+        if self._usage.budget is None and self._budget.run_budget is None:
+            records = super().data  # StreamingDataWrapper.data: collect every batch
+            self._usage.record(estimate_size(records))
+            return DataWrapper(records, self.metadata)
+
+        # Collect in memory while the batches fit, then move them and the rest to disk.
+        held, held_size = [], 0
+        batches = super().batches()
+        for batch in batches:
+            held.append(batch)
+            held_size += estimate_size(batch)
+            self._usage.record(held_size)
+            if not self._budget.fits(held_size, self._usage):
+                spill = self._budget.store.write_batches(_drain(held, batches))
+                self._usage.spilled += spill.size
+                logging.getLogger("pipeline").info(
+                    f"Stream exceeded its memory budget; spilled {format_size(spill.size)} to disk"
+                )
+                self._spilled = SpilledDataWrapper(spill, self.metadata)
+                return self._spilled
+        self._budget.reserve(held_size, self._usage)
+        if held and all(isinstance(b, Table) for b in held):
+            self._records = Table.concat(held)
+        else:
+            self._records = [r for batch in held for r in (batch.to_records() if isinstance(batch, Table) else batch)]
+        return DataWrapper(self._records, self.metadata)
+
+
+def _drain(held: List[Any], rest: Iterator) -> Iterator:
+    held.reverse()
+    while held:
+        yield held.pop()  # let each held batch go as soon as it is on disk
+    yield from rest
@@ -0,0 +1,528 @@
+# core/table.py
+
+import operator
+from array import array
+from itertools import compress, repeat
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # optional: without NumPy, columns are array.array or lists
+    np = None
+
+DTYPES = ("int", "float", "bool", "str", "object")
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+FILTER_OPS = tuple(_COMPARISONS) + ("in", "not in", "contains", "startswith", "is_null", "not_null")
+AGGREGATIONS = ("count", "sum", "mean", "min", "max", "first", "last", "list", "nunique")
+
+
+def infer_dtype(values: Sequence[Any]) -> str:
+    """Schema type of a column of Python values; None is allowed in every type."""
+    types = set(map(type, values))
+    types.discard(type(None))
+    if not types:
+        return "object"
+    if types == {bool}:
+        return "bool"
+    if types == {int}:
+        return "int"
+    if types <= {int, float}:
+        return "float"
+    if types == {str}:
+        return "str"
+    return "object"
+
+
+def _object_array(values):
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _make_column(values: Iterable[Any], dtype: str = None):
+    """Store values compactly: NumPy arrays when available, else array.array for numbers and lists otherwise."""
+    values = values if isinstance(values, list) else list(values)
+    dtype = dtype or infer_dtype(values)
+    has_null = None in values
+    if np is not None:
+        if dtype == "float":
+            return np.array(values, dtype=np.float64), dtype  # None becomes NaN
+        if dtype == "int" and not has_null:
+            try:
+                return np.array(values, dtype=np.int64), dtype
+            except OverflowError:
+                pass
+        if dtype == "bool" and not has_null:
+            return np.array(values, dtype=bool), dtype
+        return _object_array(values), dtype
+    if dtype in ("int", "float") and not has_null:
+        try:
+            return array("q" if dtype == "int" else "d", values), dtype
+        except OverflowError:
+            pass
+    return values, dtype
+
+
+def _to_list(column) -> List[Any]:
+    if np is not None and isinstance(column, np.ndarray) and column.dtype.kind == "f":
+        missing = np.isnan(column)
+        if missing.any():
+            # NaN only stands in for None inside float arrays; hand back None like the other backends.
+            values = column.astype(object)
+            values[missing] = None
+            return values.tolist()
+    return column.tolist() if hasattr(column, "tolist") else list(column)
+
+
+def _is_numeric_array(column) -> bool:
+    return np is not None and isinstance(column, np.ndarray) and column.dtype.kind in "biuf"
+
+
+def _take(column, indices):
+    if np is not None and isinstance(column, np.ndarray):
+        return column[np.asarray(indices, dtype=np.intp)]
+    values = map(column.__getitem__, indices)
+    return array(column.typecode, values) if isinstance(column, array) else list(values)
+
+
+def _compress(column, mask):
+    if np is not None and isinstance(column, np.ndarray):
+        return column[np.asarray(mask, dtype=bool)]
+    values = compress(column, mask)
+    return array(column.typecode, values) if isinstance(column, array) else list(values)
+
+
+def _concat(columns: List[Any], dtype: str):
+    if np is not None and all(isinstance(c, np.ndarray) for c in columns) and len({c.dtype for c in columns}) == 1:
+        return np.concatenate(columns)
+    values = []
+    for column in columns:
+        values.extend(_to_list(column))
+    return _make_column(values, dtype)[0]
+
+
+def _null_safe(func):
+    def compare(a, b):
+        return a is not None and b is not None and func(a, b)
+    return compare
+
+
+def _mask_and(a, b):
+    if np is not None and isinstance(a, np.ndarray):
+        return a & np.asarray(b, dtype=bool)
+    return list(map(operator.and_, a, b))
+
+
+def _mask_not(mask):
+    if np is not None and isinstance(mask, np.ndarray):
+        return ~mask
+    return list(map(operator.not_, mask))
+
+
+class Table:
+    """
+    Column-oriented table: one compact array per column plus a schema.
+
+    Rows from Sheets, Airtable, Salesforce or Drive (lists of lists or lists
+    of dicts) convert to a Table in one transpose, and back with to_rows() /
+    to_records(). filter/select/sort/group_by/distinct work a column at a
+    time, with NumPy when it is installed and with C-level builtins (map,
+    compress, sorted) otherwise, instead of a Python loop per row.
+
+    Tables are treated as immutable: every operation returns a new Table,
+    which may share column storage with the original.
+    """
+    def __init__(self, columns: Dict[str, Any] = None, schema: Dict[str, str] = None):
+        """
+        Args:
+            columns (dict): Column name -> sequence of values (lists, array.array or NumPy arrays).
+            schema (dict, optional): Column name -> one of DTYPES; inferred when missing.
+        """
+        columns = columns or {}
+        schema = schema or {}
+        self._columns: Dict[str, Any] = {}
+        self._schema: Dict[str, str] = {}
+        lengths = set()
+        for name, values in columns.items():
+            if np is not None and isinstance(values, np.ndarray) or isinstance(values, array):
+                self._columns[name] = values
+                self._schema[name] = schema.get(name) or infer_dtype(_to_list(values[:1]) or [None])
+            else:
+                self._columns[name], self._schema[name] = _make_column(values, schema.get(name))
+            lengths.add(len(self._columns[name]))
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self._num_rows = lengths.pop() if lengths else 0
+
+    @classmethod
+    def _wrap(cls, columns: Dict[str, Any], schema: Dict[str, str]) -> "Table":
+        # Build from already-stored columns without re-validating them.
+        table = cls.__new__(cls)
+        table._columns = columns
+        table._schema = {name: schema[name] for name in columns}
+        table._num_rows = len(next(iter(columns.values()))) if columns else 0
+        return table
+
+    # --- conversion -----------------------------------------------------------------------
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any], columns: Sequence[str] = None, header: bool = False,
+                  schema: Dict[str, str] = None) -> "Table":
+        """
+        Build a table from a list of rows.
+
+        Args:
+            rows (list): Lists/tuples of values, or dicts (keys become columns, in first-seen order).
+            columns (list, optional): Column names for list rows; defaults to the header row or "col0", "col1", ...
+            header (bool): Treat the first list row as the column names (as Sheets returns them).
+            schema (dict, optional): Column name -> dtype; inferred when missing.
+        """
+        rows = list(rows)
+        if rows and isinstance(rows[0], dict):
+            return cls.from_records(rows, schema=schema)
+        if header and rows:
+            columns, rows = columns or [str(c) for c in rows[0]], rows[1:]
+        width = max(map(len, rows), default=len(columns or []))
+        if columns is None:
+            columns = [f"col{i}" for i in range(width)]
+        width = max(width, len(columns))
+        if any(len(row) != width for row in rows):
+            # Sheets leaves out trailing empty cells; pad ragged rows so the transpose lines up.
+            rows = [list(row) + [None] * (width - len(row)) for row in rows]
+        transposed = list(zip(*rows)) if rows else [()] * width
+        return cls({name: list(values) for name, values in zip(columns, transposed)}, schema)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]], schema: Dict[str, str] = None) -> "Table":
+        """Build a table from a list of dicts; keys missing from a record become None."""
+        names = list(dict.fromkeys(key for record in records for key in record))
+        return cls({name: [record.get(name) for record in records] for name in names}, schema)
+
+    @classmethod
+    def from_data(cls, data: Any, header: bool = True) -> "Table":
+        """Build a table from whatever a DataWrapper holds: a Table, list of dicts or list of rows."""
+        if isinstance(data, Table):
+            return data
+        return cls.from_rows(data or [], header=header)
+
+    @classmethod
+    def from_numpy(cls, arrays: Dict[str, Any]) -> "Table":
+        """Build a table from a dict of NumPy arrays (kept as-is, not copied)."""
+        if np is None:
+            raise ImportError("NumPy is required for Table.from_numpy")
+        return cls({name: np.asarray(values) for name, values in arrays.items()})
+
+    def to_rows(self, header: bool = False) -> List[List[Any]]:
+        """Rows as lists, optionally preceded by the header row."""
+        rows = [list(row) for row in zip(*(_to_list(c) for c in self._columns.values()))]
+        return [self.columns] + rows if header else rows
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Rows as dicts keyed by column name."""
+        names = self.columns
+        return [dict(zip(names, row)) for row in zip(*(_to_list(c) for c in self._columns.values()))]
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Columns as Python lists."""
+        return {name: _to_list(column) for name, column in self._columns.items()}
+
+    def to_numpy(self, name: str):
+        """A column as a NumPy array (no copy when it is already stored as one)."""
+        if np is None:
+            raise ImportError("NumPy is required for Table.to_numpy")
+        return np.asarray(self._columns[name])
+
+    # --- introspection --------------------------------------------------------------------
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def schema(self) -> Dict[str, str]:
+        return dict(self._schema)
+
+    @property
+    def num_rows(self) -> int:
+        return self._num_rows
+
+    def __len__(self):
+        return self._num_rows
+
+    def column(self, name: str):
+        """The stored values of a column (list, array.array or NumPy array)."""
+        if name not in self._columns:
+            raise KeyError(f"Unknown column '{name}' (columns: {', '.join(self._columns)})")
+        return self._columns[name]
+
+    def __repr__(self):
+        schema = ", ".join(f"{name}: {dtype}" for name, dtype in self._schema.items())
+        return f"<Table rows={self._num_rows} [{schema}]>"
+
+    def __eq__(self, other):
+        return isinstance(other, Table) and self.columns == other.columns and self.to_dict() == other.to_dict()
+
+    # --- column operations ----------------------------------------------------------------
+
+    def select(self, names: Sequence[str]) -> "Table":
+        """Keep only the given columns, in that order (project)."""
+        return Table._wrap({name: self.column(name) for name in names}, self._schema)
+
+    def drop(self, names: Sequence[str]) -> "Table":
+        names = set(names)
+        return Table._wrap({n: c for n, c in self._columns.items() if n not in names}, self._schema)
+
+    def rename(self, mapping: Dict[str, str]) -> "Table":
+        columns = {mapping.get(name, name): column for name, column in self._columns.items()}
+        schema = {mapping.get(name, name): dtype for name, dtype in self._schema.items()}
+        return Table._wrap(columns, schema)
+
+    def with_column(self, name: str, values: Iterable[Any], dtype: str = None) -> "Table":
+        """Add or replace a column."""
+        column, dtype = _make_column(values, dtype)
+        if self._columns and len(column) != self._num_rows:
+            raise ValueError(f"Column '{name}' has {len(column)} values, expected {self._num_rows}")
+        return Table._wrap({**self._columns, name: column}, {**self._schema, name: dtype})
+
+    def cast(self, name: str, dtype: str) -> "Table":
+        """
+        Convert a column to another dtype.
+
+        None and empty strings become None; strings like "true"/"yes"/"1" are
+        true when cast to bool.
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype '{dtype}' (expected one of {', '.join(DTYPES)})")
+        convert = {
+            "int": lambda v: int(float(v)) if isinstance(v, str) else int(v),
+            "float": float,
+            "bool": lambda v: v.strip().lower() in ("true", "yes", "y", "1") if isinstance(v, str) else bool(v),
+            "str": str,
+            "object": lambda v: v,
+        }[dtype]
+
+        def cast_value(value):
+            return None if value is None or value == "" else convert(value)
+
+        return self.with_column(name, map(cast_value, _to_list(self.column(name))), dtype)
+
+    def apply(self, name: str, func: Callable[[Any], Any], output: str = None, dtype: str = None) -> "Table":
+        """Compute a column by calling `func` on each value of `name` (the one per-value Python call)."""
+        return self.with_column(output or name, map(func, _to_list(self.column(name))), dtype)
+
+    # --- row operations -------------------------------------------------------------------
+
+    def take(self, indices: Sequence[int]) -> "Table":
+        """Rows at the given positions, in that order."""
+        return Table._wrap({n: _take(c, indices) for n, c in self._columns.items()}, self._schema)
+
+    def head(self, n: int) -> "Table":
+        return Table._wrap({name: column[:n] for name, column in self._columns.items()}, self._schema)
+
+    def mask(self, name: str, op: str, value: Any = None):
+        """
+        Boolean mask of rows where `column op value` holds.
+
+        `op` is one of FILTER_OPS. None never matches a comparison, so rows
+        with missing values are excluded instead of raising.
+        """
+        column = self.column(name)
+        if op == "is_null" or op == "not_null":
+            if _is_numeric_array(column):
+                mask = np.isnan(column) if column.dtype.kind == "f" else np.zeros(len(column), dtype=bool)
+            else:
+                mask = list(map(operator.is_, _to_list(column), repeat(None)))
+            return mask if op == "is_null" else _mask_not(mask)
+        if op in ("in", "not in"):
+            values = set(value)
+            if _is_numeric_array(column):
+                mask = np.isin(column, list(values))
+            else:
+                mask = list(map(values.__contains__, _to_list(column)))
+            return mask if op == "in" else _mask_not(mask)
+        if op == "contains":
+            return self._object_mask(column, lambda a: isinstance(a, str) and value in a)
+        if op == "startswith":
+            return self._object_mask(column, lambda a: isinstance(a, str) and a.startswith(value))
+        if op not in _COMPARISONS:
+            raise ValueError(f"Unknown filter operator '{op}' (expected one of {', '.join(FILTER_OPS)})")
+
+        func = _COMPARISONS[op]
+        if _is_numeric_array(column) and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return func(column, value)
+        values = _to_list(column)
+        if None in values or value is None:
+            func = _null_safe(func)
+        mask = list(map(func, values, repeat(value)))
+        return np.array(mask, dtype=bool) if np is not None else mask
+
+    @staticmethod
+    def _object_mask(column, predicate):
+        mask = list(map(predicate, _to_list(column)))
+        return np.array(mask, dtype=bool) if np is not None else mask
+
+    def filter(self, mask: Union[Sequence[bool], Any] = None, **conditions) -> "Table":
+        """
+        Keep the rows where `mask` is true.
+
+        Conditions can also be given as keywords, `column=(op, value)` or
+        `column=value` for equality; they are combined with AND.
+        """
+        for name, condition in conditions.items():
+            op, value = condition if isinstance(condition, tuple) else ("==", condition)
+            condition_mask = self.mask(name, op, value)
+            mask = condition_mask if mask is None else _mask_and(condition_mask, mask)
+        if mask is None:
+            return self
+        if len(mask) != self._num_rows:
+            raise ValueError(f"Mask has {len(mask)} values, expected {self._num_rows}")
+        return Table._wrap({n: _compress(c, mask) for n, c in self._columns.items()}, self._schema)
+
+    def argsort(self, by: Union[str, Sequence[str]], descending: Union[bool, Sequence[bool]] = False):
+        """Row order sorting by one or more columns (stable; None and NaN last)."""
+        by = [by] if isinstance(by, str) else list(by)
+        descending = [descending] * len(by) if isinstance(descending, bool) else list(descending)
+        order = np.arange(self._num_rows) if np is not None else list(range(self._num_rows))
+
+        # Stable sorts from the least to the most significant key.
+        for name, desc in reversed(list(zip(by, descending))):
+            column = self.column(name)
+            if _is_numeric_array(column):
+                keys = column[order]
+                keys = keys.astype(np.int64) if keys.dtype.kind == "b" else keys
+                order = order[np.argsort(-keys if desc else keys, kind="stable")]
+                continue
+            values = _to_list(column)
+            present = [i for i in _to_list(order) if values[i] is not None]
+            missing = [i for i in _to_list(order) if values[i] is None]
+            present.sort(key=values.__getitem__, reverse=desc)
+            order = present + missing
+            order = np.asarray(order, dtype=np.intp) if np is not None else order
+        return order
+
+    def sort(self, by: Union[str, Sequence[str]], descending: Union[bool, Sequence[bool]] = False) -> "Table":
+        return self.take(self.argsort(by, descending))
+
+    def _group_codes(self, keys: Sequence[str]) -> Tuple[List[int], List[int]]:
+        """Group number of every row and the first row of every group, groups in first-seen order."""
+        groups: Dict[Any, int] = {}
+        key_columns = [_to_list(self.column(k)) for k in keys]
+        codes = [groups.setdefault(key, len(groups)) for key in zip(*key_columns)]
+        first = [0] * len(groups)
+        for row in reversed(range(len(codes))):
+            first[codes[row]] = row
+        return codes, first
+
+    def distinct(self, columns: Sequence[str] = None) -> "Table":
+        """Drop duplicate rows (comparing only `columns`, if given), keeping the first occurrence."""
+        _, first = self._group_codes(columns or self.columns)
+        return self.take(first)
+
+    def group_by(self, keys: Union[str, Sequence[str]], aggregations: Dict[str, Any] = None) -> "Table":
+        """
+        One row per distinct key, in first-seen order.
+
+        Args:
+            keys (str | list): Grouping column(s).
+            aggregations (dict): Output column -> (input column, function), with
+                function one of AGGREGATIONS, or just "count". Defaults to a `count` column.
+
+        Returns:
+            Table: Key columns followed by the aggregated columns.
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        aggregations = aggregations or {"count": "count"}
+        codes, first = self._group_codes(keys)
+        groups = len(first)
+
+        result = {name: _take(self.column(name), first) for name in keys}
+        schema = {name: self._schema[name] for name in keys}
+        for output, spec in aggregations.items():
+            source, func = (None, spec) if isinstance(spec, str) else spec
+            if func not in AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation '{func}' (expected one of {', '.join(AGGREGATIONS)})")
+            column = self.column(source) if source else None
+            values = self._aggregate(func, column, codes, first, groups)
+            result[output], schema[output] = _make_column(values, "int" if func in ("count", "nunique") else None)
+        return Table._wrap(result, schema)
+
+    @staticmethod
+    def _aggregate(func, column, codes, first, groups) -> List[Any]:
+        if func == "count" and column is None:
+            counts = [0] * groups
+            for code in codes:
+                counts[code] += 1
+            return counts
+        if func == "first":
+            return _to_list(_take(column, first))
+
+        if _is_numeric_array(column) and func in ("count", "sum", "mean", "min", "max", "last"):
+            codes = np.asarray(codes, dtype=np.intp)
+            values = column.astype(np.float64)
+            present = ~np.isnan(values)
+            counts = np.bincount(codes[present], minlength=groups)
+            if func == "last":
+                last = np.full(groups, -1, dtype=np.intp)
+                np.maximum.at(last, codes[present], np.arange(len(codes))[present])
+                return [column[i].item() if i >= 0 else None for i in last.tolist()]
+            if func == "count":
+                return counts.tolist()
+            if func in ("sum", "mean"):
+                sums = np.bincount(codes[present], weights=values[present], minlength=groups)
+                if func == "mean":
+                    return [s / c if c else None for s, c in zip(sums.tolist(), counts.tolist())]
+                return sums.astype(np.int64).tolist() if column.dtype.kind in "biu" else sums.tolist()
+            reduce, start = (np.minimum, np.inf) if func == "min" else (np.maximum, -np.inf)
+            out = np.full(groups, start)
+            reduce.at(out, codes[present], values[present])
+            out = [v if c else None for v, c in zip(out.tolist(), counts.tolist())]
+            return [int(v) for v in out] if column.dtype.kind in "biu" else out
+
+        buckets: List[List[Any]] = [[] for _ in range(groups)]
+        for code, value in zip(codes, _to_list(column)):
+            if value is not None:
+                buckets[code].append(value)
+        if func == "count":
+            return list(map(len, buckets))
+        if func == "sum":
+            return list(map(sum, buckets))
+        if func == "mean":
+            return [sum(b) / len(b) if b else None for b in buckets]
+        if func == "min":
+            return [min(b) if b else None for b in buckets]
+        if func == "max":
+            return [max(b) if b else None for b in buckets]
+        if func == "last":
+            return [b[-1] if b else None for b in buckets]
+        if func == "nunique":
+            return [len(set(b)) for b in buckets]
+        return buckets  # list
+
+    @classmethod
+    def concat(cls, tables: Sequence["Table"]) -> "Table":
+        """Stack tables vertically; columns missing from a table are filled with None."""
+        tables = [t for t in tables if t.columns]
+        if not tables:
+            return cls()
+        names = list(dict.fromkeys(name for t in tables for name in t.columns))
+        columns, schema = {}, {}
+        for name in names:
+            parts, dtypes = [], set()
+            for t in tables:
+                if name in t._columns:
+                    parts.append(t._columns[name])
+                    dtypes.add(t._schema[name])
+                else:
+                    parts.append([None] * t.num_rows)
+            dtype = dtypes.pop() if len(dtypes) == 1 and all(name in t._columns for t in tables) else None
+            columns[name] = _concat(parts, dtype)
+            schema[name] = dtype or infer_dtype(_to_list(columns[name]))
+        return cls._wrap(columns, schema)
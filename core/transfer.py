@@ -0,0 +1,78 @@
+# core/transfer.py
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional
+from core.concurrency import AdaptiveLimit
+from core.data_wrapper import DataWrapper, iter_batches
+
+DEFAULT_PARALLEL_TRANSFERS = 4
+
+
+class TransferError(RuntimeError):
+    """Raised after a multi-file transfer in which some files failed."""
+    def __init__(self, message: str, results: List[Dict[str, Any]], failures: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.results = results
+        self.failures = failures
+
+
+def transfer_files(data: DataWrapper, upload: Callable[[Dict[str, Any]], Dict[str, Any]],
+                   max_parallel: Optional[int] = DEFAULT_PARALLEL_TRANSFERS,
+                   limit: Optional[AdaptiveLimit] = None) -> DataWrapper:
+    """
+    Upload every file of a (possibly streamed) list, `max_parallel` at a time.
+
+    Items are {"metadata": ..., "content": payload} as the file fetchers
+    return them. At most `max_parallel` are in flight: the next item is only
+    taken from the fetcher's stream once a slot frees up, so with streaming
+    payloads memory stays at max_parallel times a payload's buffer.
+
+    Args:
+        data (DataWrapper): The files, in batches or as a list.
+        upload (callable): Uploads one item and returns a dict describing the result.
+        max_parallel (int, optional): Files transferred at once; None for as many as `limit` allows.
+        limit (AdaptiveLimit, optional): The destination's adaptive concurrency limit
+            (see core.concurrency); files in flight follow its current value.
+
+    Returns:
+        DataWrapper: One result dict per file, in completion order.
+
+    Raises:
+        TransferError: If any file failed, once all the others are done.
+    """
+    logger = logging.getLogger("pipeline")
+    results, failures = [], []
+
+    def collect(done):
+        for future in done:
+            item = in_flight.pop(future)
+            try:
+                results.append(future.result())
+            except Exception as e:
+                name = getattr(item.get("content"), "name", None) if isinstance(item, dict) else None
+                logger.error(f"Transfer of {name or item!r} failed: {e}")
+                failures.append({"name": name, "error": str(e)})
+
+    if max_parallel is None:
+        max_parallel = int(limit.maximum) if limit is not None else DEFAULT_PARALLEL_TRANSFERS
+
+    def slots():
+        return min(max_parallel, limit.current) if limit is not None else max_parallel
+
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="transfer") as pool:
+        for batch in iter_batches(data):
+            for item in batch:
+                while len(in_flight) >= slots():
+                    # The adaptive limit can also grow while a file is still uploading.
+                    done, _ = wait(in_flight, timeout=1 if limit is not None else None, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight[pool.submit(upload, item)] = item
+        collect(wait(in_flight).done)
+
+    logger.info(f"Transferred {len(results)} file(s), {len(failures)} failed")
+    if failures:
+        raise TransferError(f"{len(failures)} of {len(results) + len(failures)} file transfer(s) failed: "
+                            + "; ".join(f"{f['name']}: {f['error']}" for f in failures), results, failures)
+    return DataWrapper(data=results)
@@ -0,0 +1,429 @@
+# core/transforms.py
+
+import json
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.table import Table, DTYPES, FILTER_OPS, AGGREGATIONS
+
+OUTPUT_FORMATS = ("same", "records", "rows", "table")
+
+
+class TransformError(ValueError):
+    """A `transforms:` entry that cannot be applied."""
+
+
+def _names(value, op: str) -> List[str]:
+    names = [value] if isinstance(value, str) else value
+    if not isinstance(names, (list, tuple)) or not names or not all(isinstance(n, str) for n in names):
+        raise TransformError(f"`{op}` expects a column name or a list of column names")
+    return list(names)
+
+
+def _mapping(value, op: str) -> Dict[str, Any]:
+    if not isinstance(value, dict) or not value:
+        raise TransformError(f"`{op}` expects a mapping of column names")
+    return dict(value)
+
+
+class Transform:
+    """
+    One entry of a task's `transforms:` list, applied to a Table.
+
+    Transforms run once per batch, so a stream is reshaped as it flows.
+    `blocking` ones (sort, group) need every record at once; the batches
+    before them are collected first. Instances hold per-run state (e.g.
+    keys already seen by dedup), so a fresh chain is built for every run.
+    """
+    blocking = False
+
+    def apply(self, table: Table) -> Table:
+        raise NotImplementedError
+
+    @property
+    def exhausted(self) -> bool:
+        """True once no further input can change the output (lets a stream stop fetching)."""
+        return False
+
+
+class Select(Transform):
+    def __init__(self, arg):
+        self.columns = _names(arg, "select")
+
+    def apply(self, table):
+        return table.select(self.columns)
+
+
+class Drop(Transform):
+    def __init__(self, arg):
+        self.columns = _names(arg, "drop")
+
+    def apply(self, table):
+        return table.drop(self.columns)
+
+
+class Rename(Transform):
+    def __init__(self, arg):
+        self.mapping = _mapping(arg, "rename")
+
+    def apply(self, table):
+        return table.rename(self.mapping)
+
+
+class Filter(Transform):
+    """
+    Keep rows matching every condition.
+
+    Accepts `{column: value}` (equality), a list of `[column, op, value]`
+    or a list of `{column, op, value}` mappings.
+    """
+    def __init__(self, arg):
+        if isinstance(arg, dict) and "column" not in arg:
+            conditions = [(column, "==", value) for column, value in arg.items()]
+        else:
+            conditions = []
+            for item in arg if isinstance(arg, list) else [arg]:
+                if isinstance(item, dict):
+                    item = (item.get("column"), item.get("op", "=="), item.get("value"))
+                if not isinstance(item, (list, tuple)) or len(item) not in (2, 3):
+                    raise TransformError(f"`filter` condition {item!r} should be [column, op, value]")
+                conditions.append(tuple(item) if len(item) == 3 else (item[0], item[1], None))
+        for column, op, _ in conditions:
+            if not isinstance(column, str):
+                raise TransformError(f"`filter` condition has no column: {column!r}")
+            if op not in FILTER_OPS:
+                raise TransformError(f"`filter` has unknown operator '{op}' (expected one of {', '.join(FILTER_OPS)})")
+        self.conditions = conditions
+
+    def apply(self, table):
+        for column, op, value in self.conditions:
+            table = table.filter(table.mask(column, op, value))
+        return table
+
+
+class Cast(Transform):
+    def __init__(self, arg):
+        self.columns = _mapping(arg, "cast")
+        for column, dtype in self.columns.items():
+            if dtype not in DTYPES:
+                raise TransformError(f"`cast` of '{column}' to unknown type '{dtype}' (expected one of {', '.join(DTYPES)})")
+
+    def apply(self, table):
+        for column, dtype in self.columns.items():
+            table = table.cast(column, dtype)
+        return table
+
+
+class Fill(Transform):
+    """Replace missing values: `{column: default}`."""
+    def __init__(self, arg):
+        self.defaults = _mapping(arg, "fill")
+
+    def apply(self, table):
+        for column, default in self.defaults.items():
+            table = table.apply(column, lambda v, d=default: d if v is None or v == "" else v)
+        return table
+
+
+class MapValues(Transform):
+    """Translate a column's values through a lookup: `{column, values, default?, output?}`."""
+    def __init__(self, arg):
+        if not isinstance(arg, dict) or "column" not in arg or not isinstance(arg.get("values"), dict):
+            raise TransformError("`map` expects {column: ..., values: {...}}")
+        self.column = arg["column"]
+        self.values = dict(arg["values"])
+        self.keep = "default" not in arg
+        self.default = arg.get("default")
+        self.output = arg.get("output")
+
+    def apply(self, table):
+        lookup = self.values.get
+        func = (lambda v: lookup(v, v)) if self.keep else (lambda v: lookup(v, self.default))
+        return table.apply(self.column, func, output=self.output)
+
+
+class Flatten(Transform):
+    """Expand columns of dicts (e.g. Airtable `fields`) into one column per key."""
+    def __init__(self, arg):
+        self.columns = _names(arg, "flatten")
+
+    def apply(self, table):
+        for column in self.columns:
+            values = table.column(column)
+            values = values.tolist() if hasattr(values, "tolist") else list(values)
+            keys = list(dict.fromkeys(k for v in values if isinstance(v, dict) for k in v))
+            table = table.drop([column])
+            for key in keys:
+                table = table.with_column(key, [v.get(key) if isinstance(v, dict) else None for v in values])
+        return table
+
+
+class Dedup(Transform):
+    """Drop rows whose key columns (all columns by default) were already seen, across batches too."""
+    def __init__(self, arg):
+        self.columns = None if arg in (None, True) else _names(arg, "dedup")
+        self.seen = set()
+
+    def apply(self, table):
+        columns = [table.column(c) for c in self.columns or table.columns]
+        keys = zip(*(c.tolist() if hasattr(c, "tolist") else c for c in columns))
+        seen = self.seen
+        mask = []
+        for key in keys:
+            try:
+                hash(key)
+            except TypeError:
+                # Dict or list cells (Airtable `fields`, multi-value Sheets cells) are compared by content.
+                key = json.dumps(key, sort_keys=True, default=str)
+            mask.append(not (key in seen or seen.add(key)))
+        return table.filter(mask)
+
+
+class Limit(Transform):
+    def __init__(self, arg):
+        if not isinstance(arg, int) or isinstance(arg, bool) or arg < 0:
+            raise TransformError("`limit` expects a non-negative number of rows")
+        self.remaining = arg
+
+    def apply(self, table):
+        table = table.head(self.remaining)
+        self.remaining -= len(table)
+        return table
+
+    @property
+    def exhausted(self):
+        return self.remaining <= 0
+
+
+class Sort(Transform):
+    """`{by, descending?}` or just the column name(s)."""
+    blocking = True
+
+    def __init__(self, arg):
+        arg = arg if isinstance(arg, dict) else {"by": arg}
+        self.by = _names(arg.get("by"), "sort")
+        self.descending = arg.get("descending", False)
+
+    def apply(self, table):
+        return table.sort(self.by, self.descending)
+
+
+class Group(Transform):
+    """`{by, aggregations: {output: [column, function]}}`."""
+    blocking = True
+
+    def __init__(self, arg):
+        if not isinstance(arg, dict) or "by" not in arg:
+            raise TransformError("`group` expects {by: ..., aggregations: {...}}")
+        self.by = _names(arg["by"], "group")
+        self.aggregations = {}
+        for output, spec in (arg.get("aggregations") or {"count": "count"}).items():
+            spec = spec if isinstance(spec, str) else tuple(spec)
+            func = spec if isinstance(spec, str) else spec[-1]
+            if func not in AGGREGATIONS:
+                raise TransformError(f"`group` has unknown aggregation '{func}' (expected one of {', '.join(AGGREGATIONS)})")
+            self.aggregations[output] = spec
+
+    def apply(self, table):
+        return table.group_by(self.by, self.aggregations)
+
+
+TRANSFORMS: Dict[str, Callable[[Any], Transform]] = {
+    "select": Select,
+    "drop": Drop,
+    "rename": Rename,
+    "filter": Filter,
+    "cast": Cast,
+    "fill": Fill,
+    "map": MapValues,
+    "flatten": Flatten,
+    "dedup": Dedup,
+    "limit": Limit,
+    "sort": Sort,
+    "group": Group,
+}
+# Entries that describe the input/output shape rather than transform the table.
+SHAPE_KEYS = ("columns", "output", "payload")
+
+
+def _compile_payload(template: Any) -> Callable[[Dict[str, Any]], Any]:
+    """Turn a payload template into a builder; "$column" strings are replaced by that column's value."""
+    if isinstance(template, str) and template.startswith("$$"):
+        return lambda row: template[1:]
+    if isinstance(template, str) and template.startswith("$"):
+        column = template[1:]
+        return lambda row: row[column]
+    if isinstance(template, dict):
+        parts = [(key, _compile_payload(value)) for key, value in template.items()]
+        return lambda row: {key: build(row) for key, build in parts}
+    if isinstance(template, list):
+        parts = [_compile_payload(value) for value in template]
+        return lambda row: [build(row) for build in parts]
+    return lambda row: template
+
+
+def _payload_columns(template: Any) -> List[str]:
+    if isinstance(template, str) and template.startswith("$") and not template.startswith("$$"):
+        return [template[1:]]
+    if isinstance(template, dict):
+        return [c for value in template.values() for c in _payload_columns(value)]
+    if isinstance(template, list):
+        return [c for value in template for c in _payload_columns(value)]
+    return []
+
+
+class TransformChain:
+    """
+    The compiled `transforms:` list of a task.
+
+    Batches are converted to a Table once, run through every transform and
+    converted back. List rows are read with their first row as the header
+    unless a `columns:` entry names the columns; dict records use their
+    keys. The output keeps the input's shape (rows with a header row, or
+    records) unless `output:` asks for `records`, `rows` or `table`, and a
+    final `payload:` template maps every row to the shape a writer expects,
+    e.g. `{fields: {Name: $name}}` for Airtable.
+    """
+    def __init__(self, specs: Sequence[Dict[str, Any]]):
+        self.transforms: List[Transform] = []
+        self.columns = None
+        self.output = "same"
+        self.payload = None
+        self._payload_template = None
+
+        for position, spec in enumerate(specs or []):
+            if not isinstance(spec, dict) or len(spec) != 1:
+                raise TransformError(f"transform #{position + 1} should be a single `op: argument` mapping, got {spec!r}")
+            (op, arg), = spec.items()
+            if self.payload is not None:
+                raise TransformError(f"transform #{position + 1} ({op}) comes after `payload`, which must be last")
+            if op == "columns":
+                if position != 0:
+                    raise TransformError("`columns` names the input columns and must be the first transform")
+                self.columns = _names(arg, "columns")
+            elif op == "output":
+                if arg not in OUTPUT_FORMATS:
+                    raise TransformError(f"`output` must be one of {', '.join(OUTPUT_FORMATS)}, got {arg!r}")
+                self.output = arg
+            elif op == "payload":
+                self._payload_template = arg
+                self.payload = _compile_payload(arg)
+            elif op in TRANSFORMS:
+                self.transforms.append(TRANSFORMS[op](arg))
+            else:
+                known = ", ".join(list(TRANSFORMS) + list(SHAPE_KEYS))
+                raise TransformError(f"unknown transform '{op}' (expected one of {known})")
+
+        blocking = [i for i, t in enumerate(self.transforms) if t.blocking]
+        self._split = blocking[0] if blocking else len(self.transforms)
+        self._input_kind = None  # "rows" or "records", from the first batch
+
+    def __bool__(self):
+        return bool(self.transforms or self.payload or self.columns or self.output != "same")
+
+    # --- conversion -----------------------------------------------------------------------
+
+    def _to_table(self, batch: Any) -> Table:
+        if isinstance(batch, Table):
+            self._input_kind = self._input_kind or "table"
+            return batch
+        if not isinstance(batch, (list, tuple)):
+            raise TransformError(f"transforms need rows or records, got {type(batch).__name__}")
+        batch = list(batch)
+        if batch and isinstance(batch[0], dict):
+            self._input_kind = self._input_kind or "records"
+            return Table.from_records(batch)
+        if batch and not isinstance(batch[0], (list, tuple)):
+            batch = [[value] for value in batch]  # a list of scalars, e.g. record ids
+            self.columns = self.columns or ["value"]
+        self._input_kind = self._input_kind or "rows"
+        if self.columns is None:
+            if not batch:
+                return Table()
+            # The header row only arrives with the first batch of a stream.
+            self.columns = [str(c) for c in batch[0]]
+            batch = batch[1:]
+        return Table.from_rows(batch, columns=self.columns)
+
+    def _from_table(self, table: Table, first: bool) -> Any:
+        if self.payload is not None:
+            columns = list(dict.fromkeys(_payload_columns(self._payload_template)))
+            missing = [c for c in columns if c not in table.columns]
+            if missing:
+                raise TransformError(f"`payload` refers to unknown column(s): {', '.join(missing)}")
+            build = self.payload
+            if not columns:
+                return [build({}) for _ in range(len(table))]
+            return [build(dict(zip(columns, row))) for row in zip(*table.select(columns).to_dict().values())]
+        output = self.output if self.output != "same" else self._input_kind
+        if output == "table":
+            return table
+        if output == "records":
+            return table.to_records()
+        return table.to_rows(header=first)
+
+    # --- execution ------------------------------------------------------------------------
+
+    def _run(self, table: Table, transforms: List[Transform]) -> Table:
+        for transform in transforms:
+            if not table.columns and not len(table):
+                break  # nothing fetched; there are no columns to select or filter on
+            table = transform.apply(table)
+        return table
+
+    def apply(self, data: Any) -> Any:
+        """Transform a whole payload (rows, records or a Table) at once."""
+        return self._from_table(self._run(self._to_table(data), self.transforms), first=True)
+
+    def stream(self, batches: Iterator) -> Iterator:
+        """
+        Transform a stream batch by batch.
+
+        Transforms up to the first blocking one run on each batch as it
+        arrives; from there on the batches are concatenated and the rest runs
+        once at the end. Stops reading input once a `limit` is reached.
+        """
+        streamed, blocked = self.transforms[:self._split], self.transforms[self._split:]
+        collected: List[Table] = []
+        first = True
+        for batch in batches:
+            table = self._run(self._to_table(batch), streamed)
+            if blocked:
+                collected.append(table)
+            elif len(table) or first:
+                yield self._from_table(table, first)
+                first = False
+            if any(t.exhausted for t in streamed):
+                break
+        if blocked and collected:
+            yield self._from_table(self._run(Table.concat(collected), blocked), True)
+
+
+def apply_transforms(task: Dict[str, Any], data: DataWrapper) -> DataWrapper:
+    """
+    Run a task's `transforms:` list over its fetched data.
+
+    Streams stay streams: each batch is transformed as it is read, and
+    closing the result closes the fetch. Other data is transformed at once.
+    """
+    specs = task.get("transforms")
+    if not specs:
+        return data
+    chain = TransformChain(specs)
+    logging.getLogger("pipeline").info(f"Applying {len(specs)} transform(s) for '{task.get('name', 'Unnamed Pipeline')}'")
+    if data.streaming:
+        return StreamingDataWrapper(chain.stream(data.batches()), data.metadata, on_close=data.close)
+    return DataWrapper(chain.apply(data.data), data.metadata)
+
+
+def check_transforms(specs: Any, where: str, errors: List[str]) -> None:
+    """Append the problems of a `transforms:` list to `errors` (used when compiling the plan)."""
+    if specs is None:
+        return
+    if not isinstance(specs, (list, tuple)):
+        errors.append(f"{where}: `transforms` must be a list")
+        return
+    try:
+        TransformChain(specs)
+    except TransformError as e:
+        errors.append(f"{where}: {e}")
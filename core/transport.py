@@ -0,0 +1,43 @@
+# core/transport.py
+
+from typing import Any, Dict
+
+DEFAULT_HTTP_TIMEOUT = 60   # seconds a request may wait on its socket
+DEFAULT_IDLE_TIMEOUT = 240  # seconds a keep-alive connection may sit unused before it is reopened instead
+_OPTIONS = {"timeout", "idle_timeout"}
+
+
+def transport_options(value: Any = None) -> Dict[str, float]:
+    """
+    The `google_http` setting with its defaults filled in.
+
+    A dict may set `timeout` (socket timeout of a request) and `idle_timeout`
+    (how long an unused connection is trusted to still be open; servers drop
+    idle keep-alive connections after a few minutes).
+
+    Raises:
+        ValueError: If the setting is not such a dict or a value isn't a positive number.
+    """
+    value = value or {}
+    if not isinstance(value, dict) or set(value) - _OPTIONS:
+        raise ValueError(f"Invalid google_http setting {value!r} (use {{{', '.join(sorted(_OPTIONS))}}})")
+    options = {"timeout": DEFAULT_HTTP_TIMEOUT, "idle_timeout": DEFAULT_IDLE_TIMEOUT, **value}
+    for name, seconds in options.items():
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds <= 0:
+            raise ValueError(f"google_http {name} must be a positive number of seconds, not {seconds!r}")
+    return options
+
+
+_options = transport_options()
+
+
+def current_transport_options() -> Dict[str, float]:
+    """The HTTP transport options of the current run (the defaults until configure_transport() is called)."""
+    return _options
+
+
+def configure_transport(value: Any = None) -> Dict[str, float]:
+    """Set the process-wide HTTP transport options from `settings.google_http`."""
+    global _options
+    _options = transport_options(value)
+    return _options
@@ -1,6 +1,7 @@
 from pyairtable import Api
 from utility.auth import get_credentials
 from core.interfaces import Fetcher
+from core.ratelimit import mount
 from core.data_wrapper import DataWrapper
 
 class AirtableFetcher(Fetcher):
@@ -17,6 +18,7 @@ class AirtableFetcher(Fetcher):
     def initialize(self):
         api_key = get_credentials(self.service_name)
         api = Api(api_key)
+        mount(api.session, "airtable", self.base_id)  # Airtable limits requests per base
         self.table = api.base(self.base_id).table(self.table_name)
 
     def fetch_data(self, max_records: int = 100, view: str = None) -> DataWrapper:
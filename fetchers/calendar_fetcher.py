@@ -1,6 +1,5 @@
 from datetime import datetime
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_service import google_service
 from core.interfaces import Fetcher
 from core.data_wrapper import DataWrapper
 
@@ -31,8 +30,7 @@ class GoogleCalendarFetcher(Fetcher):
         Initialize the Calendar API service using credentials.
         """
         try:
-            creds = get_credentials(self.service_name)
-            self.service = build("calendar", "v3", credentials=creds)
+            self.service = google_service("calendar", "v3", self.service_name)
         except Exception as e:
             raise ValueError(f"Failed to initialize Google Calendar service: {e}")
 
@@ -65,7 +63,7 @@ class GoogleCalendarFetcher(Fetcher):
             events = events_result.get('items', [])
             return DataWrapper(data=events)
         except Exception as e:
-            raise ValueError(f"Failed to fetch data from Google Calendar: {e}")
+            raise ValueError(f"Failed to fetch data from Google Calendar: {e}") from e
 
     # def get_upcoming_event(self, calendar_id="primary") -> DataWrapper:
     #     """
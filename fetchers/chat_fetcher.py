@@ -1,5 +1,4 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_service import google_service
 from core.interfaces import Fetcher
 from core.data_wrapper import DataWrapper
 
@@ -26,8 +25,7 @@ class GoogleChatFetcher(Fetcher):
         """
         Initialize the Chat API service using credentials.
         """
-        creds = get_credentials(self.service_name)
-        self.service = build("chat", "v1", credentials=creds)
+        self.service = google_service("chat", "v1", self.service_name)
 
     def fetch_data(self, **message_dict) -> DataWrapper:
         """
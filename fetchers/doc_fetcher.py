@@ -1,7 +1,6 @@
 from core.interfaces import Fetcher
 from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
+from utility.google_service import google_service
 
 
 class DocsFetcher(Fetcher):
@@ -10,13 +9,23 @@ class DocsFetcher(Fetcher):
         self.document_id = doc_id
         self.service_name = service_name
         self.service = None
-        self.document = None
+        self._document = None
 
     def initialize(self):
         print(f"[DocsFetcher] Initializing for document: {self.document_id}")
-        creds = get_credentials(self.service_name)
-        self.service = build("docs", "v1", credentials=creds)
-        self.document = self.service.documents().get(documentId=self.document_id).execute()
+        self.service = google_service("docs", "v1", self.service_name)
+
+    @property
+    def document(self):
+        """The document, downloaded on first use and kept for later operations."""
+        if self._document is None:
+            self._document = self.service.documents().get(documentId=self.document_id).execute()
+        return self._document
+
+    def cache_validator(self, operation, params):
+        """Every operation reads the document, so its revisionId tells whether a cached result is current."""
+        doc = self.service.documents().get(documentId=self.document_id, fields="revisionId").execute()
+        return doc.get("revisionId")
 
     def fetch_data(self) -> DataWrapper:
         """Fetch entire document content."""
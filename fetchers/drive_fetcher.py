@@ -1,7 +1,15 @@
 from core.interfaces import Fetcher
-from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
+import io
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.binary_payload import BinaryPayload, StreamingBinaryPayload, DEFAULT_CHUNK_SIZE
+from utility.google_service import google_service
+from core.retry import is_transient
+from googleapiclient.http import MediaIoBaseDownload
+
+FILE_FIELDS = "id, name, mimeType, size, modifiedTime"
+GOOGLE_APPS_PREFIX = "application/vnd.google-apps."
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+CHANGE_FIELDS = "id, name, mimeType, modifiedTime, parents, trashed"
 
 
 class DriveFetcher(Fetcher):
@@ -34,8 +42,7 @@ class DriveFetcher(Fetcher):
         """
         try:
             print(f"[DriveFetcher] Initializing for folder: {self.folder_id or 'root'}")
-            creds = get_credentials(self.service_name)
-            self.service = build("drive", "v3", credentials=creds)
+            self.service = google_service("drive", "v3", self.service_name)
         except Exception as e:
             print(f"[DriveFetcher] Error initializing service: {e}")
             raise e
@@ -59,9 +66,66 @@ class DriveFetcher(Fetcher):
             print(f"[DriveFetcher] Retrieved {len(result)} files.")
             return DataWrapper(data=result)
         except Exception as e:
+            if is_transient(e):
+                raise  # retried by the runner (see core.retry)
             print(f"[DriveFetcher] Error fetching data: {e}")
             return DataWrapper(data=[])
 
+    def fetch_changes(self, watermark: str = None, page_size: int = 100) -> DataWrapper:
+        """
+        Files added or modified since the last run, for incremental syncs (`checkpoint: true`).
+
+        The first run lists every file of the folder (or root), like fetch_data;
+        later runs only the files the Drive Changes API reports since the page
+        token committed last time. Without a folder_id, changes anywhere in the
+        Drive are returned. Removed and trashed files are left out.
+
+        Args:
+            watermark (str, optional): Changes page token from the previous run; passed in by the runner.
+            page_size (int): Files or changes per API call.
+
+        Returns:
+            DataWrapper: Rows of ID, name, mime type and modified time, with
+            the page token to resume from in metadata["watermark"].
+        """
+        rows = []
+        if watermark is None:
+            # Taken before listing, so changes made while we list are picked up next run.
+            token = self.service.changes().getStartPageToken().execute()["startPageToken"]
+            query = f"'{self.folder_id or 'root'}' in parents and trashed = false"
+            page_token = None
+            while True:
+                response = self.service.files().list(
+                    q=query, pageSize=page_size, pageToken=page_token,
+                    fields="nextPageToken, files(id, name, mimeType, modifiedTime)"
+                ).execute()
+                rows += [[f["id"], f["name"], f["mimeType"], f["modifiedTime"]] for f in response.get("files", [])]
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+            print(f"[DriveFetcher] Initial sync: {len(rows)} files.")
+            return DataWrapper(data=rows, metadata={"watermark": token})
+
+        token = watermark
+        while True:
+            response = self.service.changes().list(
+                pageToken=token, pageSize=page_size, spaces="drive",
+                fields=f"nextPageToken, newStartPageToken, changes(removed, file({CHANGE_FIELDS}))"
+            ).execute()
+            for change in response.get("changes", []):
+                file = change.get("file")
+                if change.get("removed") or not file or file.get("trashed"):
+                    continue
+                if self.folder_id and self.folder_id not in file.get("parents", []):
+                    continue
+                rows.append([file["id"], file["name"], file["mimeType"], file["modifiedTime"]])
+            if "newStartPageToken" in response:
+                token = response["newStartPageToken"]
+                break
+            token = response["nextPageToken"]
+        print(f"[DriveFetcher] {len(rows)} files changed since the last sync.")
+        return DataWrapper(data=rows, metadata={"watermark": token})
+
     def get_file_metadata(self, file_id: str) -> DataWrapper:
         """
         Retrieves metadata for a specific file by its ID.
@@ -77,6 +141,8 @@ class DriveFetcher(Fetcher):
             return DataWrapper(data=[[metadata.get("id"), metadata.get("name"), metadata.get("mimeType"),
                                     metadata.get("size"), metadata.get("createdTime")]])
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"[DriveFetcher] Error fetching file metadata: {e}")
             return DataWrapper(data=[])
     
@@ -120,16 +186,135 @@ class DriveFetcher(Fetcher):
                     return DataWrapper(data=files[0]) # Return the first matching file
                 return DataWrapper(data=None) 
             except Exception as e:
+                if is_transient(e):
+                    raise
                 print(f"Error fetching file ID: {e}")
                 return DataWrapper(data=None) 
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"[DriveFetcher] Error in fetch_file_id_by_name: {e}")
             return DataWrapper(data=None)
 
 
+    def cache_validator(self, operation, params):
+        """A file's version, which Drive bumps on every change, for get_file_metadata."""
+        if operation != "get_file_metadata" or "file_id" not in params:
+            return None
+        metadata = self.service.files().get(fileId=params["file_id"], fields="version").execute()
+        return metadata.get("version")
+
+    def _media_request(self, metadata, export_mime_type=None):
+        """The download request of a file and the MIME type of what it returns."""
+        if metadata["mimeType"].startswith(GOOGLE_APPS_PREFIX):
+            if not export_mime_type:
+                raise ValueError(f"'{metadata['name']}' is a Google {metadata['mimeType'].rsplit('.', 1)[-1]}; "
+                                 f"pass export_mime_type to download it")
+            return self.service.files().export_media(fileId=metadata["id"], mimeType=export_mime_type), export_mime_type
+        return self.service.files().get_media(fileId=metadata["id"]), metadata["mimeType"]
+
+    def _stream_payload(self, metadata, export_mime_type=None) -> StreamingBinaryPayload:
+        if metadata["mimeType"].startswith(GOOGLE_APPS_PREFIX) and not export_mime_type:
+            raise ValueError(f"'{metadata['name']}' is a Google {metadata['mimeType'].rsplit('.', 1)[-1]}; "
+                             f"pass export_mime_type to download it")
+
+        def open_chunks():
+            # Built on the download thread, since a request is bound to its thread's HTTP client.
+            request, _ = self._media_request(metadata, export_mime_type)
+            buffer = io.BytesIO()
+            downloader = MediaIoBaseDownload(buffer, request, chunksize=DEFAULT_CHUNK_SIZE)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk()
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        size = int(metadata["size"]) if "size" in metadata and not export_mime_type else None
+        return StreamingBinaryPayload(open_chunks, size=size, name=metadata["name"],
+                                      mime_type=export_mime_type or metadata["mimeType"])
+
+    def download_file(self, file_id: str, export_mime_type: str = None) -> DataWrapper:
+        """
+        Download a file's contents, chunk by chunk, into a temporary file.
+
+        Args:
+            file_id (str): The ID of the file to download.
+            export_mime_type (str, optional): Format to export Google Docs/Sheets/Slides to
+                (e.g. "application/pdf"); required for those, ignored for other files.
+
+        Returns:
+            DataWrapper: {"metadata": {...}, "content": BinaryPayload}
+        """
+        try:
+            metadata = self.service.files().get(fileId=file_id, fields=FILE_FIELDS).execute()
+            request, mime_type = self._media_request(metadata, export_mime_type)
+            with BinaryPayload.writer(name=metadata["name"], mime_type=mime_type) as out:
+                downloader = MediaIoBaseDownload(out, request, chunksize=DEFAULT_CHUNK_SIZE)
+                done = False
+                while not done:
+                    status, done = downloader.next_chunk()
+                    if status:
+                        print(f"[DriveFetcher] Downloading {metadata['name']}... {int(status.progress() * 100)}%")
+            print(f"[DriveFetcher] Downloaded '{metadata['name']}' ({out.payload.size} bytes)")
+            return DataWrapper(data={"metadata": metadata, "content": out.payload})
+        except Exception as e:
+            print(f"[DriveFetcher] Error downloading file: {e}")
+            raise e
+
+    def stream_file(self, file_id: str, export_mime_type: str = None) -> DataWrapper:
+        """
+        A file whose content is downloaded only as a writer reads it (no local copy).
+
+        Args:
+            file_id (str): The ID of the file.
+            export_mime_type (str, optional): Export format for Google Docs/Sheets/Slides.
+
+        Returns:
+            DataWrapper: {"metadata": {...}, "content": StreamingBinaryPayload}
+        """
+        metadata = self.service.files().get(fileId=file_id, fields=FILE_FIELDS).execute()
+        return DataWrapper(data={"metadata": metadata, "content": self._stream_payload(metadata, export_mime_type)})
+
+    def stream_files(self, export_mime_type: str = None, page_size: int = 100) -> StreamingDataWrapper:
+        """
+        Every file in the folder (or root), one page at a time, each with streamed content.
+
+        Folders are skipped, and so are Google Docs/Sheets/Slides unless
+        export_mime_type is given.
+
+        Returns:
+            StreamingDataWrapper: Batches of {"metadata", "content"} items.
+        """
+        def batches():
+            query = f"'{self.folder_id or 'root'}' in parents and trashed = false"
+            page_token = None
+            while True:
+                response = self.service.files().list(
+                    q=query, pageSize=page_size, pageToken=page_token,
+                    fields=f"nextPageToken, files({FILE_FIELDS})"
+                ).execute()
+                files = [
+                    f for f in response.get("files", [])
+                    if f["mimeType"] != FOLDER_MIME_TYPE
+                    and (export_mime_type or not f["mimeType"].startswith(GOOGLE_APPS_PREFIX))
+                ]
+                if files:
+                    print(f"[DriveFetcher] Listed {len(files)} files to stream")
+                    yield [{"metadata": f, "content": self._stream_payload(f, export_mime_type)} for f in files]
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    return
+
+        return StreamingDataWrapper(batches())
+
     def get_operations(self):
         return {
             "fetch_data": self.fetch_data,
+            "fetch_changes": self.fetch_changes,
             "get_file_metadata": self.get_file_metadata,
-            "fetch_file_id_by_name": self.fetch_file_id_by_name
+            "fetch_file_id_by_name": self.fetch_file_id_by_name,
+            "download_file": self.download_file,
+            "stream_file": self.stream_file,
+            "stream_files": self.stream_files
         }
@@ -1,7 +1,9 @@
 import dropbox
 from utility.auth import get_credentials
 from core.interfaces import Fetcher
-from core.data_wrapper import DataWrapper
+from core.ratelimit import mount
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.binary_payload import BinaryPayload, StreamingBinaryPayload, DEFAULT_CHUNK_SIZE
 
 class DropboxFetcher(Fetcher):
     """
@@ -22,7 +24,8 @@ class DropboxFetcher(Fetcher):
         """
         Initialize the Dropbox client.
         """
-        self.client = dropbox.Dropbox(self.access_token)
+        session = mount(dropbox.create_session(), "dropbox", self.access_token)
+        self.client = dropbox.Dropbox(self.access_token, session=session)
 
     def fetch_data(self, path: str = "", recursive: bool = False) -> DataWrapper:
         """
@@ -45,6 +48,26 @@ class DropboxFetcher(Fetcher):
 
         return DataWrapper(data=entries)
 
+    def stream_data(self, path: str = "", recursive: bool = False) -> StreamingDataWrapper:
+        """
+        List files/folders in the given Dropbox path, one page of entries at a time.
+
+        Args:
+            path: Dropbox folder path.
+            recursive: If True, list subfolders recursively.
+
+        Returns:
+            StreamingDataWrapper yielding batches of file/folder metadata entries.
+        """
+        def batches():
+            res = self.client.files_list_folder(path=path, recursive=recursive)
+            yield res.entries
+            while res.has_more:
+                res = self.client.files_list_folder_continue(res.cursor)
+                yield res.entries
+
+        return StreamingDataWrapper(batches())
+
     def download_file(self, path: str) -> DataWrapper:
         """
         Download file contents from Dropbox.
@@ -53,28 +76,82 @@ class DropboxFetcher(Fetcher):
             path: Dropbox file path to download.
 
         Returns:
-            DataWrapper with file metadata and content bytes.
+            DataWrapper with file metadata and the content as a BinaryPayload
+            (streamed to a temporary file, never held in memory).
         """
         md, resp = self.client.files_download(path)
-        return DataWrapper(data={"metadata": md, "content": resp.content})
+        try:
+            content = BinaryPayload.from_chunks(resp.iter_content(DEFAULT_CHUNK_SIZE), name=md.name)
+        finally:
+            resp.close()
+        return DataWrapper(data={"metadata": md, "content": content})
+
+    def _stream_payload(self, md) -> StreamingBinaryPayload:
+        def open_chunks():
+            _, resp = self.client.files_download(md.path_lower)
+            try:
+                yield from resp.iter_content(DEFAULT_CHUNK_SIZE)
+            finally:
+                resp.close()
+
+        return StreamingBinaryPayload(open_chunks, size=md.size, name=md.name)
+
+    def stream_file(self, path: str) -> DataWrapper:
+        """
+        A file whose content is downloaded only as a writer reads it.
+
+        Unlike download_file nothing is written locally: a writer such as
+        DriveWriter sends the chunks on as they arrive.
+
+        Args:
+            path: Dropbox file path.
+
+        Returns:
+            DataWrapper with {"metadata": FileMetadata, "content": StreamingBinaryPayload}
+        """
+        md = self.client.files_get_metadata(path)
+        return DataWrapper(data={"metadata": md, "content": self._stream_payload(md)})
+
+    def stream_files(self, path: str = "", recursive: bool = False) -> StreamingDataWrapper:
+        """
+        Every file in a folder, one listing page at a time, each with streamed content.
+
+        Pair with an `upload_files` writer operation to copy a whole folder
+        with a few files in flight at once.
+
+        Args:
+            path: Dropbox folder path.
+            recursive: If True, include subfolders.
+
+        Returns:
+            StreamingDataWrapper yielding batches of {"metadata", "content"} items.
+        """
+        def batches():
+            for entries in self.stream_data(path, recursive).batches():
+                files = [md for md in entries if isinstance(md, dropbox.files.FileMetadata)]
+                if files:
+                    yield [{"metadata": md, "content": self._stream_payload(md)} for md in files]
+
+        return StreamingDataWrapper(batches())
 
     def get_file_content(self, file_path: str) -> DataWrapper:
         """
-        Read binary content from a local file and return wrapped data.
+        Wrap a local file as binary content (the file is read by the writer, not copied here).
 
         Args:
             file_path: Local file path to read from.
 
         Returns:
-            DataWrapper with {"content": file_bytes}
+            DataWrapper with {"content": BinaryPayload}
         """
-        with open(file_path, "rb") as f:
-            content = f.read()
-        return DataWrapper(data={"content": content})
+        return DataWrapper(data={"content": BinaryPayload.from_path(file_path)})
 
     def get_operations(self):
         return {
             "fetch_data": self.fetch_data,
+            "stream_data": self.stream_data,
             "download_file": self.download_file,
+            "stream_file": self.stream_file,
+            "stream_files": self.stream_files,
             "get_file_content": self.get_file_content,
         }
@@ -1,7 +1,6 @@
 from core.interfaces import Fetcher
 from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
+from utility.google_service import google_service
 
 class FormFetcher(Fetcher):
     def __init__(self, form_id: str, service_name: str = "form_cred"):
@@ -11,11 +10,17 @@ class FormFetcher(Fetcher):
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build(
-            "forms", "v1", credentials=creds, discoveryServiceUrl="https://forms.googleapis.com/$discovery/rest?version=v1", static_discovery=False
+        self.service = google_service(
+            "forms", "v1", self.service_name, discovery_url="https://forms.googleapis.com/$discovery/rest?version=v1"
         )
 
+    def cache_validator(self, operation, params):
+        """The form's revisionId, which changes with its definition (not with new responses)."""
+        if operation != "fetch_data":
+            return None
+        form = self.service.forms().get(formId=self.form_id, fields="revisionId").execute()
+        return form.get("revisionId")
+
     def fetch_data(self) -> DataWrapper:
         """Fetch full form definition (metadata + structure)."""
         form = self.service.forms().get(formId=self.form_id).execute()
@@ -1,6 +1,7 @@
 from msgraph.core import GraphClient
 from azure.identity import ClientSecretCredential
 from core.interfaces import Fetcher
+from core.ratelimit import limit_calls
 from core.data_wrapper import DataWrapper
 
 class OutlookFetcher(Fetcher):
@@ -18,6 +19,7 @@ class OutlookFetcher(Fetcher):
     def initialize(self):
         cred = ClientSecretCredential(tenant_id=self.tenant_id, client_id=self.client_id, client_secret=self.client_secret)
         self.client = GraphClient(credential=cred, scopes=["https://graph.microsoft.com/.default"])
+        limit_calls(self.client, "get", "outlook", f"{self.tenant_id}/{self.client_id}")
 
     def fetch_messages(self, folder: str = "Inbox", top: int = 10) -> DataWrapper:
         """
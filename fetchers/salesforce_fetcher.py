@@ -1,7 +1,8 @@
 from simple_salesforce import Salesforce, SalesforceLogin
 from utility.auth import get_credentials
 from core.interfaces import Fetcher
-from core.data_wrapper import DataWrapper
+from core.ratelimit import mount
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
 
 class SalesforceFetcher(Fetcher):
     """
@@ -22,6 +23,7 @@ class SalesforceFetcher(Fetcher):
             security_token=self.security_token,
             domain=self.domain
         )
+        mount(self.sf.session, "salesforce", self.username)
 
     def fetch_object(self, object_name: str, record_id: str) -> DataWrapper:
         """Fetch a single record by ID."""
@@ -33,8 +35,21 @@ class SalesforceFetcher(Fetcher):
         result = self.sf.query_all(soql)
         return DataWrapper(data=result.get("records", []))
 
+    def stream_query(self, soql: str) -> StreamingDataWrapper:
+        """Run SOQL query and stream the records one result page at a time."""
+        def batches():
+            result = self.sf.query(soql)
+            while True:
+                yield result.get("records", [])
+                if result.get("done", True):
+                    return
+                result = self.sf.query_more(result["nextRecordsUrl"], identifier_is_url=True)
+
+        return StreamingDataWrapper(batches())
+
     def get_operations(self):
         return {
             "fetch_object": self.fetch_object,
-            "query": self.query
+            "query": self.query,
+            "stream_query": self.stream_query
         }
@@ -1,9 +1,10 @@
 # fetchers/sheet_fetcher.py
 
 from core.interfaces import Fetcher
-from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.table import Table
+from utility.google_service import google_service
+from core.retry import is_transient
 
 class SheetsFetcher(Fetcher):
     """
@@ -23,7 +24,6 @@ class SheetsFetcher(Fetcher):
             self.spreadsheet_id = spreadsheet_id
             self.service_name = service_name
             self.service = None
-            self.sheet = None
         except Exception as e:
             print(f"Error in sheets_fetcher __init__: {e}")
 
@@ -33,12 +33,15 @@ class SheetsFetcher(Fetcher):
         """
         try:
             print(f"[SheetsFetcher] Initializing for spreadsheet: {self.spreadsheet_id}")
-            creds = get_credentials(self.service_name)
-            self.service = build("sheets", "v4", credentials=creds)
-            self.sheet = self.service.spreadsheets()
+            self.service = google_service("sheets", "v4", self.service_name)
         except Exception as e:
             print(f"Error initializing SheetsFetcher: {e}")
 
+    @property
+    def sheet(self):
+        # Resolved on use so the service is only built once an operation runs.
+        return self.service.spreadsheets()
+
     def fetch_data(self, range_name) -> DataWrapper:
         """
         Fetch values from the specified range in the sheet.
@@ -54,9 +57,37 @@ class SheetsFetcher(Fetcher):
             print(f"[SheetsFetcher] Fetched {len(values)} rows from {range_name}")
             return DataWrapper(data=values)
         except Exception as e:
+            if is_transient(e):
+                raise  # retried by the runner (see core.retry)
             print(f"Error in fetch-data: {e}")
             return DataWrapper(data=[])
     
+    def stream_rows(self, sheet_name="Sheet1", first_column="A", last_column="Z", batch_size=1000) -> StreamingDataWrapper:
+        """
+        Stream the rows of a sheet, `batch_size` rows per request.
+
+        Writers can start on the first batch while later ones are still being
+        fetched. Stops at the first batch that comes back empty.
+
+        Returns:
+            StreamingDataWrapper: Batches of rows.
+        """
+        def batches():
+            start = 1
+            while True:
+                range_name = f"{sheet_name}!{first_column}{start}:{last_column}{start + batch_size - 1}"
+                result = self.sheet.values().get(spreadsheetId=self.spreadsheet_id, range=range_name).execute()
+                values = result.get("values", [])
+                if not values:
+                    return
+                print(f"[SheetsFetcher] Fetched {len(values)} rows from {range_name}")
+                yield values
+                if len(values) < batch_size:
+                    return
+                start += batch_size
+
+        return StreamingDataWrapper(batches())
+
     # Default fetch
     def fetch(self) -> DataWrapper:
         """
@@ -68,6 +99,8 @@ class SheetsFetcher(Fetcher):
         try:
             return DataWrapper(self.sheet.get_all_values())
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in fetch: {e}")
             return DataWrapper(data=[])
 
@@ -84,6 +117,8 @@ class SheetsFetcher(Fetcher):
         try:
             return DataWrapper(self.sheet.values().get(spreadsheetId=self.spreadsheet_id, range=range_name))
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in fetch_range: {e}")
             return DataWrapper(data=[])
 
@@ -107,6 +142,8 @@ class SheetsFetcher(Fetcher):
             row = result.get("values", [[]])[0]  # fallback to empty row if missing
             return DataWrapper(data=[row])
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in fetch_row: {e}")
             return DataWrapper(data=[])
 
@@ -146,6 +183,8 @@ class SheetsFetcher(Fetcher):
             return DataWrapper(data=col_values)
 
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in fetch_column: {e}")
             return DataWrapper(data=[])
 
@@ -165,27 +204,52 @@ class SheetsFetcher(Fetcher):
             col_idx = headers.index(header_name) + 1 if header_name in headers else None
             return DataWrapper([self.sheet.col_values(col_idx)]) if col_idx else DataWrapper([])
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in fetch_column_by_header: {e}")
             return DataWrapper(data=[])
 
-    def fetch_rows_by_condition(self, col_name: str, match_value: str) -> DataWrapper:
+    def fetch_table(self, range_name="Sheet1") -> DataWrapper:
+        """
+        Fetch a range whose first row is the header as a columnar Table.
+
+        Returns:
+            DataWrapper: A core.table.Table with one column per header.
+        """
+        try:
+            result = self.sheet.values().get(
+                spreadsheetId=self.spreadsheet_id, range=range_name
+            ).execute()
+            table = Table.from_rows(result.get("values", []), header=True)
+            print(f"[SheetsFetcher] Fetched {len(table)} rows x {len(table.columns)} columns from {range_name}")
+            return DataWrapper(data=table)
+        except Exception as e:
+            if is_transient(e):
+                raise
+            print(f"Error in fetch_table: {e}")
+            return DataWrapper(data=Table())
+
+    def fetch_rows_by_condition(self, col_name: str, match_value: str, range_name="Sheet1") -> DataWrapper:
         """
         Fetch rows where a given column matches a specific value.
 
+        The range is filtered as a columnar Table (one comparison over the
+        column) rather than row by row.
+
         Args:
             col_name (str): The name of the column to check.
             match_value (str): The value to match.
-        
+            range_name (str): The A1 range to search; its first row is the header.
+
         Returns:
             DataWrapper: List of matching rows.
         """
         try:
-            headers = self.sheet.row_values(1)
-            col_idx = headers.index(col_name)
-            all_rows = self.sheet.get_all_values()[1:]
-            matched = [row for row in all_rows if len(row) > col_idx and row[col_idx] == match_value]
-            return DataWrapper(matched)
+            table = self.fetch_table(range_name).data
+            return DataWrapper(table.filter(table.mask(col_name, "==", match_value)).to_rows())
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in fetch_rows_by_condition: {e}")
             return DataWrapper(data=[])
 
@@ -199,6 +263,8 @@ class SheetsFetcher(Fetcher):
         try:
             return DataWrapper([self.sheet.row_values(1)])
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in get_headers: {e}")
             return DataWrapper(data=[])
 
@@ -214,6 +280,8 @@ class SheetsFetcher(Fetcher):
             cols = len(self.sheet.row_values(1))
             return DataWrapper([[rows, cols]])
         except Exception as e:
+            if is_transient(e):
+                raise
             print(f"Error in get_dimensions: {e}")
             return DataWrapper(data=[[0, 0]])
 
@@ -225,8 +293,10 @@ class SheetsFetcher(Fetcher):
             "fetch_range": self.fetch_range,
             "fetch_row": self.fetch_row,
             "fetch_column": self.fetch_column,
+            "stream_rows": self.stream_rows,
+            "fetch_table": self.fetch_table,
             # "fetch_column_by_header": self.fetch_column_by_header,
-            # "fetch_rows_by_condition": self.fetch_rows_by_condition,
+            "fetch_rows_by_condition": self.fetch_rows_by_condition,
             # "get_headers": self.get_headers,
             # "get_dimensions": self.get_dimensions,
         }
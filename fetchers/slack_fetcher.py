@@ -2,6 +2,8 @@ from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from utility.auth import get_credentials
 from core.interfaces import Fetcher
+from core.ratelimit import limit_calls
+from core.retry import is_transient
 from core.data_wrapper import DataWrapper
 
 class SlackFetcher(Fetcher):
@@ -13,7 +15,7 @@ class SlackFetcher(Fetcher):
         self.client = None
 
     def initialize(self):
-        self.client = WebClient(token=self.token)
+        self.client = limit_calls(WebClient(token=self.token), "api_call", "slack", self.token)
 
     def fetch_messages(self, channel: str, limit: int = 100) -> DataWrapper:
         """
@@ -27,6 +29,8 @@ class SlackFetcher(Fetcher):
             print("resp>>>>>>>>>", resp)
             return DataWrapper(data={"channel": dm_channel_id, "ts": resp.get("messages")[0]["ts"]})
         except SlackApiError as e:
+            if is_transient(e):
+                raise  # retried by the runner (see core.retry)
             print(f"[SlackFetcher] Error: {e.response['error']}")
             return DataWrapper(data=[])
 
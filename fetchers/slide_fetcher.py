@@ -1,5 +1,4 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_service import google_service
 from core.interfaces import Fetcher
 from core.data_wrapper import DataWrapper
 
@@ -14,8 +13,16 @@ class GoogleSlidesFetcher(Fetcher):
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build("slides", "v1", credentials=creds)
+        self.service = google_service("slides", "v1", self.service_name)
+
+    def cache_validator(self, operation, params):
+        """The presentation's revisionId, for the operations that read it."""
+        if operation not in ("fetch_data", "fetch_presentation_metadata"):
+            return None
+        presentation = self.service.presentations().get(
+            presentationId=self.presentation_id, fields="revisionId"
+        ).execute()
+        return presentation.get("revisionId")
 
     def fetch_presentation_metadata(self) -> DataWrapper:
         """
@@ -1,5 +1,4 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_service import google_service
 from core.interfaces import Fetcher
 from core.data_wrapper import DataWrapper
 
@@ -13,8 +12,7 @@ class GoogleTasksFetcher(Fetcher):
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build("tasks", "v1", credentials=creds)
+        self.service = google_service("tasks", "v1", self.service_name)
 
     def fetch_task_lists(self) -> DataWrapper:
         result = self.service.tasklists().list(maxResults=100).execute()
@@ -1,5 +1,7 @@
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
 from core.interfaces import Fetcher
+from core.ratelimit import mount
 from core.data_wrapper import DataWrapper
 
 class TwilioFetcher(Fetcher):
@@ -14,7 +16,9 @@ class TwilioFetcher(Fetcher):
         self.client = None
 
     def initialize(self):
-        self.client = Client(self.account_sid, self.auth_token)
+        http_client = TwilioHttpClient()
+        mount(http_client.session, "twilio", self.account_sid)
+        self.client = Client(self.account_sid, self.auth_token, http_client=http_client)
 
     def fetch_messages(self, limit: int = 10) -> DataWrapper:
         """
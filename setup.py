@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 setup(
     name="data-pipeline",
     version="0.1",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=[
         "google-api-python-client",
         "google-auth",
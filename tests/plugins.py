@@ -0,0 +1,127 @@
+# tests/plugins.py
+#
+# Fetchers and writers the tests refer to by class path ("tests.plugins.<Name>").
+
+import asyncio
+import threading
+import time
+from core.interfaces import AsyncFetcher, AsyncWriter, Fetcher, Writer
+from core.data_wrapper import DataWrapper, iter_batches
+
+# What the writers received, by their `tag`; tests clear it in their setup.
+WRITTEN = {}
+# Record number (1-based) a RecordByRecordWriter fails on, by its `tag`; kept out of
+# the params so that a rerun after changing it is the same writer to the journal.
+FAIL_AT = {}
+# Watermarks ListFetcher was called with, one per fetch, in call order.
+WATERMARKS = []
+# Tags of the RecordWriters constructed and closed.
+CREATED = []
+CLOSED = []
+
+
+class ListFetcher(Fetcher):
+    """Returns `rows`, and `watermark` in the metadata when given."""
+    def __init__(self, rows=None, watermark=None):
+        super().__init__()
+        self.rows = rows if rows is not None else [[1, "a"], [2, "b"]]
+        self.watermark = watermark
+
+    def fetch_data(self, watermark=None):
+        WATERMARKS.append(watermark)
+        metadata = {} if self.watermark is None else {"watermark": self.watermark}
+        return DataWrapper(data=[list(row) for row in self.rows], metadata=metadata)
+
+    def get_operations(self):
+        return {"fetch_data": self.fetch_data}
+
+
+class PageFetcher(Fetcher):
+    """Streams `pages` pages of `size` rows; raises while producing page `fail_on` (1-based)."""
+    def __init__(self, pages=3, size=2, fail_on=None):
+        super().__init__()
+        self.pages = pages
+        self.size = size
+        self.fail_on = fail_on
+
+    def fetch_data(self):
+        for page in range(1, self.pages + 1):
+            if page == self.fail_on:
+                raise RuntimeError(f"page {page} failed")
+            yield [[page, i] for i in range(self.size)]
+
+    def get_operations(self):
+        return {"fetch_data": self.fetch_data}
+
+
+class RecordWriter(Writer):
+    """Stores the records it is handed under WRITTEN[tag]; sleeps `delay` seconds, or fails if `fail`."""
+    def __init__(self, tag="w", delay=0, fail=False):
+        super().__init__()
+        self.tag = tag
+        self.delay = delay
+        self.fail = fail
+        CREATED.append(tag)
+
+    def write_data(self, data):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"writer {self.tag} failed")
+        WRITTEN[self.tag] = list(data.records())
+
+    def get_operations(self):
+        return {"write_data": self.write_data}
+
+    def close(self):
+        CLOSED.append(self.tag)
+
+
+class StreamWriter(RecordWriter):
+    """A streaming writer: stores how many batches it read and the records in them."""
+    streaming = True
+
+    def write_data(self, data):
+        batches = list(iter_batches(data))
+        WRITTEN[self.tag] = {"batches": len(batches), "records": [r for batch in batches for r in batch]}
+
+
+class RecordByRecordWriter(RecordWriter):
+    """Writes (appends to WRITTEN[tag]) one record at a time; raises on record FAIL_AT[tag]."""
+    journaled_operations = ("write_data",)
+
+    def write_data(self, data):
+        written = WRITTEN.setdefault(self.tag, [])
+        for number, record in enumerate(data.records(), 1):
+            if number == FAIL_AT.get(self.tag):
+                raise RuntimeError(f"writer {self.tag} failed on record {number}")
+            written.append(record)
+
+
+class AsyncListFetcher(AsyncFetcher):
+    """ListFetcher as a coroutine."""
+    def __init__(self, rows=None):
+        super().__init__()
+        self.rows = rows if rows is not None else [[1, "a"], [2, "b"]]
+
+    async def fetch_data(self):
+        await asyncio.sleep(0)
+        return DataWrapper(data=[list(row) for row in self.rows])
+
+    def get_operations(self):
+        return {"fetch_data": self.fetch_data}
+
+
+class AsyncRecordWriter(AsyncWriter):
+    """RecordWriter as a coroutine; also stores the thread it ran on under WRITTEN[tag + ".thread"]."""
+    def __init__(self, tag="w", delay=0):
+        super().__init__()
+        self.tag = tag
+        self.delay = delay
+
+    async def write_data(self, data):
+        await asyncio.sleep(self.delay)
+        WRITTEN[self.tag] = list(data.records())
+        WRITTEN[self.tag + ".thread"] = threading.current_thread().name
+
+    def get_operations(self):
+        return {"write_data": self.write_data}
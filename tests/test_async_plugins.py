@@ -0,0 +1,68 @@
+# tests/test_async_plugins.py
+
+import threading
+import time
+import pytest
+from core.async_runner import service_key
+from core.runner import execute_tasks
+from tests.plugins import WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+def async_task(name, delay=0):
+    return {"name": name, "fetcher": {"class": "tests.plugins.AsyncListFetcher"},
+            "writers": [{"class": "tests.plugins.AsyncRecordWriter", "params": {"tag": name, "delay": delay}}]}
+
+
+def test_native_plugins_run_on_the_event_loop(settings):
+    results = execute_tasks([async_task("one", 0.2), async_task("two", 0.2), async_task("three", 0.2)],
+                            run_mode="async", settings=settings)
+
+    assert [r.status for r in results] == ["ok", "ok", "ok"]
+    assert WRITTEN["one"] == [[1, "a"], [2, "b"]]
+    assert {WRITTEN[f"{name}.thread"] for name in ("one", "two", "three")} == {threading.current_thread().name}
+    # The writers awaited their delays concurrently.
+    assert max(r.duration for r in results) < 0.5
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "parallel"])
+def test_native_plugins_in_other_run_modes(settings, run_mode):
+    results = execute_tasks([async_task("one"), async_task("two")], run_mode=run_mode, settings=settings)
+
+    assert [r.status for r in results] == ["ok", "ok"]
+    assert WRITTEN["two"] == [[1, "a"], [2, "b"]]
+
+
+def test_sync_plugins_are_bounded_per_service(settings):
+    tasks = [{"name": name, "fetcher": {"class": "tests.plugins.ListFetcher", "params": {"rows": [[name]]}},
+              "writers": [{"class": "tests.plugins.RecordWriter", "params": {"tag": name, "delay": 0.1}}]}
+             for name in ("one", "two", "three")]
+
+    start = time.monotonic()
+    execute_tasks(tasks, run_mode="async", settings={**settings, "service_concurrency": {"plugins": 1}})
+    serialized = time.monotonic() - start
+    WRITTEN.clear()
+    start = time.monotonic()
+    execute_tasks(tasks, run_mode="async", settings=settings)
+    concurrent = time.monotonic() - start
+
+    assert serialized >= 0.3
+    assert concurrent < serialized
+
+
+@pytest.mark.parametrize("cfg, service", [
+    ({"class": "writers.slack_writer.SlackWriter"}, "slack"),
+    ({"class": "fetchers.sheets_fetcher.SheetsFetcher"}, "sheets"),
+    ({"class": "tests.plugins.RecordWriter"}, "plugins"),
+    ({"class": "writers.slack_writer.SlackWriter", "service": "chat"}, "chat"),
+])
+def test_service_key(cfg, service):
+    assert service_key(cfg) == service
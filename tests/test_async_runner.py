@@ -0,0 +1,35 @@
+# tests/test_async_runner.py
+
+import pytest
+from core.runner import execute_tasks
+from tests.plugins import WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+def task(name, fetcher, writers):
+    return {"name": name, "fetcher": fetcher, "writers": writers}
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "parallel", "async"])
+def test_failing_stream_fails_only_its_task(settings, run_mode):
+    tasks = [
+        task("broken", {"class": "tests.plugins.PageFetcher", "params": {"fail_on": 2}},
+             [{"class": "tests.plugins.RecordWriter", "params": {"tag": "broken"}}]),
+        task("healthy", {"class": "tests.plugins.ListFetcher"},
+             [{"class": "tests.plugins.RecordWriter", "params": {"tag": "healthy"}}]),
+    ]
+
+    results = execute_tasks(tasks, run_mode=run_mode, settings=settings)
+
+    assert [r.status for r in results] == ["failed", "ok"]
+    assert "page 2 failed" in results[0].error
+    assert "broken" not in WRITTEN
+    assert WRITTEN["healthy"] == [[1, "a"], [2, "b"]]
@@ -0,0 +1,50 @@
+# tests/test_auth.py
+
+from datetime import timedelta
+import pytest
+
+pytest.importorskip("google_auth_oauthlib")
+
+from utility.auth import CredentialManager, REFRESH_MARGIN, _utcnow
+
+
+class UserCredentials:
+    """Looks like google.oauth2 user credentials to the manager; counts refreshes."""
+    def __init__(self, expires_in):
+        self.token = "token"
+        self.expiry = _utcnow() + timedelta(seconds=expires_in)
+        self.scopes = []
+        self.refreshed = 0
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.expiry = _utcnow() + timedelta(hours=1)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    (tmp_path / "slack.txt").write_text("xoxb-secret\n")
+    config = tmp_path / "auth_config.yaml"
+    config.write_text(f"credentials:\n  slack: {tmp_path / 'slack.txt'}\ntoken_store: {tmp_path / 'tokens'}\n")
+    return CredentialManager(str(config))
+
+
+def test_credentials_are_loaded_once(manager, tmp_path):
+    assert manager.get("slack") == "xoxb-secret"
+    (tmp_path / "slack.txt").write_text("changed")
+
+    assert manager.get("slack") == "xoxb-secret"
+    with pytest.raises(ValueError):
+        manager.get("missing")
+
+
+def test_only_expiring_credentials_are_refreshed(manager, monkeypatch):
+    monkeypatch.setattr(manager, "_read_token", lambda path, scopes: None)
+    monkeypatch.setattr(manager, "_write_token", lambda path, creds: None)
+    expiring, fresh = UserCredentials(REFRESH_MARGIN / 2), UserCredentials(REFRESH_MARGIN * 4)
+    manager._cache.update({"expiring": expiring, "fresh": fresh})
+
+    manager.refresh_expiring()
+
+    assert (expiring.refreshed, fresh.refreshed) == (1, 0)
+    assert (expiring.expiry - _utcnow()).total_seconds() > REFRESH_MARGIN
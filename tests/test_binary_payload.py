@@ -0,0 +1,75 @@
+# tests/test_binary_payload.py
+
+import gc
+import io
+import os
+import pickle
+import pytest
+from core.binary_payload import BinaryPayload, as_binary_payload
+
+CONTENT = bytes(range(256)) * 40
+
+
+def test_from_chunks_writes_a_temporary_file(tmp_path):
+    payload = BinaryPayload.from_chunks([CONTENT[:1000], b"", CONTENT[1000:]], name="a.bin", temp_dir=str(tmp_path))
+
+    assert not payload.in_memory
+    assert payload.size == len(CONTENT)
+    assert b"".join(payload.chunks(4096)) == CONTENT
+    assert [len(c) for c in payload.chunks(4096)] == [4096, 4096, 2048]
+    assert payload.read(10, 5) == CONTENT[10:15]
+    with payload.mmap() as view:
+        assert view[:256] == CONTENT[:256]
+
+
+def test_owned_file_is_removed_with_the_payload(tmp_path):
+    payload = BinaryPayload.from_chunks([CONTENT], temp_dir=str(tmp_path))
+    path = payload.path
+
+    del payload
+    gc.collect()
+
+    assert not os.path.exists(path)
+
+
+def test_local_file_is_used_in_place(tmp_path):
+    source = tmp_path / "source.bin"
+    source.write_bytes(CONTENT)
+    payload = BinaryPayload.from_path(str(source))
+
+    assert payload.path == str(source) and payload.name == "source.bin"
+    out = io.BytesIO()
+    assert payload.write_to(out, chunk_size=1000) == len(CONTENT)
+    assert out.getvalue() == CONTENT
+
+    del payload
+    gc.collect()
+    assert source.exists()
+
+
+def test_pickled_temporary_file_travels_by_value(tmp_path):
+    payload = BinaryPayload.from_chunks([CONTENT], name="a.bin", temp_dir=str(tmp_path))
+
+    copy = pickle.loads(pickle.dumps(payload))
+
+    assert copy.in_memory and copy.to_bytes() == CONTENT and copy.name == "a.bin"
+
+
+def test_pickled_local_file_travels_by_path(tmp_path):
+    source = tmp_path / "source.bin"
+    source.write_bytes(CONTENT)
+
+    copy = pickle.loads(pickle.dumps(BinaryPayload.from_path(str(source))))
+
+    assert copy.path == str(source)
+
+
+def test_as_binary_payload():
+    payload = BinaryPayload.from_bytes(b"abc")
+
+    assert as_binary_payload({"metadata": {}, "content": payload}) is payload
+    assert as_binary_payload(b"abc").to_bytes() == b"abc"
+    with pytest.raises(TypeError):
+        as_binary_payload({"metadata": {}})
+    with pytest.raises(ValueError):
+        BinaryPayload()
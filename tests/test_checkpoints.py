@@ -0,0 +1,69 @@
+# tests/test_checkpoints.py
+
+import pytest
+from core.checkpoints import CheckpointStore, checkpoint_key
+from core.runner import execute_tasks
+from tests.plugins import WATERMARKS, WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    WATERMARKS.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+def task(watermark, *writer_params):
+    return {
+        "name": "sync",
+        "fetcher": {"class": "tests.plugins.ListFetcher", "params": {"watermark": watermark}, "checkpoint": "sync"},
+        "writers": [{"class": "tests.plugins.RecordWriter", "params": params} for params in writer_params],
+    }
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "async"])
+def test_commits_only_when_every_writer_succeeds(settings, run_mode):
+    store = CheckpointStore.from_settings(settings)
+
+    results = execute_tasks([task("t1", {"tag": "a"}, {"tag": "b"})], run_mode=run_mode, settings=settings)
+    assert results[0].status == "ok"
+    assert store.get("sync") == "t1"
+
+    results = execute_tasks([task("t2", {"tag": "a"}, {"tag": "b", "fail": True})], run_mode=run_mode, settings=settings)
+    assert results[0].status == "failed"
+    assert store.get("sync") == "t1"
+
+    execute_tasks([task("t2", {"tag": "a"}, {"tag": "b"})], run_mode=run_mode, settings=settings)
+    assert store.get("sync") == "t2"
+    # Each run fetched from the last committed watermark, including the one after the failure.
+    assert WATERMARKS == [None, "t1", "t1"]
+
+
+def test_missing_watermark_leaves_checkpoint(settings):
+    store = CheckpointStore.from_settings(settings)
+    store.put("sync", "sync", "t1")
+
+    execute_tasks([task(None, {"tag": "a"})], settings=settings)
+
+    assert store.get("sync") == "t1"
+
+
+def test_checkpoint_key(settings):
+    fetcher = {"class": "tests.plugins.ListFetcher"}
+    assert checkpoint_key({"name": "sync", "fetcher": fetcher}) is None
+    assert checkpoint_key({"name": "sync", "fetcher": {**fetcher, "checkpoint": "named"}}) == "named"
+    key = checkpoint_key({"name": "sync", "fetcher": {**fetcher, "checkpoint": True}})
+    assert key != checkpoint_key({"name": "sync", "fetcher": {**fetcher, "params": {"rows": []}, "checkpoint": True}})
+
+
+def test_reset(settings):
+    store = CheckpointStore.from_settings(settings)
+    store.put("a", "task a", 1)
+    store.put("b", "task b", {"cursor": "x"})
+
+    assert store.reset("task a") == 1
+    assert store.get("a") is None
+    assert store.get("b") == {"cursor": "x"}
@@ -0,0 +1,75 @@
+# tests/test_concurrency.py
+
+import pytest
+from core.concurrency import AdaptiveLimit, concurrency_options
+from core.ratelimit import call_kind
+
+
+def saturated_call(limit, latency, kind=None, overloaded=False):
+    """One call made while every slot of the limit is in use."""
+    limit.in_flight = limit.current
+    limit.calls += 1
+    limit.release(latency, overloaded, kind)
+
+
+def test_grows_while_saturated_and_fast():
+    limit = AdaptiveLimit(initial=4, maximum=8)
+    for _ in range(50):
+        saturated_call(limit, 0.1)
+
+    assert limit.current == 8
+    assert limit.decreases == 0
+
+
+def test_does_not_grow_when_not_saturated():
+    limit = AdaptiveLimit(initial=4)
+    limit.acquire()
+    limit.release(0.1)
+
+    assert limit.limit == 4
+
+
+def test_backs_off_on_overload():
+    limit = AdaptiveLimit(initial=8, backoff=0.5)
+    saturated_call(limit, None, overloaded=True)
+
+    assert limit.current == 4
+    assert limit.decreases == 1
+
+
+def test_slow_uploads_do_not_count_as_congestion_next_to_fast_calls():
+    limit = AdaptiveLimit(initial=4, maximum=16)
+    for _ in range(100):
+        saturated_call(limit, 0.05, call_kind("GET", "https://www.googleapis.com/drive/v3/files/abc"))
+        saturated_call(limit, 3.0, call_kind("PUT", "https://www.googleapis.com/upload/drive/v3/files?uploadType=resumable"))
+
+    assert limit.decreases == 0
+    assert limit.current == 16
+
+
+def test_slow_calls_of_one_kind_shrink_the_limit():
+    limit = AdaptiveLimit(initial=8, latency_tolerance=2.0)
+    saturated_call(limit, 0.05, "GET call")
+    for _ in range(20):
+        saturated_call(limit, 1.0, "GET call")
+
+    assert limit.decreases >= 1
+    assert limit.current < 8
+
+
+@pytest.mark.parametrize("method, url, kind", [
+    ("GET", "https://www.googleapis.com/drive/v3/files/abc?fields=id", "GET call"),
+    ("GET", "https://www.googleapis.com/drive/v3/files/abc?alt=media", "GET download"),
+    ("put", "https://www.googleapis.com/upload/drive/v3/files?uploadType=resumable&upload_id=x", "PUT upload"),
+    ("POST", "https://content.dropboxapi.com/2/files/upload_session/append_v2", "POST upload"),
+    ("POST", "https://content.dropboxapi.com/2/files/download", "POST download"),
+])
+def test_call_kind(method, url, kind):
+    assert call_kind(method, url) == kind
+
+
+def test_concurrency_options():
+    assert concurrency_options(False) is None
+    assert concurrency_options(True) == {}
+    with pytest.raises(ValueError):
+        concurrency_options({"initial": 64, "max": 32})
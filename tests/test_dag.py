@@ -0,0 +1,80 @@
+# tests/test_dag.py
+
+import pytest
+from core.dag import build_waves, consumer_counts, task_id
+from core.runner import execute_tasks
+from tests.plugins import WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+def fetching(tid, **params):
+    return {"id": tid, "name": tid, "fetcher": {"class": "tests.plugins.ListFetcher", "params": params},
+            "writers": [{"class": "tests.plugins.RecordWriter", "params": {"tag": tid}}]}
+
+
+def reading(tid, inputs, **params):
+    return {"id": tid, "name": tid, "inputs": inputs,
+            "writers": [{"class": "tests.plugins.RecordWriter", "params": {"tag": tid, **params}}]}
+
+
+def test_waves_follow_dependencies():
+    tasks = [
+        reading("c", ["a", "b"]),
+        fetching("a"),
+        {**fetching("b"), "depends_on": ["a"]},
+        fetching("d"),
+    ]
+
+    waves = build_waves(tasks)
+
+    assert [[task_id(t) for t in wave] for wave in waves] == [["a", "d"], ["b"], ["c"]]
+    assert consumer_counts(tasks) == {"a": 1, "b": 1}
+
+
+@pytest.mark.parametrize("tasks, error", [
+    ([reading("a", ["b"]), reading("b", ["a"])], "cycle"),
+    ([reading("a", ["missing"])], "unknown"),
+    ([fetching("a"), {**fetching("b"), "inputs": ["a"]}], "both a fetcher and inputs"),
+    ([fetching("a"), fetching("a"), reading("b", ["a"])], "more than one task"),
+])
+def test_invalid_graphs(tasks, error):
+    with pytest.raises(ValueError, match=error):
+        build_waves(tasks)
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "parallel", "async"])
+def test_inputs_receive_upstream_output(settings, run_mode):
+    tasks = [
+        fetching("rows", rows=[[1, "a"], [2, "b"]]),
+        reading("copy_1", ["rows"]),
+        reading("copy_2", ["rows"]),
+    ]
+
+    results = execute_tasks(tasks, run_mode=run_mode, settings=settings)
+
+    assert [r.status for r in results] == ["ok", "ok", "ok"]
+    assert WRITTEN["copy_1"] == WRITTEN["copy_2"] == [[1, "a"], [2, "b"]]
+    assert all(r.output is None for r in results)
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "parallel", "async"])
+def test_failed_upstream_skips_dependents(settings, run_mode):
+    tasks = [
+        {**fetching("rows"), "writers": [{"class": "tests.plugins.RecordWriter", "params": {"tag": "rows", "fail": True}}]},
+        reading("copy", ["rows"]),
+        {**fetching("after"), "depends_on": ["copy"]},
+        fetching("independent"),
+    ]
+
+    results = execute_tasks(tasks, run_mode=run_mode, settings=settings)
+
+    assert [r.status for r in results] == ["failed", "skipped", "skipped", "ok"]
+    assert set(WRITTEN) == {"independent"}
@@ -0,0 +1,103 @@
+# tests/test_data_wrapper.py
+
+import pickle
+import threading
+import pytest
+from core.data_wrapper import DataWrapper, StreamingDataWrapper, as_data_wrapper, freeze, iter_batches
+from core.table import Table
+
+
+def pages():
+    yield [1, 2]
+    yield (3,)
+    yield DataWrapper([4])
+
+
+def test_stream_is_read_batch_by_batch_once():
+    closed = []
+    stream = StreamingDataWrapper(pages(), {"source": "test"}, on_close=lambda: closed.append(True))
+
+    assert list(stream.batches()) == [[1, 2], [3], [4]]
+    assert closed == [True]
+    with pytest.raises(RuntimeError, match="only be iterated once"):
+        list(stream.batches())
+
+
+def test_data_materializes_the_stream():
+    stream = as_data_wrapper(pages())
+
+    assert stream.streaming
+    assert stream.data == [1, 2, 3, 4]
+    assert list(stream.batches()) == [[1, 2, 3, 4]]
+    assert stream.materialize().data == [1, 2, 3, 4]
+
+
+def test_table_batches_concatenate():
+    stream = StreamingDataWrapper(iter([Table({"a": [1]}), Table({"a": [2, 3]})]))
+
+    assert stream.data.to_dict() == {"a": [1, 2, 3]}
+
+
+def test_records_and_record_batches():
+    assert list(StreamingDataWrapper(pages()).records()) == [1, 2, 3, 4]
+    assert list(StreamingDataWrapper(pages()).record_batches(3)) == [[1, 2, 3], [4]]
+    assert list(DataWrapper(Table({"a": [1, 2]})).records()) == [{"a": 1}, {"a": 2}]
+    assert list(iter_batches(DataWrapper([]))) == []
+
+
+def test_split_branches_see_every_batch():
+    closed = []
+    stream = StreamingDataWrapper(pages(), on_close=lambda: closed.append(True))
+    branches = stream.split(2)
+    results = [None, None]
+
+    def read(i):
+        results[i] = list(branches[i].batches())
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[[1, 2], [3], [4]]] * 2
+    assert closed == [True]
+    with pytest.raises(TypeError):
+        results[0][0].append(5)
+
+
+def test_closing_stops_the_producer():
+    produced = []
+
+    def endless():
+        page = 0
+        while True:
+            page += 1
+            produced.append(page)
+            yield [page]
+
+    stream = StreamingDataWrapper(endless())
+    batches = stream.batches()
+    next(batches)
+    stream.close()
+
+    with pytest.raises(StopIteration):
+        next(batches)
+    assert produced == [1]
+
+
+def test_streams_pickle_as_their_records():
+    copy = pickle.loads(pickle.dumps(StreamingDataWrapper(pages(), {"page": 3})))
+
+    assert type(copy) is DataWrapper
+    assert (copy.data, copy.metadata) == ([1, 2, 3, 4], {"page": 3})
+
+
+def test_read_only():
+    view = DataWrapper([{"a": [1]}], {"k": "v"}).read_only()
+
+    with pytest.raises(TypeError):
+        view.data[0]["a"].append(2)
+    with pytest.raises(AttributeError):
+        view.data = []
+    assert freeze(("x", [1])) == ("x", [1])
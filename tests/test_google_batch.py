@@ -0,0 +1,117 @@
+# tests/test_google_batch.py
+
+import pytest
+from core.data_wrapper import DataWrapper
+from core.journal import WriteJournal
+from core.retry import RetryPolicy
+from utility.google_batch import BatchError, batch_size, execute_batched
+
+FAST = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+
+
+class Response:
+    def __init__(self, status):
+        self.status_code = status
+
+
+class HTTPError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = Response(status)
+
+
+class Request:
+    def __init__(self, service, record):
+        self.service = service
+        self.record = record
+
+    def execute(self):
+        self.service.executed.append(self.record)
+        outcomes = self.service.outcomes.get(self.record["id"])
+        if outcomes:
+            raise outcomes.pop(0)
+        return {"written": self.record["id"]}
+
+
+class Batch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append([request.record["id"] for _, request in self.requests])
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except Exception as e:
+                self.callback(request_id, None, e)
+
+
+class Service:
+    """Stands in for a LazyService: batches run their calls in order; `outcomes` are errors to raise by record id."""
+    api = "tasks"
+    service_name = "tasks_cred"
+
+    def __init__(self, outcomes=None):
+        self.outcomes = {key: list(errors) for key, errors in (outcomes or {}).items()}
+        self.batches = []
+        self.executed = []
+
+    def new_batch_http_request(self, callback):
+        return Batch(self, callback)
+
+
+RECORDS = [{"id": i} for i in range(1, 6)]
+
+
+def test_records_are_sent_in_batches():
+    service = Service()
+
+    result = execute_batched(service, DataWrapper(RECORDS), lambda record: Request(service, record), size=2)
+
+    assert service.batches == [[1, 2], [3, 4]]  # the last record goes out on its own, unbatched
+    assert result.data == [{"written": i} for i in range(1, 6)]
+
+
+def test_only_transient_failures_are_resent():
+    service = Service({2: [HTTPError(503)], 3: [HTTPError(400)]})
+
+    with pytest.raises(BatchError) as raised:
+        execute_batched(service, DataWrapper(RECORDS), lambda record: Request(service, record), size=5, policy=FAST)
+
+    assert service.batches == [[1, 2, 3, 4, 5]]
+    assert [r["id"] for r in service.executed] == [1, 2, 3, 4, 5, 2]
+    assert [f.record["id"] for f in raised.value.failures] == [3]
+    assert len(raised.value.results) == 5
+
+
+def test_skipped_records():
+    service = Service()
+
+    result = execute_batched(service, DataWrapper(RECORDS), lambda r: Request(service, r) if r["id"] % 2 else None)
+
+    assert result.data == [{"written": 1}, {"written": 3}, {"written": 5}]
+
+
+def test_journaled_batches_settle_per_record(tmp_path):
+    journal = WriteJournal(str(tmp_path / "journal.sqlite"))
+    scope = journal.scope({"name": "sync"}, {"class": "writers.tasks_writer.TasksWriter", "journal": {"key": "id"}})
+    service = Service({2: [HTTPError(400)], 4: [HTTPError(403)]})
+
+    with pytest.raises(BatchError):
+        execute_batched(service, scope.wrap(DataWrapper(RECORDS)), lambda record: Request(service, record), size=3)
+
+    rerun = Service()
+    execute_batched(rerun, scope.wrap(DataWrapper(RECORDS)), lambda record: Request(rerun, record), size=3)
+    assert [r["id"] for r in rerun.executed] == [2, 4]
+
+
+def test_batch_size_is_capped():
+    assert batch_size("calendar") == 50
+    assert batch_size("calendar", 500) == 50
+    assert batch_size("calendar", 0) == 1
+    assert batch_size("unknown", 10) == 10
@@ -0,0 +1,52 @@
+# tests/test_google_service.py
+
+import pytest
+
+pytest.importorskip("googleapiclient")
+pytest.importorskip("google_auth_httplib2")
+
+from utility import google_service
+from utility.google_service import get_discovery_document
+
+URL = "https://example.googleapis.com/$discovery/rest?version={apiVersion}"
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    monkeypatch.setattr(google_service, "DISCOVERY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(google_service, "_documents", {})
+    calls = []
+
+    def download(api, version, discovery_url=None):
+        calls.append((api, version))
+        return '{"name": "%s", "version": "%s"}' % (api, version)
+    monkeypatch.setattr(google_service, "_download_document", download)
+    return calls
+
+
+def test_document_downloaded_once_then_read_from_disk(downloads, monkeypatch):
+    assert get_discovery_document("example", "v1", URL) == {"name": "example", "version": "v1"}
+    get_discovery_document("example", "v1", URL)
+    assert len(downloads) == 1
+
+    # A new process finds it in the on-disk cache.
+    monkeypatch.setattr(google_service, "_documents", {})
+    get_discovery_document("example", "v1", URL)
+    assert len(downloads) == 1
+
+
+def test_stale_document_is_downloaded_again(downloads, monkeypatch):
+    get_discovery_document("example", "v1", URL)
+    monkeypatch.setattr(google_service, "_documents", {})
+    monkeypatch.setattr(google_service, "DISCOVERY_CACHE_TTL", -1)
+
+    get_discovery_document("example", "v1", URL)
+
+    assert len(downloads) == 2
+
+
+def test_bundled_documents_need_no_download(downloads):
+    document = get_discovery_document("sheets", "v4")
+
+    assert document["name"] == "sheets"
+    assert downloads == []
@@ -0,0 +1,111 @@
+# tests/test_instance_pool.py
+
+import threading
+import time
+import pytest
+from core.instance_pool import InstancePool, instance_key
+from core.runner import execute_tasks
+from tests.plugins import CLOSED, CREATED, WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    CREATED.clear()
+    CLOSED.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+class Client:
+    def __init__(self, thread_safe=False):
+        self.thread_safe = thread_safe
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_one_instance_per_key_used_by_one_thread_at_a_time():
+    pool = InstancePool()
+    active, peak, seen = [0], [0], []
+    lock = threading.Lock()
+
+    def use():
+        with pool.lease("k", Client) as client:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            seen.append(client)
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=use) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.created == 1 and pool.leases == 4
+    assert len({id(client) for client in seen}) == 1
+    assert peak[0] == 1
+
+
+def test_factory_error_is_not_cached():
+    pool = InstancePool()
+
+    def broken():
+        raise RuntimeError("no credentials")
+
+    with pytest.raises(RuntimeError):
+        with pool.lease("k", broken):
+            pass
+    with pool.lease("k", Client) as client:
+        assert isinstance(client, Client)
+
+
+def test_close_disposes_instances():
+    pool = InstancePool()
+    with pool.lease("k", Client) as client:
+        pass
+
+    pool.close()
+
+    assert client.closed
+    with pool.lease("k", Client) as again:
+        assert again is not client
+
+
+def test_instance_key_is_class_and_params():
+    cfg = {"class": "tests.plugins.RecordWriter", "params": {"tag": "a"}}
+
+    assert instance_key(cfg) == instance_key({**cfg, "operation": "other", "timeout": 5})
+    assert instance_key(cfg) != instance_key({**cfg, "params": {"tag": "b"}})
+
+
+def writing_task(name, **writer):
+    return {"name": name, "fetcher": {"class": "tests.plugins.ListFetcher", "params": {"rows": [[name]]}},
+            "writers": [{"class": "tests.plugins.RecordWriter", "params": {"tag": "shared"}, **writer}]}
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "parallel", "async"])
+def test_writers_with_same_params_share_an_instance(settings, run_mode):
+    results = execute_tasks([writing_task("one"), writing_task("two")], run_mode=run_mode, settings=settings)
+
+    assert [r.status for r in results] == ["ok", "ok"]
+    assert CREATED == ["shared"]
+    assert CLOSED == ["shared"]
+
+
+@pytest.mark.parametrize("tasks, extra", [
+    ([writing_task("one"), writing_task("two", reuse=False)], {}),
+    ([writing_task("one"), writing_task("two")], {"reuse_clients": False}),
+])
+def test_reuse_turned_off(settings, tasks, extra):
+    execute_tasks(tasks, settings={**settings, **extra})
+
+    assert CREATED == ["shared", "shared"]
+    assert CLOSED == ["shared", "shared"]
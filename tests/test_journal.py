@@ -0,0 +1,99 @@
+# tests/test_journal.py
+
+import pytest
+from core.journal import WriteJournal, journal_options
+from core.runner import execute_tasks
+from tests.plugins import FAIL_AT, WRITTEN
+
+RECORDS = [{"id": i} for i in range(1, 8)]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return WriteJournal(str(tmp_path / "journal.sqlite"))
+
+
+def scope(journal, key="id"):
+    task = {"name": "sync"}
+    return journal.scope(task, {"class": "tests.plugins.RecordWriter", "journal": {"key": key}})
+
+
+def test_resume_after_partial_batch(journal):
+    first = scope(journal).record_batches(iter(RECORDS), 3)
+    batch = next(first)
+    assert [r["id"] for r in batch] == [1, 2, 3]
+    # The second call of the batch failed; the run dies before the next batch.
+    batch.settle([True, False, True])
+    first.close()
+
+    rerun = [r["id"] for batch in scope(journal).record_batches(iter(RECORDS), 3) for r in batch]
+
+    assert rerun == [2, 4, 5, 6, 7]
+
+
+def test_unsettled_batch_is_done_once_the_next_is_read(journal):
+    first = scope(journal).record_batches(iter(RECORDS), 3)
+    next(first)
+    next(first)  # the writer asked for more, so the first batch went through
+    first.close()
+
+    rerun = [r["id"] for batch in scope(journal).record_batches(iter(RECORDS), 3) for r in batch]
+
+    assert rerun == [4, 5, 6, 7]
+
+
+def test_resume_records_by_content(journal):
+    records = [{"a": 1}, {"a": 1}, {"a": 2}]
+    first = scope(journal, key=None).records(iter(records))
+    next(first)
+    next(first)  # the first {"a": 1} went through; the second is in flight
+    first.close()
+
+    assert list(scope(journal, key=None).records(iter(records))) == [{"a": 1}, {"a": 2}]
+
+
+def test_finish_forgets_records(journal):
+    run = scope(journal)
+    list(run.records(iter(RECORDS)))
+    run.finish()
+
+    assert len(list(scope(journal).records(iter(RECORDS)))) == len(RECORDS)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), (False, None), (True, {}), ({"key": "id"}, {"key": "id"}),
+])
+def test_journal_options(value, expected):
+    assert journal_options({"journal": value}) == expected
+
+
+def test_invalid_journal_option():
+    with pytest.raises(ValueError):
+        journal_options({"journal": {"field": "id"}})
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "async"])
+def test_rerun_writes_only_unfinished_records(tmp_path, run_mode):
+    WRITTEN.clear()
+    FAIL_AT.clear()
+    settings = {"checkpoint_path": str(tmp_path / "checkpoints.sqlite"), "journal_path": str(tmp_path / "journal.sqlite")}
+    rows = [[i, f"row {i}"] for i in range(1, 6)]
+    tasks = [{
+        "name": "sync",
+        "fetcher": {"class": "tests.plugins.ListFetcher", "params": {"rows": rows}},
+        "writers": [{"class": "tests.plugins.RecordByRecordWriter", "params": {"tag": "j"},
+                     "journal": {"key": 0}, "retry": False}],
+    }]
+
+    FAIL_AT["j"] = 4
+    assert execute_tasks(tasks, run_mode=run_mode, settings=settings)[0].status == "failed"
+    assert [r[0] for r in WRITTEN["j"]] == [1, 2, 3]
+
+    FAIL_AT.clear()
+    assert execute_tasks(tasks, run_mode=run_mode, settings=settings)[0].status == "ok"
+    assert [r[0] for r in WRITTEN["j"]] == [1, 2, 3, 4, 5]
+
+    # Once the writer succeeded its journal is dropped, so the next run writes everything.
+    WRITTEN.clear()
+    execute_tasks(tasks, run_mode=run_mode, settings=settings)
+    assert [r[0] for r in WRITTEN["j"]] == [1, 2, 3, 4, 5]
@@ -0,0 +1,87 @@
+# tests/test_pipelining.py
+
+import threading
+import time
+from core.data_wrapper import StreamingDataWrapper
+from core.pipelining import StreamPump
+
+
+class Source:
+    """Yields `pages` one-record batches, counting how many were produced; raises on page `fail_on`."""
+    def __init__(self, pages=10, fail_on=None):
+        self.pages = pages
+        self.fail_on = fail_on
+        self.produced = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        try:
+            for page in range(1, self.pages + 1):
+                if page == self.fail_on:
+                    raise RuntimeError(f"page {page} failed")
+                self.produced += 1
+                yield [page]
+        finally:
+            self.closed.set()
+
+
+def pump(source, consumers=1, depth=2):
+    return StreamPump(StreamingDataWrapper(iter(source)), consumers, depth)
+
+
+def read_all(streams):
+    """Read each stream on its own thread, as the writers do; returns (batches, error) per stream."""
+    results = [None] * len(streams)
+
+    def read(i):
+        received = []
+        try:
+            for batch in streams[i].batches():
+                received.append(batch)
+            results[i] = (received, None)
+        except Exception as e:
+            results[i] = (received, e)
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(len(streams))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_every_consumer_gets_every_batch():
+    results = read_all(pump(Source(5), consumers=2).streams())
+
+    assert results == [([[1], [2], [3], [4], [5]], None)] * 2
+
+
+def test_producer_waits_for_slow_consumer():
+    source = Source(20)
+    stream, = pump(source, depth=2).streams()
+    batches = stream.batches()
+    next(batches)
+    time.sleep(0.3)
+
+    # One batch read, `depth` queued and one waiting to be queued.
+    assert source.produced <= 4
+    stream.close()
+
+
+def test_fetch_error_reaches_consumers_after_earlier_batches():
+    results = read_all(pump(Source(5, fail_on=3), consumers=2).streams())
+
+    for received, error in results:
+        assert received == [[1], [2]]
+        assert str(error) == "page 3 failed"
+
+
+def test_closing_every_consumer_stops_the_fetch():
+    source = Source(1000)
+    streams = pump(source, consumers=2).streams()
+    for stream in streams:
+        next(stream.batches())
+        stream.close()
+
+    assert source.closed.wait(2)
+    assert source.produced < 1000
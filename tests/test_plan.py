@@ -0,0 +1,78 @@
+# tests/test_plan.py
+
+import re
+import sys
+import pytest
+import yaml
+import app
+import core.plan as plan
+from core.plan import PLAN_MODULES, compile_plan, load_plan, plan_key
+from core.runner import PipelineConfigError
+
+CONFIG = {
+    "pipeline": [{
+        "name": "copy",
+        "fetcher": {"class": "tests.plugins.ListFetcher"},
+        "writers": [{"class": "tests.plugins.RecordWriter"}],
+    }],
+}
+
+
+@pytest.mark.parametrize("module", list(PLAN_MODULES) + ["tests.plugins"])
+def test_plan_key_changes_with_module(monkeypatch, module):
+    before = plan_key(CONFIG)
+    stamp = plan._source_stamp
+    monkeypatch.setattr(plan, "_source_stamp", lambda m: ["edited"] if m == module else stamp(m))
+
+    assert plan_key(CONFIG) != before
+
+
+def test_cached_plan_recompiled_when_validation_changes(monkeypatch, tmp_path):
+    compiled = []
+    compile_plan = plan.compile_plan
+    monkeypatch.setattr(plan, "compile_plan", lambda config: compiled.append(1) or compile_plan(config))
+
+    load_plan(CONFIG, "config.yaml", str(tmp_path))
+    load_plan(CONFIG, "config.yaml", str(tmp_path))
+    assert len(compiled) == 1
+
+    stamp = plan._source_stamp
+    monkeypatch.setattr(plan, "_source_stamp", lambda m: ["edited"] if m == "core.retry" else stamp(m))
+    load_plan(CONFIG, "config.yaml", str(tmp_path))
+    assert len(compiled) == 2
+
+
+def fetching(tid, **extra):
+    return {"id": tid, "name": tid, "fetcher": {"class": "tests.plugins.ListFetcher"},
+            "writers": [{"class": "tests.plugins.RecordWriter"}], **extra}
+
+
+def reading(tid, inputs):
+    return {"id": tid, "name": tid, "inputs": inputs, "writers": [{"class": "tests.plugins.RecordWriter"}]}
+
+
+@pytest.mark.parametrize("pipeline, error", [
+    ([reading("a", ["b"]), reading("b", ["a"])], "Dependency cycle between tasks: a, b"),
+    ([reading("a", ["missing"])], "Task 'a' depends on unknown or disabled task 'missing'"),
+    ([fetching("a"), {**fetching("b", enabled=False)}, reading("c", ["b"])], "Task 'c' depends on unknown"),
+    ([fetching("a"), fetching("b", inputs=["a"])], "Task 'b' has both a fetcher and inputs"),
+    ([fetching("a"), fetching("a"), reading("b", ["a"])], "Task id 'a' is used by more than one task"),
+])
+def test_invalid_dependencies_are_config_errors(pipeline, error):
+    with pytest.raises(PipelineConfigError, match=re.escape(error)):
+        compile_plan({"pipeline": pipeline})
+
+
+def test_check_rejects_cyclic_config(tmp_path, monkeypatch, caplog):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({
+        "settings": {"plan_cache": False},
+        "pipeline": [reading("a", ["b"]), reading("b", ["a"])],
+    }))
+    monkeypatch.setattr(sys, "argv", ["app.py", "--check", "--config", str(path)])
+
+    with pytest.raises(SystemExit) as exited:
+        app.main()
+
+    assert exited.value.code == 1
+    assert "Dependency cycle between tasks: a, b" in caplog.text
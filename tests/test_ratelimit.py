@@ -0,0 +1,127 @@
+# tests/test_ratelimit.py
+
+import threading
+import pytest
+from core.ratelimit import MAX_RATE_LIMIT_RETRIES, RateLimits, TokenBucket, parse_rate, retry_after
+
+
+class Response:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Httplib2Response(dict):
+    """httplib2's response: a dict of lowercased headers with a `status`."""
+    def __init__(self, status, headers=None):
+        super().__init__(headers or {})
+        self.status = status
+
+
+@pytest.mark.parametrize("value, rate", [
+    (5, 5.0), ("5/s", 5.0), ("120/min", 2.0), ("3600 / hour", 1.0), ("100/100s", 1.0),
+])
+def test_parse_rate(value, rate):
+    assert parse_rate(value) == pytest.approx(rate)
+
+
+@pytest.mark.parametrize("value", [0, -1, True, "5", "5/fortnight", "0/s"])
+def test_invalid_rate(value):
+    with pytest.raises(ValueError):
+        parse_rate(value)
+
+
+def test_bucket_allows_burst_then_spaces_calls():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_pause_holds_back_every_caller():
+    bucket = TokenBucket(rate=10, burst=5)
+
+    bucket.pause(2)
+
+    assert bucket.reserve() == pytest.approx(2.1, abs=0.01)
+    assert bucket.rate_limited == 1
+
+
+def test_buckets_per_service_and_credential():
+    limits = RateLimits({"sheets": "60/min", "slack": {"rate": 1, "per_credential": False}})
+
+    assert limits.bucket("drive", "token") is None
+    assert limits.bucket("sheets", "a") is limits.bucket("sheets", "a")
+    assert limits.bucket("sheets", "a") is not limits.bucket("sheets", "b")
+    assert limits.bucket("slack", "a") is limits.bucket("slack", "b")
+    assert limits.bucket("sheets", "a").rate == pytest.approx(1.0)
+
+
+def test_worker_processes_share_the_rate():
+    limits = RateLimits({"sheets": 8})
+
+    assert RateLimits(*limits.worker_args(4)).bucket("sheets").rate == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("config", [["sheets"], {"sheets": {"rate": 1, "window": 5}}, {"sheets": {"burst": 5}}])
+def test_invalid_limits(config):
+    with pytest.raises(ValueError):
+        RateLimits(config)
+
+
+def test_retry_after():
+    assert retry_after(Response(429, {"Retry-After": "3"})) == 3.0
+    assert retry_after(Response(429), attempt=2) == 4.0
+    assert retry_after(Response(500)) is None
+    assert retry_after((Httplib2Response(429, {"retry-after": "1"}), b"")) == 1.0
+    assert retry_after((Httplib2Response(200), b"")) is None
+
+
+def test_call_backs_off_and_retries_429s():
+    limits = RateLimits({"sheets": {"rate": 1000, "burst": 1}})
+    responses = [Response(429, {"Retry-After": "0.01"}), Response(429, {"Retry-After": "0.01"}), Response(200)]
+    sent = list(responses)
+
+    result = limits.call("sheets", "token", sent.pop, 0)
+
+    assert result is responses[2]
+    assert responses[0].closed and responses[1].closed
+    assert limits.bucket("sheets", "token").rate_limited == 2
+
+
+def test_call_gives_up_after_max_retries():
+    limits = RateLimits()
+    calls = []
+
+    def limited():
+        calls.append(1)
+        return Response(429, {"Retry-After": "0"})
+
+    assert limits.call("sheets", "token", limited).status_code == 429
+    assert len(calls) == MAX_RATE_LIMIT_RETRIES + 1
+
+
+def test_concurrent_callers_share_a_bucket():
+    limits = RateLimits({"sheets": {"rate": 50, "burst": 1}})
+    waits = []
+    lock = threading.Lock()
+
+    def call():
+        wait = limits.bucket("sheets", "token").reserve()
+        with lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(round(w, 2) for w in waits) == [0.0, 0.02, 0.04, 0.06, 0.08]
@@ -0,0 +1,99 @@
+# tests/test_registry.py
+
+import importlib
+import sys
+import pytest
+import core.registry as registry_module
+from core.registry import PluginRegistry
+
+SOURCE = '''
+import some_missing_sdk
+from core.interfaces import Fetcher, Writer
+
+
+class BaseSheet(Fetcher):
+    def fetch_data(self, range_name, *, header=True):
+        """Read a range."""
+
+
+class SheetFetcher(BaseSheet):
+    """Reads sheets."""
+    def __init__(self, sheet_id, service_name=None):
+        super().__init__()
+
+    def get_operations(self):
+        return {"fetch_data": self.fetch_data, "rows": self.fetch_data}
+
+    @property
+    def client(self):
+        return None
+
+
+class SheetWriter(Writer):
+    def write_data(self, data):
+        pass
+
+    def get_operations(self):
+        return build_operations(self)
+
+
+class Helper:
+    pass
+'''
+
+
+@pytest.fixture
+def plugins(tmp_path, monkeypatch):
+    package = tmp_path / "sample_plugins"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "sheets.py").write_text(SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    yield package
+    for module in [m for m in sys.modules if m.split(".")[0] == "sample_plugins"]:
+        del sys.modules[module]
+
+
+def new_registry(tmp_path):
+    return PluginRegistry(packages=("sample_plugins",), manifest_path=str(tmp_path / "plugins.json"))
+
+
+def test_plugins_read_from_source_without_import(plugins, tmp_path):
+    registry = new_registry(tmp_path)
+
+    assert sorted(p.name for p in registry.plugins()) == ["BaseSheet", "SheetFetcher", "SheetWriter"]
+    fetcher = registry.get("sample_plugins.sheets.SheetFetcher")
+    assert fetcher.kind == "fetcher" and fetcher.doc == "Reads sheets."
+    assert fetcher.operation("rows").method == "fetch_data"
+    assert fetcher.operation("rows").doc == "Read a range."
+    assert fetcher.operation("rows").params == (("range_name", "positional", False), ("header", "keyword_only", True))
+    assert [p[0] for p in fetcher.init.params] == ["sheet_id", "service_name"]
+    assert "client" not in fetcher.methods
+    # Operations built at runtime can't be read from the source.
+    assert registry.get("sample_plugins.sheets.SheetWriter").operations is None
+    with pytest.raises(ImportError):
+        registry.load_class("sample_plugins.sheets.SheetFetcher")
+
+
+def test_manifest_reused_until_module_changes(plugins, tmp_path, monkeypatch):
+    new_registry(tmp_path).scan()
+    parsed = []
+    scan_source = registry_module.scan_source
+    monkeypatch.setattr(registry_module, "scan_source", lambda source, module: parsed.append(module) or scan_source(source, module))
+
+    assert len(new_registry(tmp_path).plugins()) == 3
+    assert parsed == []
+
+    (plugins / "sheets.py").write_text(SOURCE + "\n\nclass Extra(Writer):\n    def write_data(self, data):\n        pass\n")
+    assert len(new_registry(tmp_path).plugins()) == 4
+    assert parsed == ["sample_plugins.sheets"]
+
+
+def test_classes_outside_plugin_packages(tmp_path):
+    registry = PluginRegistry(packages=(), manifest_path=str(tmp_path / "plugins.json"))
+
+    info = registry.get("tests.plugins.RecordWriter")
+    assert info.kind == "writer"
+    assert registry.get("tests.plugins.Missing") is None
+    assert registry.load_class("tests.plugins.RecordWriter") is registry.load_class("tests.plugins.RecordWriter")
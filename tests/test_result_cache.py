@@ -0,0 +1,56 @@
+# tests/test_result_cache.py
+
+import pytest
+from core.binary_payload import BinaryPayload
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.result_cache import ResultCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite"), max_size=1024 * 1024)
+    yield cache
+    cache.close()
+
+
+def test_put_and_get(cache):
+    assert cache.put("k", DataWrapper([[1, "a"]], {"source": "test"}), validator="v1")
+
+    entry = cache.get("k")
+    assert entry.data.data == [[1, "a"]]
+    assert entry.data.metadata == {"source": "test"}
+    assert entry.validator == "v1"
+    assert entry.fresh(60)
+
+
+def test_file_contents_are_not_cached(cache, tmp_path, monkeypatch):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"%PDF" * 1000)
+    monkeypatch.setattr(BinaryPayload, "to_bytes", lambda self: pytest.fail("file read into memory"))
+    download = DataWrapper({"metadata": {"name": "report.pdf"}, "content": BinaryPayload.from_path(str(path))})
+    listing = DataWrapper([{"metadata": {"name": "report.pdf"}, "content": BinaryPayload.from_path(str(path))}])
+
+    assert not cache.put("download", download)
+    assert not cache.put("listing", listing)
+    assert cache.get("download") is None
+
+
+def test_streams_are_not_cached(cache):
+    assert not cache.put("stream", StreamingDataWrapper(iter([[[1]]])))
+    assert cache.get("stream") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite"), max_size=4000)
+    rows = [[i, str(i) * 3] for i in range(300)]  # ~1.6 KB compressed, so two fit
+    try:
+        assert cache.put("a", DataWrapper(rows))
+        assert cache.put("b", DataWrapper(rows[::-1]))
+        cache.get("a")
+        assert cache.put("c", DataWrapper([row[::-1] for row in rows]))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+    finally:
+        cache.close()
@@ -0,0 +1,138 @@
+# tests/test_retry.py
+
+import pytest
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.ratelimit import MAX_RATE_LIMIT_RETRIES, RateLimits
+from core.retry import RetryBudget, RetryPolicy, is_rate_limited, is_transient, retry_policy
+from core.runner import retry_budget
+
+
+class Response:
+    def __init__(self, status, headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.response = Response(status, headers)
+
+
+FAST = RetryPolicy(attempts=3, base_delay=0, max_delay=0, budget=10)
+
+
+def flaky(errors, result="ok"):
+    """A callable raising `errors` one per call, then returning `result`; counts its calls."""
+    errors = list(errors)
+
+    def call():
+        call.count += 1
+        if errors:
+            raise errors.pop(0)
+        return result
+    call.count = 0
+    return call
+
+
+def test_classification():
+    assert is_transient(HTTPError(503))
+    assert is_transient(ConnectionError("reset"))
+    assert not is_transient(HTTPError(400))
+    assert not is_transient(ValueError("bad"))
+    assert is_rate_limited(HTTPError(429))
+    assert not is_rate_limited(HTTPError(503))
+
+
+def test_transient_errors_are_retried():
+    call = flaky([HTTPError(503), TimeoutError("slow")])
+
+    assert RetryBudget(FAST).call(call, "test") == "ok"
+    assert call.count == 3
+
+
+def test_permanent_errors_are_not_retried():
+    call = flaky([HTTPError(400)])
+
+    with pytest.raises(HTTPError):
+        RetryBudget(FAST).call(call, "test")
+    assert call.count == 1
+
+
+def test_budget_is_shared_across_calls():
+    budget = RetryBudget(RetryPolicy(attempts=5, base_delay=0, max_delay=0, budget=2))
+
+    with pytest.raises(HTTPError):
+        budget.call(flaky([HTTPError(503)] * 5), "first")
+    assert budget.used == 2
+    with pytest.raises(HTTPError):
+        budget.call(flaky([HTTPError(503)]), "second")
+
+
+def test_rate_limits_are_retried_per_call_only():
+    call = flaky([HTTPError(429, {"Retry-After": "0"})] * 50)
+    limits = RateLimits()
+
+    with pytest.raises(HTTPError):
+        RetryBudget(FAST).call(lambda: limits.call("svc", "cred", call), "test")
+    assert call.count == MAX_RATE_LIMIT_RETRIES + 1
+
+
+def test_rate_limit_then_success():
+    call = flaky([HTTPError(429, {"Retry-After": "0"})] * 2)
+
+    assert RateLimits().call("svc", "cred", call) == "ok"
+    assert call.count == 3
+
+
+def test_retry_policy_settings():
+    assert retry_policy({}, {}) == RetryPolicy()
+    assert retry_policy({"retry": False}, {}) is None
+    assert retry_policy({"retry": {"attempts": 5}}, {"retry": {"budget": 1}}) == RetryPolicy(attempts=5, budget=1)
+    with pytest.raises(ValueError):
+        retry_policy({"retry": {"attempts": 0}}, {})
+
+
+def test_backoff_is_jittered_and_honors_retry_after():
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+
+    delays = [policy.delay(attempt) for attempt in range(6) for _ in range(20)]
+    assert all(0 <= d <= 4 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy.delay(0, HTTPError(429, {"Retry-After": "30"})) == 30
+
+
+def test_wrapped_errors_are_judged_by_their_cause():
+    try:
+        try:
+            raise HTTPError(503)
+        except HTTPError as e:
+            raise RuntimeError("write failed") from e
+    except RuntimeError as e:
+        assert is_transient(e)
+
+
+@pytest.mark.parametrize("cfg, data, retried", [
+    ({}, None, True),
+    ({"retry": False}, None, False),
+    ({}, DataWrapper([1]), False),
+    ({"class": "tests.plugins.RecordByRecordWriter", "journal": True}, DataWrapper([1]), True),
+    ({"class": "tests.plugins.RecordByRecordWriter", "operation": "clear", "journal": True}, DataWrapper([1]), False),
+    ({"class": "tests.plugins.RecordWriter", "journal": True}, DataWrapper([1]), False),
+    ({"class": "tests.plugins.AsyncRecordWriter", "journal": {"key": 0}}, DataWrapper([1]), False),
+    ({"retry": True}, DataWrapper([1]), True),
+    ({"retry": True}, StreamingDataWrapper(iter([[1]])), False),
+])
+def test_which_operations_are_retried(cfg, data, retried):
+    budget = RetryBudget(FAST)
+
+    assert (retry_budget(budget, cfg, data) is budget) == retried
+
+
+def test_journaled_bulk_writes_are_sent_once():
+    cfg = {"class": "tests.plugins.RecordWriter", "journal": True}
+    write = flaky([HTTPError(503)])
+
+    with pytest.raises(HTTPError):
+        retry_budget(RetryBudget(FAST), cfg, DataWrapper([1])).call(write, "write")
+    assert write.count == 1
@@ -0,0 +1,77 @@
+# tests/test_runner.py
+
+import time
+from types import SimpleNamespace
+import pytest
+import core.runner
+from core.runner import execute_tasks, log_summary
+from tests.plugins import WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+def slow_task(name, delay=0.2, fail=False):
+    return {"name": name, "fetcher": {"class": "tests.plugins.ListFetcher", "params": {"rows": [[name]]}},
+            "writers": [{"class": "tests.plugins.RecordWriter", "params": {"tag": name, "delay": delay, "fail": fail}}]}
+
+
+def test_parallel_tasks_overlap(settings):
+    tasks = [slow_task(f"t{i}") for i in range(4)]
+
+    start = time.monotonic()
+    results = execute_tasks(tasks, run_mode="parallel", settings=settings)
+
+    assert time.monotonic() - start < 0.6
+    assert [r.name for r in results] == ["t0", "t1", "t2", "t3"]
+    assert [WRITTEN[f"t{i}"] for i in range(4)] == [[[f"t{i}"]] for i in range(4)]
+
+
+def test_max_workers_bounds_the_pool(settings):
+    start = time.monotonic()
+    execute_tasks([slow_task(f"t{i}", 0.1) for i in range(4)], run_mode="parallel", max_workers=2, settings=settings)
+
+    assert time.monotonic() - start >= 0.2
+
+
+def test_process_backend(settings):
+    tasks = [slow_task("ok", 0), slow_task("broken", 0, fail=True)]
+
+    results = execute_tasks(tasks, run_mode="parallel", backend="process", settings=settings)
+
+    assert [(r.name, r.status) for r in results] == [("ok", "ok"), ("broken", "failed")]
+    assert results[1].writers[0].error == "writer broken failed"
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "parallel", "async"])
+def test_failure_does_not_stop_other_tasks(settings, run_mode):
+    results = execute_tasks([slow_task("broken", 0, fail=True), slow_task("ok", 0)], run_mode=run_mode, settings=settings)
+
+    assert [r.status for r in results] == ["failed", "ok"]
+    assert WRITTEN["ok"] == [["ok"]]
+    log_summary(results)
+
+
+@pytest.mark.parametrize("platform, peak", [("linux", "2.0 MB"), ("darwin", "2.0 KB")])
+def test_peak_memory_units(monkeypatch, caplog, platform, peak):
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    resource = SimpleNamespace(RUSAGE_SELF=0, getrusage=lambda who: SimpleNamespace(ru_maxrss=2048))
+    monkeypatch.setattr(core.runner, "resource", resource)
+    monkeypatch.setattr(core.runner.sys, "platform", platform)
+
+    with caplog.at_level("INFO", logger="pipeline"):
+        log_summary([])
+
+    assert f"Peak process memory: {peak}." in caplog.text
+
+
+@pytest.mark.parametrize("kwargs", [{"run_mode": "threads"}, {"run_mode": "parallel", "backend": "fibers"}])
+def test_invalid_run_mode(settings, kwargs):
+    with pytest.raises(ValueError):
+        execute_tasks([], settings=settings, **kwargs)
@@ -0,0 +1,146 @@
+# tests/test_singleflight.py
+
+import asyncio
+import threading
+import time
+import pytest
+from core.runner import execute_tasks
+from core.singleflight import SingleFlight, duplicate_fetch_keys, fetch_key
+from tests.plugins import WATERMARKS, WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    WATERMARKS.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "rows"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert {result for result, _ in results} == {"rows"}
+    assert flight.shared == 3
+
+
+def test_failed_call_is_not_shared_later():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", fail)
+    assert flight.do("k", lambda: "rows") == ("rows", False)
+
+
+def test_interrupted_call_fails_its_waiters():
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def interrupted():
+        started.set()
+        while not flight.shared:  # until the waiter joined
+            time.sleep(0.001)
+        raise KeyboardInterrupt
+
+    def wait():
+        try:
+            flight.do("k", lambda: "rows")
+        except RuntimeError as e:
+            errors.append(e)
+
+    def lead():
+        with pytest.raises(KeyboardInterrupt):
+            flight.do("k", interrupted)
+
+    leader, waiter = threading.Thread(target=lead), threading.Thread(target=wait)
+    leader.start()
+    started.wait()
+    waiter.start()
+    leader.join()
+    waiter.join()
+
+    assert len(errors) == 1
+    assert flight.do("k", lambda: "rows") == ("rows", False)
+
+
+def test_cancelled_async_call_is_not_shared_later():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "stale"
+
+    async def rows():
+        return "rows"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async("k", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await flight.do_async("k", rows)
+
+    assert asyncio.run(main()) == ("rows", False)
+
+
+def test_untracked_keys_go_straight_through():
+    flight = SingleFlight(keys=["a"])
+    flight.do("b", lambda: 1)
+
+    assert flight.do("b", lambda: 2) == (2, False)
+
+
+def test_fetch_key_ignores_other_settings():
+    cfg = {"class": "tests.plugins.ListFetcher", "params": {"rows": [[1]]}}
+
+    assert fetch_key(cfg) == fetch_key({**cfg, "dedupe": True, "operation": "fetch_data"})
+    assert fetch_key(cfg) != fetch_key({**cfg, "params": {"rows": [[2]]}})
+    assert duplicate_fetch_keys([{"fetcher": cfg}, {"fetcher": cfg}, {"fetcher": {**cfg, "dedupe": False}}]) == {fetch_key(cfg)}
+
+
+def copy_task(name, **fetcher):
+    return {"name": name, "fetcher": {"class": "tests.plugins.ListFetcher", **fetcher},
+            "writers": [{"class": "tests.plugins.RecordWriter", "params": {"tag": name}}]}
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "parallel", "async"])
+def test_identical_fetches_run_once(settings, run_mode):
+    tasks = [copy_task("one"), copy_task("two"), copy_task("three", params={"rows": [[3, "c"]]})]
+
+    results = execute_tasks(tasks, run_mode=run_mode, settings=settings)
+
+    assert [r.status for r in results] == ["ok", "ok", "ok"]
+    assert len(WATERMARKS) == 2
+    assert WRITTEN["one"] == WRITTEN["two"] == [[1, "a"], [2, "b"]]
+
+
+@pytest.mark.parametrize("tasks, extra", [
+    ([copy_task("one"), copy_task("two", dedupe=False)], {}),
+    ([copy_task("one"), copy_task("two")], {"dedupe_fetches": False}),
+])
+def test_dedupe_turned_off(settings, tasks, extra):
+    execute_tasks(tasks, settings={**settings, **extra})
+
+    assert len(WATERMARKS) == 2
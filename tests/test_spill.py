@@ -0,0 +1,73 @@
+# tests/test_spill.py
+
+import pytest
+from core.data_wrapper import DataWrapper
+from core.runner import execute_tasks
+from core.spill import MemoryBudget, MemoryUsage, SpilledDataWrapper
+from tests.plugins import WRITTEN
+
+ROWS = [[i, f"row {i}"] for i in range(2500)]
+
+
+@pytest.fixture
+def budget(tmp_path):
+    budget = MemoryBudget(run_budget=1024, spill_dir=str(tmp_path / "spill"))
+    yield budget
+    budget.close()
+
+
+@pytest.fixture
+def no_full_load(monkeypatch):
+    """Fail the test if a spilled payload is loaded into memory as a whole."""
+    def load(self):
+        raise AssertionError("spilled payload was loaded whole")
+    monkeypatch.setattr(SpilledDataWrapper, "_load", load)
+
+
+def test_spilled_records_are_read_back_in_batches(budget, no_full_load):
+    data = budget.admit(DataWrapper(ROWS), MemoryUsage())
+
+    assert isinstance(data, SpilledDataWrapper)
+    assert [len(batch) for batch in data.batches()] == [1000, 1000, 500]
+    view = data.materialize().read_only()
+    assert not view.streaming
+    assert list(view.records()) == ROWS
+    assert [len(batch) for batch in view.record_batches(1000)] == [1000, 1000, 500]
+
+
+def test_spilled_view_loads_data_on_request(budget):
+    view = budget.admit(DataWrapper(ROWS), MemoryUsage()).materialize()
+
+    assert view.data == ROWS
+
+
+def test_unbatchable_payload_stays_in_memory(budget):
+    data = DataWrapper(b"x" * 4096)
+
+    assert budget.admit(data, MemoryUsage()) is data
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "async"])
+def test_non_streaming_writers_read_spilled_records_lazily(tmp_path, no_full_load, run_mode):
+    WRITTEN.clear()
+    task = {
+        "name": "spilled",
+        "fetcher": {"class": "tests.plugins.ListFetcher", "params": {"rows": ROWS}},
+        "writers": [
+            {"class": "tests.plugins.RecordWriter", "params": {"tag": "records"}},
+            {"class": "tests.plugins.StreamWriter", "params": {"tag": "stream"}},
+        ],
+    }
+    settings = {
+        "memory_budget": 1024,
+        "spill_dir": str(tmp_path / "spill"),
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+    [result] = execute_tasks([task], run_mode=run_mode, settings=settings)
+
+    assert result.status == "ok", result.error
+    assert result.memory.spilled > 0
+    assert WRITTEN["records"] == ROWS
+    assert WRITTEN["stream"]["records"] == ROWS
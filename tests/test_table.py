@@ -0,0 +1,82 @@
+# tests/test_table.py
+
+import pytest
+import core.table as table_module
+from core.table import Table
+
+ROWS = [
+    ["name", "team", "score"],
+    ["ann", "red", 3],
+    ["bob", "blue", 5],
+    ["cat", "red", None],
+    ["dan", "blue", 1],
+]
+
+
+@pytest.fixture(params=["numpy", "builtins"])
+def backend(request, monkeypatch):
+    """Run each test with NumPy (when installed) and with the pure-Python columns."""
+    if request.param == "numpy" and table_module.np is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "builtins":
+        monkeypatch.setattr(table_module, "np", None)
+    return request.param
+
+
+def test_rows_round_trip(backend):
+    table = Table.from_rows(ROWS, header=True)
+
+    assert table.schema == {"name": "str", "team": "str", "score": "int"}
+    assert table.to_rows(header=True) == ROWS
+
+
+def test_ragged_rows_are_padded(backend):
+    table = Table.from_rows([["a", "b"], [1], [2, 3]], header=True)
+
+    assert table.to_records() == [{"a": 1, "b": None}, {"a": 2, "b": 3}]
+
+
+def test_filter_skips_missing_values(backend):
+    table = Table.from_rows(ROWS, header=True)
+
+    assert table.filter(score=(">", 2)).to_dict()["name"] == ["ann", "bob"]
+    assert table.filter(score=("is_null", None)).to_dict()["name"] == ["cat"]
+    assert table.filter(team="red", score=("<", 10)).to_dict()["name"] == ["ann"]
+
+
+def test_sort_puts_missing_last(backend):
+    table = Table.from_rows(ROWS, header=True)
+
+    assert table.sort("score", descending=True).to_dict()["name"] == ["bob", "ann", "dan", "cat"]
+    assert table.sort(["team", "name"]).to_dict()["name"] == ["bob", "dan", "ann", "cat"]
+
+
+def test_group_by(backend):
+    table = Table.from_rows(ROWS, header=True)
+
+    grouped = table.group_by("team", {"rows": "count", "total": ("score", "sum"), "best": ("score", "max")})
+
+    assert grouped.to_records() == [
+        {"team": "red", "rows": 2, "total": 3, "best": 3},
+        {"team": "blue", "rows": 2, "total": 6, "best": 5},
+    ]
+
+
+def test_distinct_and_concat(backend):
+    first = Table.from_records([{"id": 1, "x": "a"}, {"id": 1, "x": "a"}])
+    second = Table.from_records([{"id": 2, "y": True}])
+
+    combined = Table.concat([first.distinct(), second])
+
+    assert combined.to_records() == [{"id": 1, "x": "a", "y": None}, {"id": 2, "x": None, "y": True}]
+
+
+def test_invalid_operations(backend):
+    table = Table.from_rows(ROWS, header=True)
+
+    with pytest.raises(ValueError):
+        table.filter(score=("~", 1))
+    with pytest.raises(ValueError):
+        table.group_by("team", {"x": ("score", "median")})
+    with pytest.raises(ValueError):
+        Table({"a": [1, 2], "b": [1]})
@@ -0,0 +1,102 @@
+# tests/test_transfer.py
+
+import threading
+import time
+import pytest
+from core.binary_payload import StreamingBinaryPayload
+from core.data_wrapper import StreamingDataWrapper
+from core.transfer import TransferError, transfer_files
+
+
+class Download:
+    """Chunks of a fake download; counts how many were handed out and whether it was closed."""
+    def __init__(self, chunks=100, size=10, fail_on=None):
+        self.chunks = chunks
+        self.size = size
+        self.fail_on = fail_on
+        self.sent = 0
+        self.closed = threading.Event()
+
+    def __call__(self):
+        try:
+            for i in range(self.chunks):
+                if i == self.fail_on:
+                    raise OSError("connection reset")
+                self.sent += 1
+                yield bytes([i % 256]) * self.size
+        finally:
+            self.closed.set()
+
+
+def test_streamed_chunks_are_regrouped():
+    payload = StreamingBinaryPayload(Download(chunks=5, size=10), name="a.bin")
+
+    chunks = list(payload.chunks(chunk_size=15))
+
+    assert [len(c) for c in chunks] == [15, 15, 15, 5]
+    with pytest.raises(RuntimeError, match="only be read once"):
+        payload.to_bytes()
+
+
+def test_download_runs_only_a_few_chunks_ahead():
+    download = Download(chunks=100)
+    payload = StreamingBinaryPayload(download, buffer_chunks=2)
+    chunks = payload.chunks(chunk_size=10)
+    next(chunks)
+    time.sleep(0.3)
+
+    assert download.sent <= 5
+    chunks.close()
+    assert download.closed.wait(2)
+    assert download.sent < 100
+
+
+def test_download_error_reaches_the_consumer():
+    payload = StreamingBinaryPayload(Download(chunks=10, fail_on=3))
+
+    with pytest.raises(OSError, match="connection reset"):
+        payload.to_bytes()
+
+
+def test_to_file_allows_rereading(tmp_path):
+    payload = StreamingBinaryPayload(Download(chunks=3), name="a.bin").to_file(str(tmp_path))
+
+    assert payload.size == 30
+    assert payload.to_bytes() == payload.to_bytes()
+
+
+def files(count):
+    return StreamingDataWrapper(iter([[{"metadata": {"name": f"f{i}"}, "content": None} for i in range(start, start + 2)]
+                                      for start in range(0, count, 2)]))
+
+
+def test_transfers_stay_within_max_parallel():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def upload(item):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return {"name": item["metadata"]["name"]}
+
+    result = transfer_files(files(10), upload, max_parallel=3)
+
+    assert sorted(r["name"] for r in result.data) == sorted(f"f{i}" for i in range(10))
+    assert 1 < peak[0] <= 3
+
+
+def test_failed_files_are_reported_after_the_others():
+    def upload(item):
+        if item["metadata"]["name"] in ("f1", "f4"):
+            raise OSError("quota exceeded")
+        return {"name": item["metadata"]["name"]}
+
+    with pytest.raises(TransferError) as raised:
+        transfer_files(files(6), upload, max_parallel=2)
+
+    assert len(raised.value.results) == 4
+    assert [f["error"] for f in raised.value.failures] == ["quota exceeded", "quota exceeded"]
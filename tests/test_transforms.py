@@ -0,0 +1,45 @@
+# tests/test_transforms.py
+
+import pytest
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.transforms import TransformError, TransformChain, apply_transforms
+
+
+def transformed(data, *specs):
+    return apply_transforms({"name": "test", "transforms": list(specs)}, data)
+
+
+def test_dedup_across_batches():
+    stream = StreamingDataWrapper(iter([
+        [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+        [{"id": 1, "name": "a again"}, {"id": 3, "name": "c"}],
+    ]))
+
+    result = transformed(stream, {"dedup": ["id"]})
+
+    assert [r["id"] for r in result.records()] == [1, 2, 3]
+
+
+def test_dedup_with_unhashable_cells():
+    records = [
+        {"id": "rec1", "fields": {"Name": "a", "Tags": ["x", "y"]}},
+        {"id": "rec2", "fields": {"Tags": ["x", "y"], "Name": "a"}},
+        {"id": "rec3", "fields": {"Name": "b", "Tags": []}},
+    ]
+
+    result = transformed(DataWrapper(records), {"dedup": ["fields"]})
+
+    assert [r["id"] for r in result.records()] == ["rec1", "rec3"]
+
+
+def test_filter_select_limit():
+    rows = [["name", "amount"], ["a", 5], ["b", 0], ["c", 7], ["d", 9]]
+
+    result = transformed(DataWrapper(rows), {"filter": [["amount", ">", 0]]}, {"select": ["name"]}, {"limit": 2})
+
+    assert result.data == [["name"], ["a"], ["c"]]
+
+
+def test_invalid_spec():
+    with pytest.raises(TransformError):
+        TransformChain([{"limit": -1}])
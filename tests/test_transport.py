@@ -0,0 +1,42 @@
+# tests/test_transport.py
+
+import pytest
+from core.plan import PipelineConfigError, compile_plan
+from core.runner import RunContext, execute_tasks
+from core.transport import (DEFAULT_HTTP_TIMEOUT, DEFAULT_IDLE_TIMEOUT, configure_transport,
+                            current_transport_options, transport_options)
+
+
+@pytest.fixture(autouse=True)
+def restore_transport():
+    yield
+    configure_transport()
+
+
+def test_defaults():
+    assert transport_options() == {"timeout": DEFAULT_HTTP_TIMEOUT, "idle_timeout": DEFAULT_IDLE_TIMEOUT}
+    assert transport_options({"timeout": 5}) == {"timeout": 5, "idle_timeout": DEFAULT_IDLE_TIMEOUT}
+
+
+@pytest.mark.parametrize("value", [5, {"retries": 3}, {"timeout": 0}, {"timeout": "5"}, {"idle_timeout": True}])
+def test_invalid_options(value):
+    with pytest.raises(ValueError):
+        transport_options(value)
+
+
+def test_run_applies_settings_and_hands_them_to_workers(tmp_path):
+    settings = {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+        "google_http": {"timeout": 5, "idle_timeout": 30},
+    }
+
+    execute_tasks([], settings=settings)
+
+    assert current_transport_options() == {"timeout": 5, "idle_timeout": 30}
+    assert RunContext().worker_args()[-1] == {"timeout": 5, "idle_timeout": 30}
+
+
+def test_invalid_setting_fails_validation():
+    with pytest.raises(PipelineConfigError, match="google_http"):
+        compile_plan({"settings": {"google_http": {"timeout": -1}}, "pipeline": []})
@@ -0,0 +1,55 @@
+# tests/test_writers.py
+
+import time
+import pytest
+from core.runner import execute_tasks
+from tests.plugins import WRITTEN
+
+
+@pytest.fixture
+def settings(tmp_path):
+    WRITTEN.clear()
+    return {
+        "checkpoint_path": str(tmp_path / "checkpoints.sqlite"),
+        "journal_path": str(tmp_path / "journal.sqlite"),
+    }
+
+
+def writer(tag, delay=0, **cfg):
+    return {"class": "tests.plugins.RecordWriter", "params": {"tag": tag, "delay": delay}, **cfg}
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "async"])
+def test_single_writer_timeout(settings, run_mode):
+    task = {"name": "slow", "fetcher": {"class": "tests.plugins.ListFetcher"}, "writers": [writer("slow", delay=1)]}
+
+    start = time.monotonic()
+    [result] = execute_tasks([task], run_mode=run_mode, settings={**settings, "writer_timeout": 0.2})
+
+    assert time.monotonic() - start < 0.9
+    assert result.status == "failed"
+    assert [w.status for w in result.writers] == ["timeout"]
+
+
+@pytest.mark.parametrize("run_mode", ["serial", "async"])
+def test_sequential_writer_timeout(settings, run_mode):
+    task = {
+        "name": "sequential",
+        "concurrent_writers": False,
+        "fetcher": {"class": "tests.plugins.ListFetcher"},
+        "writers": [writer("slow", delay=1, timeout=0.2), writer("fast")],
+    }
+
+    [result] = execute_tasks([task], run_mode=run_mode, settings=settings)
+
+    assert [w.status for w in result.writers] == ["timeout", "ok"]
+    assert WRITTEN["fast"] == [[1, "a"], [2, "b"]]
+
+
+def test_writer_within_timeout(settings):
+    task = {"name": "quick", "fetcher": {"class": "tests.plugins.ListFetcher"}, "writers": [writer("quick")]}
+
+    [result] = execute_tasks([task], settings={**settings, "writer_timeout": 5})
+
+    assert result.status == "ok"
+    assert WRITTEN["quick"] == [[1, "a"], [2, "b"]]
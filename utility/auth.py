@@ -45,53 +45,265 @@
 #     return creds
 
 
+
 import yaml
 import json
+import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 
-def get_credentials(service_name, config_file="config/auth_config.yaml"):
-    # Load YAML config
-    with open(config_file, "r") as f:
-        config = yaml.safe_load(f)
-
-    credentials_map = config.get("credentials", {})
-    scopes_map = config.get("scopes", {})
-    bindings_map = config.get("bindings", {})
-
-    if service_name not in credentials_map:
-        raise ValueError(f"Credential '{service_name}' not found in config")
-
-    cred_path = credentials_map[service_name]
-
-    # 🔁 Case 2: Token-based auth (e.g., Airtable, Dropbox, Slack)
-    # Assume token is stored as plain text in the file
-    if cred_path.endswith(".txt"):
-        # treat as plain text token:
-        with open(cred_path, "r") as f:
-            token = f.read().strip()
-        return token
-
-    # 🔁 Case 1: OAuth/Service account (Google APIs)
-    if service_name in bindings_map:
-        scope_key = bindings_map[service_name].get("scope")
-        if not scope_key or scope_key not in scopes_map:
-            raise ValueError(f"Scope '{scope_key}' for '{service_name}' not found in config")
-
-        scopes = scopes_map[scope_key]
-        if not isinstance(scopes, list):
-            scopes = [scopes]
-
-        # Try loading JSON to determine if it's a Google credential
+try:
+    import fcntl
+except ImportError:  # Windows: token store writes are still atomic, but not serialized across processes
+    fcntl = None
+
+TOKEN_STORE_DIR = os.path.join(".cache", "tokens")
+REFRESH_MARGIN = 300   # refresh access tokens this many seconds before they expire
+REFRESH_INTERVAL = 60  # seconds between background expiry checks
+
+
+def _utcnow():
+    # google-auth keeps `expiry` as a naive UTC datetime
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _refreshable(creds) -> bool:
+    return hasattr(creds, "refresh") and hasattr(creds, "expiry")
+
+
+def _expires_within(creds, seconds) -> bool:
+    if not creds.token or creds.expiry is None:
+        return not creds.token
+    return (creds.expiry - _utcnow()).total_seconds() <= seconds
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on `path`, shared with other processes using the same token store."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
         try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class CredentialManager:
+    """
+    Load and cache credentials for the aliases defined in an auth config.
+
+    The auth config is parsed once, and each alias is resolved once per
+    process: plain-text tokens are read, service accounts are loaded, and
+    OAuth client credentials go through the consent flow only when the token
+    store has no usable token for them. OAuth tokens are persisted under
+    `token_store` (auth config key, default `.cache/tokens/`), so later runs
+    and worker processes reuse them.
+
+    Google credentials are refreshed by a background thread shortly before
+    they expire. Refreshes of OAuth tokens are serialized across processes
+    with a file lock and written back to the token store.
+    """
+    def __init__(self, config_file: str = "config/auth_config.yaml"):
+        self.config_file = config_file
+        self._config = None
+        self._cache = {}
+        self._reset_locks()
+
+    def _reset_locks(self):
+        self._lock = threading.Lock()
+        self._alias_locks = {}
+        self._refresher = None
+
+    def config(self) -> dict:
+        """The parsed auth config (read from disk on first use only)."""
+        with self._lock:
+            if self._config is None:
+                with open(self.config_file, "r") as f:
+                    self._config = yaml.safe_load(f) or {}
+            return self._config
+
+    def _alias_lock(self, service_name) -> threading.Lock:
+        with self._lock:
+            return self._alias_locks.setdefault(service_name, threading.Lock())
+
+    def get(self, service_name):
+        """
+        Return the credentials for `service_name`, loading them on first use.
+
+        Returns:
+            str | google.auth.credentials.Credentials: A token for `.txt` credential
+            files, otherwise Google credentials.
+        """
+        creds = self._cache.get(service_name)
+        if creds is None:
+            with self._alias_lock(service_name):
+                creds = self._cache.get(service_name)
+                if creds is None:
+                    creds = self._cache[service_name] = self._load(service_name)
+        if self._refresher is None and _refreshable(creds):
+            self._start_refresher()
+        return creds
+
+    def _load(self, service_name):
+        config = self.config()
+        credentials_map = config.get("credentials", {})
+        scopes_map = config.get("scopes", {})
+        bindings_map = config.get("bindings", {})
+
+        if service_name not in credentials_map:
+            raise ValueError(f"Credential '{service_name}' not found in config")
+
+        cred_path = credentials_map[service_name]
+
+        # 🔁 Case 2: Token-based auth (e.g., Airtable, Dropbox, Slack)
+        # Assume token is stored as plain text in the file
+        if cred_path.endswith(".txt"):
             with open(cred_path, "r") as f:
-                info = json.load(f)
+                return f.read().strip()
+
+        # 🔁 Case 1: OAuth/Service account (Google APIs)
+        if service_name in bindings_map:
+            scope_key = bindings_map[service_name].get("scope")
+            if not scope_key or scope_key not in scopes_map:
+                raise ValueError(f"Scope '{scope_key}' for '{service_name}' not found in config")
+
+            scopes = scopes_map[scope_key]
+            if not isinstance(scopes, list):
+                scopes = [scopes]
+
+            # Try loading JSON to determine if it's a Google credential
+            try:
+                with open(cred_path, "r") as f:
+                    info = json.load(f)
+            except json.JSONDecodeError:
+                raise ValueError(f"Expected JSON format for '{service_name}' credentials but got plain text.")
             if info.get("type") == "service_account":
-                return ServiceAccountCredentials.from_service_account_file(cred_path, scopes=scopes)
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(cred_path, scopes=scopes)
-                return flow.run_local_server(port=0)
-        except json.JSONDecodeError:
-            raise ValueError(f"Expected JSON format for '{service_name}' credentials but got plain text.")
+                return ServiceAccountCredentials.from_service_account_info(info, scopes=scopes)
+            return self._load_user_credentials(service_name, cred_path, scopes)
+
+    def token_path(self, service_name: str) -> str:
+        store = self.config().get("token_store", TOKEN_STORE_DIR)
+        return os.path.join(store, f"{service_name}.json")
+
+    def _read_token(self, path, scopes):
+        from google.oauth2.credentials import Credentials
+
+        if not os.path.exists(path):
+            return None
+        return Credentials.from_authorized_user_file(path, scopes)
+
+    def _write_token(self, path, creds):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(creds.to_json())
+        os.replace(tmp_path, path)
+
+    def _load_user_credentials(self, service_name, cred_path, scopes):
+        from google.auth.exceptions import RefreshError
+        from google.auth.transport.requests import Request
+
+        path = self.token_path(service_name)
+        with _file_lock(path):
+            creds = self._read_token(path, scopes)
+            if creds and creds.valid and not _expires_within(creds, REFRESH_MARGIN):
+                return creds
+            if creds and creds.refresh_token:
+                try:
+                    creds.refresh(Request())
+                    self._write_token(path, creds)
+                    return creds
+                except RefreshError as e:
+                    logging.getLogger("pipeline").warning(f"Stored token for '{service_name}' was rejected: {e}")
+
+            flow = InstalledAppFlow.from_client_secrets_file(cred_path, scopes=scopes)
+            creds = flow.run_local_server(port=0)
+            self._write_token(path, creds)
+            return creds
+
+    def refresh(self, service_name: str) -> None:
+        """Refresh the cached credentials of `service_name` in place."""
+        from google.auth.transport.requests import Request
+
+        creds = self._cache.get(service_name)
+        if not _refreshable(creds):
+            return
+        with self._alias_lock(service_name):
+            if isinstance(creds, ServiceAccountCredentials):
+                creds.refresh(Request())
+                return
+
+            path = self.token_path(service_name)
+            with _file_lock(path):
+                # Another process may already have refreshed and stored a newer token.
+                stored = self._read_token(path, creds.scopes)
+                if stored and stored.valid and not _expires_within(stored, REFRESH_MARGIN):
+                    creds.token, creds.expiry = stored.token, stored.expiry
+                    return
+                creds.refresh(Request())
+                self._write_token(path, creds)
+
+    def refresh_expiring(self, margin: int = REFRESH_MARGIN) -> None:
+        """Refresh every cached Google credential that expires within `margin` seconds."""
+        for service_name, creds in list(self._cache.items()):
+            if not _refreshable(creds) or not _expires_within(creds, margin):
+                continue
+            try:
+                self.refresh(service_name)
+            except Exception as e:
+                logging.getLogger("pipeline").warning(f"Background refresh of '{service_name}' failed: {e}")
+
+    def _start_refresher(self):
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="credential-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(REFRESH_INTERVAL)
+            self.refresh_expiring()
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def credential_manager(config_file: str = "config/auth_config.yaml") -> CredentialManager:
+    """The process-wide CredentialManager for `config_file`."""
+    key = os.path.abspath(config_file)
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = CredentialManager(config_file)
+        return _managers[key]
+
+
+def _after_fork():
+    # Locks may have been held by other threads at fork time and the refresher
+    # thread does not survive the fork; the child starts fresh ones.
+    global _managers_lock
+    _managers_lock = threading.Lock()
+    for manager in _managers.values():
+        manager._reset_locks()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_credentials(service_name, config_file="config/auth_config.yaml"):
+    """
+    Return the credentials for `service_name` from the auth config.
 
+    Cached per process; see CredentialManager.
+    """
+    return credential_manager(config_file).get(service_name)
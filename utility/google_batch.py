@@ -0,0 +1,144 @@
+# utility/google_batch.py
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from core.data_wrapper import DataWrapper
+from core.ratelimit import rate_limits
+from core.retry import RetryPolicy, is_transient
+
+# Calls sent in one batch request, per API. Google accepts up to 1000 but
+# counts each call against the quota, and some APIs reject large batches.
+MAX_BATCH_SIZE = {
+    "calendar": 50,
+    "classroom": 50,
+    "tasks": 50,
+    "keep": 50,
+    "chat": 50,
+}
+DEFAULT_MAX_BATCH_SIZE = 50
+
+
+@dataclass
+class BatchResult:
+    """The outcome of one record's call in a batch: the API's response, or the error it failed with."""
+    record: Any
+    response: Any = None
+    error: Optional[Exception] = None
+
+
+class BatchError(RuntimeError):
+    """Raised after a batched write in which some records failed."""
+    def __init__(self, message: str, results: List[BatchResult], failures: List[BatchResult]):
+        super().__init__(message)
+        self.results = results
+        self.failures = failures
+
+
+def batch_size(api: str, requested: int = None) -> int:
+    """Calls per batch request for an API: `requested`, capped at the API's maximum."""
+    maximum = MAX_BATCH_SIZE.get(api, DEFAULT_MAX_BATCH_SIZE)
+    return maximum if requested is None else max(1, min(requested, maximum))
+
+
+def _execute(service, requests: Dict[int, Any]) -> Dict[int, tuple]:
+    """Send the requests (by record index) as one batch; returns (response, error) by index."""
+    if len(requests) == 1:
+        # No point wrapping a lone call in a multipart request.
+        (index, request), = requests.items()
+        try:
+            return {index: (request.execute(), None)}
+        except Exception as e:
+            return {index: (None, e)}
+
+    outcomes = {}
+
+    def callback(request_id, response, exception):
+        outcomes[int(request_id)] = (response, exception)
+
+    batch = service.new_batch_http_request(callback=callback)
+    for index, request in requests.items():
+        batch.add(request, request_id=str(index))
+    # The batch request takes one token from the API's rate limit; its other calls count too.
+    bucket = rate_limits().bucket(service.api, service.service_name)
+    if bucket is not None:
+        bucket.acquire(len(requests) - 1)
+    try:
+        batch.execute()
+    except Exception as e:
+        # The batch request itself failed, so none of its calls got an answer.
+        return {index: outcomes.get(index, (None, e)) for index in requests}
+    return outcomes
+
+
+def execute_batched(service, data: DataWrapper, build: Callable[[Any], Any], size: int = None,
+                    policy: RetryPolicy = None) -> DataWrapper:
+    """
+    Make one API call per record, sending the calls in batch requests.
+
+    Records are grouped up to the API's batch size (see MAX_BATCH_SIZE).
+    The calls of one batch may run in any order; pass size=1 where order matters.
+    The response or error of each call is matched back to its record, and
+    only the calls that failed with a transient error (see core.retry) are
+    sent again, with backoff, in a smaller batch. Under a write journal,
+    the records of a batch that went through are journaled as done and the
+    failed ones stay pending.
+
+    Args:
+        service (LazyService): The Google service the requests belong to.
+        data (DataWrapper): The records to write.
+        build (callable): Returns the (unexecuted) HttpRequest for a record, or None to skip it.
+        size (int, optional): Calls per batch request; defaults to the API's maximum.
+        policy (RetryPolicy, optional): Attempts and backoff for failed calls.
+
+    Returns:
+        DataWrapper: The responses of the calls, in record order.
+
+    Raises:
+        BatchError: If any call failed, once the other batches are done.
+    """
+    logger = logging.getLogger("pipeline")
+    policy = policy or RetryPolicy()
+    size = batch_size(service.api, size)
+    results, failures = [], []
+
+    for group in data.record_batches(size):
+        outcomes: Dict[int, tuple] = {}
+        requests = {index: request for index, request in ((i, build(record)) for i, record in enumerate(group))
+                    if request is not None}
+        attempt = 0
+        while requests:
+            outcomes.update(_execute(service, requests))
+            retry = [index for index in requests if outcomes[index][1] is not None and is_transient(outcomes[index][1])]
+            if not retry or attempt + 1 >= policy.attempts:
+                break
+            delay = policy.delay(attempt, outcomes[retry[0]][1])
+            logger.warning(f"{len(retry)} of {len(requests)} batched {service.api} call(s) failed with a transient error, "
+                           f"retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+            # Built again: a request's headers and body may be consumed by sending it.
+            requests = {index: build(group[index]) for index in retry}
+
+        ok = []
+        for index, record in enumerate(group):
+            if index not in outcomes:
+                ok.append(True)
+                continue
+            response, error = outcomes[index]
+            result = BatchResult(record, response, error)
+            results.append(result)
+            if error is not None:
+                logger.error(f"Batched {service.api} call for {record!r} failed: {error}")
+                failures.append(result)
+            ok.append(error is None)
+        settle = getattr(group, "settle", None)
+        if settle is not None:
+            settle(ok)
+
+    logger.info(f"Batched {len(results)} {service.api} call(s), {len(failures)} failed")
+    if failures:
+        raise BatchError(f"{len(failures)} of {len(results)} batched {service.api} call(s) failed: "
+                         + "; ".join(str(f.error) for f in failures[:5]), results, failures)
+    return DataWrapper(data=[r.response for r in results])
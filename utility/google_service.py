@@ -0,0 +1,238 @@
+# utility/google_service.py
+
+import json
+import os
+import threading
+import time
+from googleapiclient.discovery import build_from_document, DISCOVERY_URI, V2_DISCOVERY_URI
+from googleapiclient.http import build_http
+from google_auth_httplib2 import AuthorizedHttp
+from utility.auth import get_credentials
+from core.ratelimit import DEFAULT_RETRY_AFTER, call_kind, rate_limits, retry_after
+from core.transport import current_transport_options
+
+DISCOVERY_CACHE_DIR = os.path.join(".cache", "discovery")
+DISCOVERY_CACHE_TTL = 24 * 60 * 60  # seconds a downloaded discovery document stays fresh
+
+_documents = {}
+_documents_lock = threading.Lock()
+# Resource objects (and their httplib2 transport) are not thread-safe, so each thread gets its own.
+_resources = threading.local()
+_connections = threading.local()
+
+
+def _cache_path(api, version):
+    return os.path.join(DISCOVERY_CACHE_DIR, f"{api}.{version}.json")
+
+
+def _read_cached_document(api, version):
+    path = _cache_path(api, version)
+    try:
+        if time.time() - os.path.getmtime(path) > DISCOVERY_CACHE_TTL:
+            return None
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_cached_document(api, version, content):
+    os.makedirs(DISCOVERY_CACHE_DIR, exist_ok=True)
+    path = _cache_path(api, version)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _download_document(api, version, discovery_url=None):
+    import httplib2
+
+    http = httplib2.Http(timeout=30)
+    urls = [discovery_url] if discovery_url else [DISCOVERY_URI, V2_DISCOVERY_URI]
+    for url in urls:
+        resp, content = http.request(url.format(api=api, apiVersion=version))
+        if resp.status < 400:
+            return content.decode("utf-8") if isinstance(content, bytes) else content
+    raise ValueError(f"Could not download the discovery document for {api} {version}")
+
+
+def get_discovery_document(api: str, version: str, discovery_url: str = None) -> dict:
+    """
+    Return the parsed discovery document of a Google API.
+
+    Looked up in memory, then in the static documents bundled with
+    google-api-python-client, then in the on-disk cache, and only then
+    downloaded (and written to the on-disk cache). Each document is parsed
+    once per process.
+
+    Args:
+        api (str): API name, e.g. "sheets".
+        version (str): API version, e.g. "v4".
+        discovery_url (str, optional): Discovery endpoint for APIs without a bundled document.
+    """
+    key = (api, version, discovery_url)
+    with _documents_lock:
+        if key in _documents:
+            return _documents[key]
+
+    content = None
+    if discovery_url is None:
+        from googleapiclient.discovery_cache import get_static_doc
+        content = get_static_doc(api, version)
+    if content is None:
+        content = _read_cached_document(api, version)
+    if content is None:
+        content = _download_document(api, version, discovery_url)
+        _write_cached_document(api, version, content)
+
+    document = json.loads(content)
+    with _documents_lock:
+        return _documents.setdefault(key, document)
+
+
+# Google answers most quota overruns with 403 and one of these reasons rather than 429.
+RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded", b"RESOURCE_EXHAUSTED")
+
+
+def _google_retry_after(outcome, attempt):
+    """core.ratelimit.retry_after for the (response, content) pairs httplib2 returns."""
+    if not isinstance(outcome, tuple):
+        return retry_after(outcome, attempt)
+    resp, content = outcome
+    if resp.status == 403 and isinstance(content, bytes) and any(reason in content for reason in RATE_LIMIT_REASONS):
+        try:
+            return max(0.0, float(resp.get("retry-after")))
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER * 2 ** attempt
+    return retry_after(resp, attempt)
+
+
+class _ThreadConnections:
+    """The httplib2.Http of one thread and when it last sent a request."""
+    def __init__(self, options):
+        self.options = options
+        self.http = build_http()
+        self.http.timeout = options["timeout"]
+        self.last_used = time.monotonic()
+
+
+def _thread_http():
+    options = current_transport_options()
+    state = getattr(_connections, "state", None)
+    if state is None or state.options != options:
+        if state is not None:
+            state.http.close()
+        state = _connections.state = _ThreadConnections(options)
+    elif time.monotonic() - state.last_used > options["idle_timeout"]:
+        # The server has likely closed them; reconnect rather than fail on a dead socket.
+        state.http.close()
+    return state
+
+
+class SharedHttp:
+    """
+    Thread-safe httplib2-style transport shared by every Google service.
+
+    Each thread sends its requests over its own httplib2.Http, so the
+    keep-alive connections a thread opened (one per API host) are reused by
+    every service and credential it calls, across tasks, instead of each
+    service object doing its own TLS handshakes. Timeouts come from
+    `settings.google_http` (see core.transport).
+    """
+    def request(self, *args, **kwargs):
+        state = _thread_http()
+        try:
+            return state.http.request(*args, **kwargs)
+        finally:
+            state.last_used = time.monotonic()
+
+    def close(self):
+        """Close the calling thread's connections."""
+        state = getattr(_connections, "state", None)
+        if state is not None:
+            state.http.close()
+
+    def __getattr__(self, name):
+        return getattr(_thread_http().http, name)
+
+
+shared_http = SharedHttp()
+
+
+class RateLimitedHttp:
+    """
+    httplib2-style transport that sends every request of a Google service through core.ratelimit.
+
+    Requests take a token from the bucket of the API (e.g. "sheets") and
+    credential alias, and are retried after the server's Retry-After when
+    Google answers that a quota is exceeded.
+    """
+    def __init__(self, http, api: str, service_name: str):
+        self.http = http
+        self.api = api
+        self.service_name = service_name
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        return rate_limits().call(self.api, self.service_name, self.http.request, uri, method, body, headers,
+                                  *args, classify=_google_retry_after, kind=call_kind(method, uri), **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+def build_service(api: str, version: str, service_name: str, discovery_url: str = None):
+    """
+    Build (or reuse) a googleapiclient Resource for the calling thread.
+
+    Resources are memoized per thread and per (api, version, credential alias),
+    so repeated initialize() calls don't re-read credentials or re-process the
+    discovery document. Their requests go through the API's rate limit (see RateLimitedHttp)
+    over the calling thread's shared connections (see SharedHttp).
+    """
+    memo = getattr(_resources, "memo", None)
+    if memo is None:
+        memo = _resources.memo = {}
+
+    key = (api, version, service_name, discovery_url)
+    if key not in memo:
+        document = get_discovery_document(api, version, discovery_url)
+        creds = get_credentials(service_name)
+        http = RateLimitedHttp(AuthorizedHttp(creds, http=shared_http), api, service_name)
+        memo[key] = build_from_document(document, http=http)
+    return memo[key]
+
+
+class LazyService:
+    """
+    Stand-in for a googleapiclient Resource that builds it on first use.
+
+    Creating one costs nothing: credentials and the discovery document are
+    only loaded when an API method is first accessed, and each thread that
+    uses the service gets its own Resource.
+    """
+    def __init__(self, api: str, version: str, service_name: str, discovery_url: str = None):
+        self.api = api
+        self.version = version
+        self.service_name = service_name
+        self.discovery_url = discovery_url
+
+    def resource(self):
+        return build_service(self.api, self.version, self.service_name, self.discovery_url)
+
+    def __getattr__(self, name):
+        return getattr(self.resource(), name)
+
+    def __repr__(self):
+        return f"<LazyService {self.api} {self.version} ({self.service_name})>"
+
+
+def google_service(api: str, version: str, service_name: str, discovery_url: str = None) -> LazyService:
+    """
+    Shared factory for the Google fetchers and writers.
+
+    Use in initialize() instead of `build(...)`:
+
+        self.service = google_service("sheets", "v4", self.service_name)
+    """
+    return LazyService(api, version, service_name, discovery_url)
@@ -1,12 +1,14 @@
 from pyairtable import Api
 from utility.auth import get_credentials
 from core.interfaces import Writer
-from core.data_wrapper import DataWrapper
+from core.ratelimit import mount
+from core.data_wrapper import DataWrapper, iter_batches
 
 class AirtableWriter(Writer):
     """
     Writer for Airtable: create, update, delete records.
     """
+    streaming = True  # every operation consumes streamed batches as they arrive
 
     def __init__(self, base_id: str, table_name: str, service_name: str = "airtable_cred"):
         self.base_id = base_id
@@ -18,6 +20,7 @@ class AirtableWriter(Writer):
         print("///////////////////////////")
         api_key = get_credentials(self.service_name)
         api = Api(api_key)
+        mount(api.session, "airtable", self.base_id)  # Airtable limits requests per base
         print("api&&&&&&&&&&&&&&&&&&&&&&", api, api_key)
         self.table = api.base(self.base_id).table(self.table_name)
         print("self.table******************", self.table)
@@ -28,7 +31,7 @@ class AirtableWriter(Writer):
         Expects data.data = list of field-dicts:
             [{'fields': {...}}, ...]
         """
-        created = self.table.batch_create(data.data)
+        created = [r for batch in iter_batches(data) for r in self.table.batch_create(batch)]
         return DataWrapper(data=created)
 
     def update_records(self, data: DataWrapper) -> DataWrapper:
@@ -37,7 +40,7 @@ class AirtableWriter(Writer):
         Expects data.data = list like:
             [{'id': 'recXXX', 'fields': {...}}, ...]
         """
-        updated = self.table.batch_update(data.data)
+        updated = [r for batch in iter_batches(data) for r in self.table.batch_update(batch)]
         return DataWrapper(data=updated)
 
     def delete_records(self, data: DataWrapper) -> DataWrapper:
@@ -46,7 +49,7 @@ class AirtableWriter(Writer):
         Expects data.data = list of record IDs:
             ['recXXX', ...]
         """
-        result = self.table.batch_delete(data.data)
+        result = [r for batch in iter_batches(data) for r in self.table.batch_delete(batch)]
         return DataWrapper(data=result)
 
     def get_operations(self):
@@ -1,5 +1,5 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_batch import execute_batched
+from utility.google_service import google_service
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
 
@@ -10,6 +10,8 @@ class GoogleCalendarWriter(Writer):
     Supports creating, updating, deleting events, and clearing all events in a calendar.
     """
 
+    journaled_operations = ("write_data", "delete_event")  # these call the API once per record
+
     def __init__(self, calendar_id: str = "primary", service_name="calendar_cred"):
         """
         Initialize the GoogleCalendarWriter.
@@ -26,8 +28,7 @@ class GoogleCalendarWriter(Writer):
         """
         Initialize the Calendar API service using credentials.
         """
-        creds = get_credentials(self.service_name)
-        self.service = build("calendar", "v3", credentials=creds)
+        self.service = google_service("calendar", "v3", self.service_name)
 
     def write_data(self, data: DataWrapper):
         """
@@ -36,12 +37,11 @@ class GoogleCalendarWriter(Writer):
         Args:
             data (DataWrapper): Contains a list of event dictionaries to be created.
         """
-        for event in data.data:
-            self.service.events().insert(
-                calendarId=self.calendar_id,
-                body=event,
-                sendUpdates='all'
-            ).execute()
+        execute_batched(self.service, data, lambda event: self.service.events().insert(
+            calendarId=self.calendar_id,
+            body=event,
+            sendUpdates='all'
+        ))
 
     def update_event(self, data: DataWrapper, event_id: str, event):
         """
@@ -67,13 +67,10 @@ class GoogleCalendarWriter(Writer):
         Args:
             data (DataWrapper): Contains a list of event dictionaries, each including an 'id' field.
         """
-        for event in data.data:
-            event_id = event.get("id")
-            if event_id:
-                self.service.events().delete(
-                    calendarId=self.calendar_id,
-                    eventId=event_id
-                ).execute()
+        execute_batched(self.service, data, lambda event: self.service.events().delete(
+            calendarId=self.calendar_id,
+            eventId=event["id"]
+        ) if event.get("id") else None)
 
     # def clear_all_events(self, confirm: bool = False):
     #     """
@@ -1,5 +1,5 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_batch import execute_batched
+from utility.google_service import google_service
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
 
@@ -8,6 +8,8 @@ class GoogleChatWriter(Writer):
     A writer class to send messages to Google Chat spaces.
     """
 
+    journaled_operations = ("write_data",)  # these call the API once per record
+
     def __init__(self, space_id: str = "", service_name: str = "chat_cred"):
         """
         Initialize the writer.
@@ -24,21 +26,21 @@ class GoogleChatWriter(Writer):
         """
         Initialize the Chat API service.
         """
-        creds = get_credentials(self.service_name)
-        self.service = build("chat", "v1", credentials=creds)
+        self.service = google_service("chat", "v1", self.service_name)
 
-    def write_data(self, data: DataWrapper):
+    def write_data(self, data: DataWrapper, ordered: bool = True):
         """
         Send message(s) to the specified Chat space.
 
         Args:
             data (DataWrapper): Contains list of message dicts.
+            ordered (bool): Post the messages one by one, in order. If False they are
+                sent in batches, which is faster but may post them out of order.
         """
-        for message in data.data:
-            self.service.spaces().messages().create(
-                parent=f"spaces/{self.space_id}",
-                body=message
-            ).execute()
+        execute_batched(self.service, data, lambda message: self.service.spaces().messages().create(
+            parent=f"spaces/{self.space_id}",
+            body=message
+        ), size=1 if ordered else None)
 
     def get_operations(self):
         return {
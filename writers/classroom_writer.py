@@ -1,5 +1,5 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_batch import execute_batched
+from utility.google_service import google_service
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
 
@@ -9,29 +9,29 @@ class GoogleClassroomWriter(Writer):
     Supports creating courses and course work.
     """
 
+    journaled_operations = ("write_data", "create_course_work")  # these call the API once per record
+
     def __init__(self, service_name="classroom_cred"):
         self.service_name = service_name
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build("classroom", "v1", credentials=creds)
+        self.service = google_service("classroom", "v1", self.service_name)
 
     def write_data(self, data: DataWrapper):
         """
         Create one or more courses.
         """
-        for course in data.data:
-            self.service.courses().create(body=course).execute()
+        execute_batched(self.service, data, lambda course: self.service.courses().create(body=course))
 
     def create_course_work(self, data: DataWrapper, course_id: str):
         """
         Create coursework in a specific course.
         """
         print(">>>>>>>>data.data>>>>>>>>", data.data)
-        for cw in data.data:
-            if course_id == cw["id"]:
-                self.service.courses().courseWork().create(courseId=course_id, body=cw).execute()
+        execute_batched(self.service, data, lambda cw: self.service.courses().courseWork().create(
+            courseId=course_id, body=cw
+        ) if course_id == cw["id"] else None)
 
     # def delete_course(self, data: DataWrapper):
     #     """
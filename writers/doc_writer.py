@@ -1,7 +1,6 @@
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
+from utility.google_service import google_service
 
 
 class DocsWriter(Writer):
@@ -13,8 +12,7 @@ class DocsWriter(Writer):
 
     def initialize(self):
         print(f"[DocsWriter] Initializing for document: {self.doc_id}")
-        creds = get_credentials(self.service_name)
-        self.service = build("docs", "v1", credentials=creds)
+        self.service = google_service("docs", "v1", self.service_name)
 
     def write_data(self, data: DataWrapper) -> None:
         """Appends all lines as paragraphs at the end of the doc. (params: data)"""
@@ -101,8 +99,7 @@ class DocsWriter(Writer):
 
     def set_document_title(self, data: DataWrapper):
         """Set the title of the document using the Drive API."""
-        creds = get_credentials("drive_cred")
-        drive_service = build("drive", "v3", credentials=creds)
+        drive_service = google_service("drive", "v3", "drive_cred")
         drive_service.files().update(
             fileId=self.doc_id,
             body={"name": data.data}
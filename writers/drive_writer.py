@@ -1,17 +1,70 @@
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from core.binary_payload import BinaryPayload, DEFAULT_CHUNK_SIZE, as_binary_payload
+from core.transfer import transfer_files
+from utility.google_service import google_service
+from core.ratelimit import rate_limits
+from googleapiclient.http import MediaIoBaseUpload, MediaUpload
 import io
+import mimetypes
 from googleapiclient.http import MediaIoBaseDownload
 
 
+class StreamMediaUpload(MediaUpload):
+    """
+    Media body for a resumable upload fed by a StreamingBinaryPayload.
+
+    The upload asks for the bytes after what Drive has stored so far; the
+    current chunk is kept until the next one is requested, in case Drive
+    stored only part of it and asks again from a lower offset.
+    """
+    def __init__(self, payload, mimetype: str, chunksize: int = DEFAULT_CHUNK_SIZE):
+        super().__init__()
+        self._chunks = payload.chunks(chunksize)
+        self._size = payload.size
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._buffer = b""
+        self._buffer_start = 0
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return self._size
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return False
+
+    def getbytes(self, begin, length):
+        if begin < self._buffer_start:
+            raise ValueError(f"Cannot rewind a streamed upload to byte {begin}")
+        if begin > self._buffer_start:
+            self._buffer = self._buffer[begin - self._buffer_start:]
+            self._buffer_start = begin
+        while len(self._buffer) < length:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        return self._buffer[:length]
+
+    def to_json(self):
+        raise NotImplementedError("A streamed upload can't be serialized")
+
+
 class DriveWriter(Writer):
     """
     Writer class to perform operations on Google Drive such as uploading,
     deleting, renaming, downloading, and sharing files and folders.
     """
+    streaming = True  # upload_files takes the files as the fetcher lists them
     def __init__(self, folder_id=None, service_name="drive_cred"):
         """
         Initialize the DriveWriter.
@@ -35,39 +88,76 @@ class DriveWriter(Writer):
         """
         try:
             print(f"[DriveWriter] Initializing for folder: {self.folder_id or 'root'}")
-            creds = get_credentials(self.service_name)
-            self.service = build("drive", "v3", credentials=creds)
+            self.service = google_service("drive", "v3", self.service_name)
         except Exception as e:
             print(f"[DriveWriter] Error initializing service: {e}")
             raise e
 
-    def write_data(self, data: DataWrapper, file_path: str, mime_type: str, file_name: str) -> None:
+    def write_data(self, data: DataWrapper, file_path: str = None, mime_type: str = None, file_name: str = None) -> None:
         """
         Upload a file to Google Drive.
 
+        The file is sent with a resumable upload, read from disk one chunk at
+        a time, so large files don't need to fit in memory.
+
         Args:
-            data (DataWrapper): Unused but kept for consistency.
-            file_path (str): Path to the local file.
-            mime_type (str): MIME type of the file (e.g., "application/pdf").
-            file_name (str): Name to assign to the file in Drive.
+            data (DataWrapper): File contents (a BinaryPayload, bytes, or {"content": ...}),
+                used when no file_path is given.
+            file_path (str, optional): Path to a local file to upload instead.
+            mime_type (str, optional): MIME type of the file (e.g., "application/pdf"); guessed from the name if omitted.
+            file_name (str, optional): Name to assign to the file in Drive; defaults to the payload's name.
         """
         try:
-            file_metadata = {"name": file_name}
-            if self.folder_id:
-                file_metadata["parents"] = [self.folder_id]
-
-            media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
-            file = self.service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields="id"
-            ).execute()
-
-            print(f"[DriveWriter] Uploaded file '{file_name}' with ID: {file.get('id')}")
+            payload = BinaryPayload.from_path(file_path) if file_path else as_binary_payload(data.data)
+            file = self.upload(payload, file_name, mime_type)
+            print(f"[DriveWriter] Uploaded file '{file.get('name')}' with ID: {file.get('id')}")
         except Exception as e:
             print(f"[DriveWriter] Error uploading file: {e}")
             raise e
 
+    def upload(self, payload, file_name: str = None, mime_type: str = None) -> dict:
+        """
+        Upload a payload with a resumable upload session, one chunk at a time.
+
+        Streaming payloads (e.g. a Dropbox download) are sent on as their
+        chunks arrive, without a local copy.
+
+        Returns:
+            dict: The new file's id, name and size.
+        """
+        file_name = file_name or payload.name
+        mime_type = (mime_type or payload.mime_type or mimetypes.guess_type(file_name or "")[0]
+                     or "application/octet-stream")
+        file_metadata = {"name": file_name}
+        if self.folder_id:
+            file_metadata["parents"] = [self.folder_id]
+
+        if payload.streaming:
+            media = StreamMediaUpload(payload, mime_type)
+            return self.service.files().create(body=file_metadata, media_body=media, fields="id, name, size").execute()
+        with payload.open() as stream:
+            media = MediaIoBaseUpload(stream, mimetype=mime_type, chunksize=DEFAULT_CHUNK_SIZE, resumable=True)
+            return self.service.files().create(body=file_metadata, media_body=media, fields="id, name, size").execute()
+
+    def upload_files(self, data: DataWrapper, max_parallel: int = None) -> DataWrapper:
+        """
+        Upload many files into the folder, several at a time.
+
+        Args:
+            data (DataWrapper): Files as {"metadata", "content"} items (e.g. DropboxFetcher.stream_files).
+            max_parallel (int, optional): Files uploaded at once. By default as many as the account's
+                adaptive concurrency limit allows, or DEFAULT_PARALLEL_TRANSFERS without one.
+
+        Returns:
+            DataWrapper: One {"id", "name", "size"} entry per file.
+        """
+        def upload_one(item):
+            file = self.upload(as_binary_payload(item))
+            print(f"[DriveWriter] Uploaded file '{file.get('name')}' with ID: {file.get('id')}")
+            return file
+
+        return transfer_files(data, upload_one, max_parallel, rate_limits().concurrency("drive", self.service_name))
+
     def delete_file(self, data: DataWrapper) -> None:
         """
         Delete a file from Google Drive by file ID.
@@ -234,6 +324,7 @@ class DriveWriter(Writer):
     def get_operations(self):
         return {
             "write_data": self.write_data,
+            "upload_files": self.upload_files,
             "delete_file": self.delete_file,
             "rename_file": self.rename_file,
             "create_folder": self.create_folder,
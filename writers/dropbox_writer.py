@@ -1,31 +1,85 @@
 import dropbox
 from utility.auth import get_credentials
 from core.interfaces import Writer
+from core.ratelimit import mount, rate_limits
 from core.data_wrapper import DataWrapper
+from core.binary_payload import DEFAULT_CHUNK_SIZE, as_binary_payload
+from core.transfer import transfer_files
 
 class DropboxWriter(Writer):
     """
     Write operations to Dropbox: upload, create/move/delete folders or files.
     """
+    streaming = True  # upload_files takes the files as the fetcher lists them
     def __init__(self, access_token: str = None):
         self.access_token = access_token or get_credentials("dropbox_cred")
         self.client = None
 
     def initialize(self):
-        self.client = dropbox.Dropbox(self.access_token)
+        session = mount(dropbox.create_session(), "dropbox", self.access_token)
+        self.client = dropbox.Dropbox(self.access_token, session=session)
 
     def write_data(self, data: DataWrapper, dest_path: str, mode: str = "add") -> None:
         """
         Upload a file.
 
         Args:
-            data: DataWrapper containing {"content": bytes}
+            data: DataWrapper containing {"content": BinaryPayload or bytes}
             dest_path: Dropbox destination path (e.g., "/folder/filename.txt")
             mode: "add" to create a new version or "overwrite" to replace
         """
-        content = data.data.get("content") if isinstance(data.data, dict) else data.data
         mode_enum = dropbox.files.WriteMode.overwrite if mode == "overwrite" else dropbox.files.WriteMode.add
-        self.client.files_upload(content, dest_path, mode=mode_enum)
+        self.upload(as_binary_payload(data.data), dest_path, mode_enum)
+
+    def upload(self, payload, dest_path: str, mode_enum, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Upload a payload, through an upload session when it is bigger than one chunk.
+
+        Only one chunk is in memory at a time, so file size doesn't matter
+        (single-request uploads are limited to 150 MB by Dropbox anyway).
+        Streaming payloads (e.g. a Drive download) are sent on chunk by
+        chunk as they arrive.
+        """
+        chunks = payload.chunks(chunk_size)
+        chunk = next(chunks, b"")
+        next_chunk = next(chunks, None)
+        if next_chunk is None:
+            return self.client.files_upload(chunk, dest_path, mode=mode_enum)
+
+        session = self.client.files_upload_session_start(chunk)
+        cursor = dropbox.files.UploadSessionCursor(session_id=session.session_id, offset=len(chunk))
+        commit = dropbox.files.CommitInfo(path=dest_path, mode=mode_enum)
+        chunk = next_chunk
+        for next_chunk in chunks:
+            self.client.files_upload_session_append_v2(chunk, cursor)
+            cursor.offset += len(chunk)
+            chunk = next_chunk
+        return self.client.files_upload_session_finish(chunk, cursor, commit)
+
+    def upload_files(self, data: DataWrapper, dest_folder: str, mode: str = "add",
+                     max_parallel: int = None) -> DataWrapper:
+        """
+        Upload many files into a folder, several at a time.
+
+        Args:
+            data: Files as {"metadata", "content"} items (e.g. DriveFetcher.stream_files)
+            dest_folder: Dropbox folder (e.g., "/backup")
+            mode: "add" to create a new version or "overwrite" to replace
+            max_parallel: Files uploaded at once (default: as many as the account's adaptive
+                concurrency limit allows, or DEFAULT_PARALLEL_TRANSFERS without one)
+
+        Returns:
+            DataWrapper with one {"name", "path", "size"} entry per file
+        """
+        mode_enum = dropbox.files.WriteMode.overwrite if mode == "overwrite" else dropbox.files.WriteMode.add
+
+        def upload_one(item):
+            payload = as_binary_payload(item)
+            md = self.upload(payload, f"{dest_folder.rstrip('/')}/{payload.name}", mode_enum)
+            print(f"[DropboxWriter] Uploaded {md.path_display} ({md.size} bytes)")
+            return {"name": md.name, "path": md.path_display, "size": md.size}
+
+        return transfer_files(data, upload_one, max_parallel, rate_limits().concurrency("dropbox", self.access_token))
 
     def create_folder(self, data: DataWrapper, path: str) -> None:
         """
@@ -56,14 +110,13 @@ class DropboxWriter(Writer):
         self.client.files_delete_v2(path)
 
     def save_file(self, data: DataWrapper, save_path: str) -> None:
-        content = data.data.get("content")
-        with open(save_path, "wb") as f:
-            f.write(content)
+        as_binary_payload(data.data).save(save_path)
 
 
     def get_operations(self):
         return {
             "write_data": self.write_data,
+            "upload_files": self.upload_files,
             "create_folder": self.create_folder,
             "move": self.move,
             "delete": self.delete,
@@ -1,7 +1,6 @@
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
+from utility.google_service import google_service
 
 class FormWriter(Writer):
     def __init__(self, form_id: str, service_name: str = "form_cred"):
@@ -11,9 +10,8 @@ class FormWriter(Writer):
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build(
-            "forms", "v1", credentials=creds, discoveryServiceUrl="https://forms.googleapis.com/$discovery/rest?version=v1", static_discovery=False
+        self.service = google_service(
+            "forms", "v1", self.service_name, discovery_url="https://forms.googleapis.com/$discovery/rest?version=v1"
         )
 
     def batch_update(self, data: DataWrapper) -> None:
@@ -1,5 +1,5 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_batch import execute_batched
+from utility.google_service import google_service
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
 
@@ -8,13 +8,14 @@ class GoogleKeepWriter(Writer):
     Writer for Google Keep notes via the official API.
     """
 
+    journaled_operations = ("write_data", "delete_note")  # these call the API once per record
+
     def __init__(self, service_name="keep_cred"):
         self.service_name = service_name
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build("keep", "v1", credentials=creds)
+        self.service = google_service("keep", "v1", self.service_name)
 
     def write_data(self, data: DataWrapper) -> DataWrapper:
         """
@@ -27,19 +28,14 @@ class GoogleKeepWriter(Writer):
             # "body": {"list": {"listItems": [ ... ]}}
           }
         """
-        created = []
-        for note_obj in data.data:
-            note = self.service.notes().create(body=note_obj).execute()
-            created.append(note)
-        return DataWrapper(data=created)
+        return execute_batched(self.service, data, lambda note_obj: self.service.notes().create(body=note_obj))
 
     def delete_note(self, data: DataWrapper) -> None:
         """
         Delete one or more notes by ID.
         Expects data.data = [{'name': 'notes/ID'}, …]
         """
-        for note in data.data:
-            self.service.notes().delete(name=note["name"]).execute()
+        execute_batched(self.service, data, lambda note: self.service.notes().delete(name=note["name"]))
 
     def get_operations(self):
         return {
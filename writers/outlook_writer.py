@@ -1,6 +1,7 @@
 from msgraph.core import GraphClient
 from azure.identity import ClientSecretCredential
 from core.interfaces import Writer
+from core.ratelimit import limit_calls
 from core.data_wrapper import DataWrapper
 
 class OutlookWriter(Writer):
@@ -18,6 +19,7 @@ class OutlookWriter(Writer):
     def initialize(self):
         cred = ClientSecretCredential(tenant_id=self.tenant_id, client_id=self.client_id, client_secret=self.client_secret)
         self.client = GraphClient(credential=cred, scopes=["https://graph.microsoft.com/.default"])
+        limit_calls(self.client, "post", "outlook", f"{self.tenant_id}/{self.client_id}")
 
     def send_mail(self, data: DataWrapper, message: dict, save_to_sent_items: bool = True):
         """
@@ -1,6 +1,7 @@
 from simple_salesforce import Salesforce
 from utility.auth import get_credentials
 from core.interfaces import Writer
+from core.ratelimit import mount
 from core.data_wrapper import DataWrapper
 
 class SalesforceWriter(Writer):
@@ -8,6 +9,8 @@ class SalesforceWriter(Writer):
     Writer for Salesforce operations via simple-salesforce.
     """
 
+    journaled_operations = ("create_record", "update_record")  # these call the API once per record
+
     def __init__(self, username: str, password: str, security_token: str, domain: str = None):
         self.username = username
         self.password = password
@@ -22,18 +25,19 @@ class SalesforceWriter(Writer):
             security_token=self.security_token,
             domain=self.domain
         )
+        mount(self.sf.session, "salesforce", self.username)
 
     def create_record(self, data: DataWrapper, object_name: str) -> DataWrapper:
         """Create records in specified object."""
         created = []
-        for row in data.data:
+        for row in data.records():
             res = getattr(self.sf, object_name).create(row)
             created.append(res)
         return DataWrapper(data=created)
 
     def update_record(self, data: DataWrapper, object_name: str, record_id: str) -> None:
         """Update record fields by ID."""
-        for fields in data.data:
+        for fields in data.records():
             getattr(self.sf, object_name).update(record_id, fields)
 
     def delete_record(self, data: DataWrapper, object_name: str, record_id: str) -> None:
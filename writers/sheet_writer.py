@@ -1,9 +1,9 @@
 # writers/sheet_writer.py
 
 from core.interfaces import Writer
-from core.data_wrapper import DataWrapper
-from utility.auth import get_credentials
-from googleapiclient.discovery import build
+from core.data_wrapper import DataWrapper, StreamingDataWrapper
+from core.table import Table
+from utility.google_service import google_service
 
 
 class SheetsWriter(Writer):
@@ -11,6 +11,7 @@ class SheetsWriter(Writer):
     A writer class to write and manipulate data in Google Sheets.
     Supports append, overwrite, cell updates, and row deletions.
     """
+    streaming = True  # write_data appends streamed batches as they arrive
     def __init__(self, sheet_id, range_name="Sheet1!A1", service_name="sheets_cred"):
         """
         Initialize the SheetsWriter.
@@ -27,7 +28,6 @@ class SheetsWriter(Writer):
             self.range_name = range_name
             self.service_name = service_name
             self.service = None
-            self.sheet = None
         except Exception as e:
             print(f"[SheetsWriter] Error in __init__: {e}")
             raise
@@ -38,13 +38,16 @@ class SheetsWriter(Writer):
         """
         try:
             print(f"[SheetsWriter] Initializing for spreadsheet: {self.sheet_id}")
-            creds = get_credentials(self.service_name)
-            self.service = build("sheets", "v4", credentials=creds)
-            self.sheet = self.service.spreadsheets().values()
+            self.service = google_service("sheets", "v4", self.service_name)
         except Exception as e:
             print(f"[SheetsWriter] Error initializing SheetsWriter: {e}")
             raise
 
+    @property
+    def sheet(self):
+        # Resolved on use so the service is only built once an operation runs.
+        return self.service.spreadsheets().values()
+
     def write_data(self, data: DataWrapper, mode="append") -> None:
         """
         Write data to the Google Sheet.
@@ -56,8 +59,13 @@ class SheetsWriter(Writer):
             data (DataWrapper): Data to write as a list of lists.
         """
         try:
+            if data.streaming:
+                return self._write_batches(data, mode)
+
             values = data.data
             print("1111111111111111", data.data)
+            if isinstance(values, Table):
+                values = values.to_rows(header=True)
 
             if not values:
                 print("[SheetsWriter] No data to write.")
@@ -94,6 +102,39 @@ class SheetsWriter(Writer):
             print(f"[SheetsWriter] Error in write_data: {e}")
             raise
 
+    def _write_batches(self, data: StreamingDataWrapper, mode="append") -> None:
+        """
+        Write a stream batch by batch, so rows land while the fetch is still running.
+
+        In 'overwrite' mode the range is cleared once, before the first batch.
+        Table batches (from `output: table` transforms) are sent as rows, with
+        the header row ahead of the first one.
+        """
+        if mode not in ("append", "overwrite"):
+            print(f"[SheetsWriter] Unsupported mode: {mode}")
+            return
+        if mode == "overwrite":
+            self.service.spreadsheets().values().clear(
+                spreadsheetId=self.sheet_id,
+                range=self.range_name,
+                body={}
+            ).execute()
+
+        total = 0
+        for values in data.batches():
+            if isinstance(values, Table):
+                values = values.to_rows(header=not total)
+            self.sheet.append(
+                spreadsheetId=self.sheet_id,
+                range=self.range_name,
+                valueInputOption="RAW",
+                body={"values": values}
+            ).execute()
+            total += len(values)
+            print(f"[SheetsWriter] Appended {len(values)} rows ({total} so far).")
+        if not total:
+            print("[SheetsWriter] No data to write.")
+
     def _to_A1(self, row: int, col: int) -> str:
         """
         Convert row and column numbers to A1 notation.
@@ -1,6 +1,8 @@
+import asyncio
 from slack_sdk import WebClient
 from utility.auth import get_credentials
-from core.interfaces import Writer
+from core.interfaces import Writer, AsyncWriter
+from core.ratelimit import limit_calls, rate_limits
 from core.data_wrapper import DataWrapper
 
 class SlackWriter(Writer):
@@ -12,7 +14,7 @@ class SlackWriter(Writer):
         self.client = None
 
     def initialize(self):
-        self.client = WebClient(token=self.token)
+        self.client = limit_calls(WebClient(token=self.token), "api_call", "slack", self.token)
 
     def write_data(self, data: DataWrapper) -> None:
         """
@@ -54,3 +56,42 @@ class SlackWriter(Writer):
             # "update_message": self.update_message,
             "delete_message": self.delete_message,
         }
+
+
+class AsyncSlackWriter(AsyncWriter):
+    """
+    Post Slack messages concurrently from the asyncio runner.
+
+    Requires `aiohttp` (used by slack_sdk's AsyncWebClient).
+    """
+    def __init__(self, token: str = None, service: str = "slack"):
+        self.token = token or get_credentials("slack_cred")
+        self.service = service
+        self.client = None
+
+    async def initialize(self):
+        from slack_sdk.web.async_client import AsyncWebClient
+        self.client = AsyncWebClient(token=self.token)
+
+    async def _post(self, message: dict):
+        async with self.limiter.slot(self.service):
+            await rate_limits().call_async(
+                "slack", self.token, self.client.chat_postMessage,
+                channel=message["channel"],
+                text=message["text"],
+                thread_ts=message.get("thread_ts")
+            )
+
+    async def write_data(self, data: DataWrapper) -> None:
+        """
+        Send one or many Slack messages, up to the service's concurrency limit at a time.
+        Expects:
+            data.data = {"message": {...}} or a list of such dicts
+        """
+        items = data.data if isinstance(data.data, list) else [data.data]
+        await asyncio.gather(*(self._post(item["message"]) for item in items))
+
+    def get_operations(self):
+        return {
+            "write_data": self.write_data,
+        }
@@ -1,5 +1,4 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_service import google_service
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
 
@@ -14,8 +13,7 @@ class GoogleSlidesWriter(Writer):
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build("slides", "v1", credentials=creds)
+        self.service = google_service("slides", "v1", self.service_name)
 
     def insert_textbox(self, data: DataWrapper, text, x, y) -> None:
         """
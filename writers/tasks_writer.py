@@ -1,5 +1,5 @@
-from googleapiclient.discovery import build
-from utility.auth import get_credentials
+from utility.google_batch import execute_batched
+from utility.google_service import google_service
 from core.interfaces import Writer
 from core.data_wrapper import DataWrapper
 
@@ -8,13 +8,14 @@ class GoogleTasksWriter(Writer):
     A writer class to perform operations on Google Tasks.
     """
 
+    journaled_operations = ("update_task", "delete_task")  # these call the API once per record
+
     def __init__(self, service_name="tasks_cred"):
         self.service_name = service_name
         self.service = None
 
     def initialize(self):
-        creds = get_credentials(self.service_name)
-        self.service = build("tasks", "v1", credentials=creds)
+        self.service = google_service("tasks", "v1", self.service_name)
 
     def write_data(self, data: DataWrapper) -> DataWrapper:
         task_list = self.service.tasklists().insert(body=data.data).execute()
@@ -24,19 +25,16 @@ class GoogleTasksWriter(Writer):
         self.service.tasks().insert(tasklist=tasklist_id, body=data.data).execute()
 
     def update_task(self, data: DataWrapper, tasklist_id: str, task_id: str, updates: dict) -> None:
-        for task in data.data:
-            if task_id == task["id"]:
-                self.service.tasks().patch(
-                    tasklist=tasklist_id,
-                    task=task_id,
-                    body=updates
-                ).execute()
+        execute_batched(self.service, data, lambda task: self.service.tasks().patch(
+            tasklist=tasklist_id,
+            task=task_id,
+            body=updates
+        ) if task_id == task["id"] else None)
 
     def delete_task(self, data: DataWrapper, tasklist_id: str, task_id: str) -> None:
-        for task in data.data:
-            task_id1 = task.get("id")
-            if task_id1 == task_id:
-                self.service.tasks().delete(tasklist=tasklist_id, task=task_id).execute()
+        execute_batched(self.service, data, lambda task: self.service.tasks().delete(
+            tasklist=tasklist_id, task=task_id
+        ) if task.get("id") == task_id else None)
 
     def get_operations(self):
         return {
@@ -1,5 +1,7 @@
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
 from core.interfaces import Writer
+from core.ratelimit import mount
 from core.data_wrapper import DataWrapper
 
 class TwilioWriter(Writer):
@@ -15,7 +17,9 @@ class TwilioWriter(Writer):
         self.client = None
 
     def initialize(self):
-        self.client = Client(self.account_sid, self.auth_token)
+        http_client = TwilioHttpClient()
+        mount(http_client.session, "twilio", self.account_sid)
+        self.client = Client(self.account_sid, self.auth_token, http_client=http_client)
 
     def send_sms(self, data: DataWrapper, to_number: str, message: str):
         """